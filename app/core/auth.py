@@ -1,62 +1,219 @@
-from fastapi import Depends, HTTPException, status
+import math
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Cookie, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core import security
-from db.base import get_session
+from db.base import get_async_session, replica_router
 from db.models import User
 from schemas.user import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+# Same scheme for handlers that also serve anonymous callers
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
+# Cookie that keeps a client's reads on the primary after its writes, in
+# whichever worker process serves them
+READ_PRIMARY_COOKIE = "read_primary"
+
+
+def get_token_subject(token: Optional[str]) -> Optional[str]:
+    """
+    Read the email a token was issued for, without touching the database.
+
+    Args:
+        token (str): The authentication token, None if none was sent.
+
+    Returns:
+        str: The email, or None if the token is missing or invalid.
+    """
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token, security.SECRET_KEY, algorithms=[security.ALGORITHM]
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
 
 
-def get_user(db: Session, email: str):
+async def get_user(db: AsyncSession, email: str):
     """
-    Retrieve a user from the database by their username.
+    Retrieve a user from the database by their email.
+
+    The lookup is awaited on the async driver, so it never blocks the
+    event loop this dependency runs on.
 
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The async database session.
         email (str): The email of the user to retrieve.
 
     Returns:
         User: The user object if found, otherwise None.
     """
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)
-) -> User:
+async def authenticate(token: str, db: AsyncSession) -> User:
     """
-    Get the current user based on the provided token.
+    Resolve a token to its user.
 
     Args:
         token (str): The authentication token.
-        db (Session): The database session.
+        db (AsyncSession): The async database session to look the user up in.
 
     Raises:
         HTTPException: If credentials cannot be validated.
 
     Returns:
-        User: The current user.
+        User: The user the token was issued for.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(
-            token, security.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
+    email = get_token_subject(token)
+    if email is None:
         raise credentials_exception
-    user = get_user(db, email=token_data.email)
+    token_data = TokenData(email=email)
+    user = await get_user(db, email=token_data.email)
     if user is None:
         raise credentials_exception
     return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_session),
+) -> User:
+    """
+    Get the current user based on the provided token.
+
+    Args:
+        token (str): The authentication token.
+        db (AsyncSession): The async database session, shared with the route.
+
+    Raises:
+        HTTPException: If credentials cannot be validated.
+
+    Returns:
+        User: The current user.
+    """
+    return await authenticate(token, db)
+
+
+def mark_write(response: Response, key: str) -> None:
+    """
+    Record that a caller has just written to the primary.
+
+    The replica router only remembers writes made through its own process,
+    so the response also sets a cookie that lasts the read-your-writes
+    window. Reads carrying it go to the primary whichever worker serves them.
+
+    Args:
+        response (Response): The response of the writing request.
+        key (str): Identifies the caller, e.g. the user's email.
+    """
+    replica_router.mark_write(key)
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        "1",
+        max_age=math.ceil(replica_router.read_your_writes_window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+async def get_current_writer(
+    response: Response, user: User = Depends(get_current_user)
+):
+    """
+    Get the current user of a handler that writes to the primary.
+
+    The user is marked as a recent writer both when the request starts, so
+    reads racing it already go to the primary, and when it ends, so the
+    read-your-writes window counts from the end of the write. The client's
+    cookie is set with the response and counts from when it arrives.
+
+    Yields:
+        User: The current user.
+    """
+    mark_write(response, user.email)
+    yield user
+    replica_router.mark_write(user.email)
+
+
+async def get_read_session(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    read_primary: Optional[str] = Cookie(None, include_in_schema=False),
+):
+    """
+    Create an async session for a read-only handler.
+
+    The session is on a replica when any are configured, unless the caller
+    wrote within the read-your-writes window.
+
+    Args:
+        token (str): The authentication token, None for anonymous callers.
+        read_primary (str): The cookie set by mark_write, None without one.
+
+    Yields:
+        AsyncSession: The async database session.
+    """
+    db = await replica_router.open_session(
+        get_token_subject(token), primary=read_primary is not None
+    )
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_read_session_opener(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    read_primary: Optional[str] = Cookie(None, include_in_schema=False),
+) -> Callable[[], Awaitable[AsyncSession]]:
+    """
+    Get a function opening a read session like get_read_session, for a
+    handler that streams its response.
+
+    Sessions of dependencies are closed before a StreamingResponse sends its
+    body, so the stream opens its own session when it starts and closes it
+    when it ends.
+
+    Args:
+        token (str): The authentication token, None for anonymous callers.
+        read_primary (str): The cookie set by mark_write, None without one.
+
+    Returns:
+        Callable[[], Awaitable[AsyncSession]]: Opens a read session.
+    """
+    key = get_token_subject(token)
+    primary = read_primary is not None
+    return lambda: replica_router.open_session(key, primary=primary)
+
+
+async def get_current_reader(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_session),
+) -> User:
+    """
+    Get the current user for a read-only handler, looked up on a replica.
+
+    Args:
+        token (str): The authentication token.
+        db (AsyncSession): The read session, shared with the route.
+
+    Raises:
+        HTTPException: If credentials cannot be validated.
+
+    Returns:
+        User: The current user.
+    """
+    return await authenticate(token, db)
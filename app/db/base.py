@@ -1,18 +1,105 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from settings import settings
+from db.pool import PoolStatistics, get_engine_options
+from db.sqlite import is_sqlite, apply_sqlite_pragmas
+from db.replicas import ReplicaRouter
+
+# Async drivers used for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Convert a sync database URL into its async driver equivalent.
+
+    Args:
+        url (str): The sync database URL, e.g. sqlite:///sqlite.db.
+
+    Returns:
+        str: The async database URL, e.g. sqlite+aiosqlite:///sqlite.db.
+    """
+    database_url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(
+        database_url.get_backend_name(), database_url.drivername
+    )
+    return database_url.set(drivername=drivername).render_as_string(hide_password=False)
+
 
 if settings.DEBUG:
     SQLALCHEMY_DATABASE_URL = settings.SQLITE_CONNECTION_STRING
 else:
     SQLALCHEMY_DATABASE_URL = settings.POSTGRES_CONNECTION_STRING
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+SQLALCHEMY_ASYNC_DATABASE_URL = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+
+pool_statistics = PoolStatistics()
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    **get_engine_options(SQLALCHEMY_DATABASE_URL, QueuePool, pool_statistics),
+)
+pool_statistics.attach(engine)
+# Repositories commit without re-reading rows; keep committed state loaded
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
+    expire_on_commit=False,
+)
+
+async_pool_statistics = PoolStatistics()
+async_engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    **get_engine_options(
+        SQLALCHEMY_ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_statistics
+    ),
+)
+async_pool_statistics.attach(async_engine.sync_engine)
+
+if settings.SQLITE_PRAGMAS_ENABLED and is_sqlite(SQLALCHEMY_DATABASE_URL):
+    apply_sqlite_pragmas(engine)
+    apply_sqlite_pragmas(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    bind=async_engine,
+    expire_on_commit=False,
+)
+
+# Read replicas, each with its own pool; read-only handlers go through
+# replica_router and fall back to the primary
+replica_engines = []
+replica_pool_statistics = []
+for replica_url in filter(None, map(str.strip, settings.DB_REPLICA_URLS.split(","))):
+    replica_async_url = get_async_database_url(replica_url)
+    replica_statistics = PoolStatistics()
+    replica_engine = create_async_engine(
+        replica_async_url,
+        **get_engine_options(
+            replica_async_url, AsyncAdaptedQueuePool, replica_statistics
+        ),
+    )
+    replica_statistics.attach(replica_engine.sync_engine)
+    if settings.SQLITE_PRAGMAS_ENABLED and is_sqlite(replica_url):
+        apply_sqlite_pragmas(replica_engine.sync_engine)
+    replica_engines.append(replica_engine)
+    replica_pool_statistics.append(replica_statistics)
+
+replica_router = ReplicaRouter(
+    primary=AsyncSessionLocal,
+    replicas=[
+        async_sessionmaker(autoflush=False, bind=replica, expire_on_commit=False)
+        for replica in replica_engines
+    ],
+    retry_after=settings.DB_REPLICA_RETRY_AFTER,
+    read_your_writes_window=settings.DB_READ_YOUR_WRITES_WINDOW,
 )
 
 
@@ -28,3 +115,17 @@ def get_session():
         yield db
     finally:
         db.close()
+
+
+async def get_async_session():
+    """
+    Create an async database session.
+
+    Yields:
+        AsyncSession: The async database session.
+    """
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
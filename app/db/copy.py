@@ -0,0 +1,57 @@
+import csv
+import io
+from typing import Any, Dict, List
+
+from sqlalchemy import Table, insert, text
+from sqlalchemy.orm import Session
+
+
+def copy_rows(session: Session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert rows in the session's transaction, with COPY on PostgreSQL and an
+    executemany INSERT everywhere else.
+
+    COPY streams the rows in a single command instead of sending a statement
+    per row, through asyncpg's copy_records_to_table or psycopg2's
+    copy_expert depending on the driver. Every row must have the same keys;
+    column defaults and types are not applied, so values must be complete and
+    of the driver's types.
+
+    Args:
+        session (Session): The database session.
+        table (Table): The table to insert into.
+        rows (list): Column values of each row.
+    """
+    if not rows:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        session.execute(insert(table), rows)
+        return
+
+    columns = list(rows[0])
+    records = [tuple(row[column] for column in columns) for row in rows]
+    # COPY takes this lock anyway; sending it as a statement also starts the
+    # transaction, which asyncpg's adapter otherwise only does on the first
+    # statement, so that COPY runs in it rather than committing on its own
+    connection.execute(text(f"LOCK TABLE {table.name} IN ROW EXCLUSIVE MODE"))
+    dbapi_connection = connection.connection.dbapi_connection
+    if connection.dialect.driver == "asyncpg":
+        dbapi_connection.run_async(
+            lambda driver_connection: driver_connection.copy_records_to_table(
+                table.name, records=records, columns=columns
+            )
+        )
+        return
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    buffer.seek(0)
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
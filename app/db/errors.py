@@ -0,0 +1,38 @@
+from typing import Optional
+
+from sqlalchemy import Table
+from sqlalchemy.exc import IntegrityError
+
+
+def unique_violation_column(exc: IntegrityError, table: Table) -> Optional[str]:
+    """
+    Find which unique column of a table an IntegrityError was raised for.
+
+    Drivers report the violation differently: SQLite names the column
+    ("UNIQUE constraint failed: users.email") while PostgreSQL names the
+    index or constraint ("ix_users_email", "users_email_key"), so all of
+    these spellings are matched against the driver's message.
+
+    Args:
+        exc (IntegrityError): The error raised by the INSERT or UPDATE.
+        table (Table): The table that was written to.
+
+    Returns:
+        str: The name of the violated column, or None if the error was not a
+            unique violation on a single column of the table.
+    """
+    message = str(exc.orig)
+    unique_columns = {column.name for column in table.c if column.unique}
+    for index in table.indexes:
+        if index.unique and len(index.columns) == 1:
+            unique_columns.update(column.name for column in index.columns)
+
+    for name in sorted(unique_columns):
+        spellings = (
+            f"{table.name}.{name}",
+            f"ix_{table.name}_{name}",
+            f"{table.name}_{name}_key",
+        )
+        if any(spelling in message for spelling in spellings):
+            return name
+    return None
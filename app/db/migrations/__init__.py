@@ -0,0 +1,173 @@
+import importlib
+import pkgutil
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from db.models import utc_now
+
+# Arbitrary key of the PostgreSQL advisory lock held while migrating
+MIGRATION_LOCK_KEY = 7239146021
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    module: ModuleType
+
+
+def _migration_scripts() -> List[Tuple[int, str, str]]:
+    """
+    List the (version, name, module name) of the migration scripts, ordered
+    by version, without importing them.
+    """
+    package = importlib.import_module(f"{__name__}.versions")
+    scripts = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        version, _, name = module_info.name.partition("_")
+        if version.isdigit():
+            scripts.append(
+                (int(version), name, f"{package.__name__}.{module_info.name}")
+            )
+    scripts.sort()
+    versions = [version for version, _, _ in scripts]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return scripts
+
+
+def load_migrations() -> List[Migration]:
+    """
+    Load the migration scripts in db/migrations/versions, ordered by version.
+
+    Scripts are named ``<version>_<name>.py``, e.g. ``0001_initial.py``, and
+    define ``upgrade(connection)``.
+
+    Returns:
+        List[Migration]: The migrations, oldest first.
+    """
+    return [
+        Migration(version, name, importlib.import_module(module_name))
+        for version, name, module_name in _migration_scripts()
+    ]
+
+
+def head_version() -> int:
+    """
+    Get the version the newest migration script brings the schema to. The
+    scripts are not imported, which keeps the startup check cheap.
+
+    Returns:
+        int: The head version, 0 when there are no migrations.
+    """
+    scripts = _migration_scripts()
+    return scripts[-1][0] if scripts else 0
+
+
+def current_version(engine: Engine) -> int:
+    """
+    Read the version the database schema is at, in a single query.
+
+    Args:
+        engine (Engine): The database engine.
+
+    Returns:
+        int: The current version, 0 for a database that was never migrated.
+    """
+    try:
+        with engine.connect() as connection:
+            return _current_version(connection)
+    except DBAPIError:
+        # schema_version does not exist yet
+        return 0
+
+
+def _current_version(connection: Connection) -> int:
+    version = connection.execute(select(func.max(schema_version.c.version)))
+    return version.scalar() or 0
+
+
+@contextmanager
+def _locked_transaction(engine: Engine) -> Iterator[Connection]:
+    """
+    Open a transaction that holds the migration lock until it ends, so
+    workers or CLI runs migrating at the same time apply each script once.
+    """
+    if engine.dialect.name == "sqlite":
+        # pysqlite does not open a transaction before DDL; take SQLite's
+        # write lock explicitly so the DDL is transactional and serialized
+        with engine.connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT")
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.exec_driver_sql("ROLLBACK")
+                raise
+            connection.exec_driver_sql("COMMIT")
+        return
+
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+        yield connection
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply the pending migrations up to ``target`` in one transaction.
+
+    The current version is re-read under the migration lock, so a run that
+    waited on another one only applies what is still missing.
+
+    Args:
+        engine (Engine): The database engine.
+        target (int): The version to stop at, the head version by default.
+
+    Returns:
+        List[Migration]: The migrations that were applied.
+    """
+    migrations = load_migrations()
+    applied = []
+    with _locked_transaction(engine) as connection:
+        schema_version.create(connection, checkfirst=True)
+        version = _current_version(connection)
+        for migration in migrations:
+            if migration.version <= version:
+                continue
+            if target is not None and migration.version > target:
+                break
+            migration.module.upgrade(connection)
+            connection.execute(
+                schema_version.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=utc_now(),
+                )
+            )
+            applied.append(migration)
+    return applied
@@ -0,0 +1,45 @@
+"""
+Database schema migrations.
+
+Usage, from the app directory or with PYTHONPATH=app:
+
+    python -m db.migrations upgrade [--to VERSION]
+    python -m db.migrations current
+    python -m db.migrations history
+"""
+
+import argparse
+
+from db.base import engine
+from db.migrations import current_version, head_version, load_migrations, upgrade
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m db.migrations", description="Database schema migrations."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="Apply the pending migrations")
+    upgrade_parser.add_argument(
+        "--to", type=int, default=None, help="Version to stop at, head by default"
+    )
+    commands.add_parser("current", help="Show the version the database is at")
+    commands.add_parser("history", help="List the migrations")
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, target=args.to)
+        for migration in applied:
+            print(f"Applied {migration.version:04d}_{migration.name}")
+        print(f"Database is at version {current_version(engine)}")
+    elif args.command == "current":
+        print(f"{current_version(engine)} (head {head_version()})")
+    else:
+        version = current_version(engine)
+        for migration in load_migrations():
+            status = "applied" if migration.version <= version else "pending"
+            print(f"{migration.version:04d}_{migration.name} {status}")
+
+
+if __name__ == "__main__":
+    main()
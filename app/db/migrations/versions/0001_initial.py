@@ -0,0 +1,56 @@
+"""
+Users and todos tables.
+
+Tables and indexes are created only where missing, so databases that were
+set up by create_all before migrations existed are adopted as they are.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("username", String),
+    Column("email", String),
+    Column("hashed_password", String),
+    Column("is_superuser", Boolean),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Index("ix_users_username", "username", unique=True),
+    Index("ix_users_email", "email", unique=True),
+)
+
+todos = Table(
+    "todos",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("completed", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Index("ix_todos_title", "title"),
+    Index("ix_todos_created_at_id", "created_at", "id"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    for table in metadata.sorted_tables:
+        table.create(connection, checkfirst=True)
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
@@ -0,0 +1,48 @@
+"""
+Composite indexes for a user's own todos and a partial index on active
+users' emails.
+"""
+
+from sqlalchemy import Column, Index, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+users = Table("users", metadata, Column("email"), Column("is_active"))
+todos = Table(
+    "todos",
+    metadata,
+    Column("id"),
+    Column("user_id"),
+    Column("completed"),
+    Column("created_at"),
+)
+
+# Without statistics SQLite breaks cost ties between indexes by creation
+# order, so the more selective index is created first
+indexes = [
+    Index(
+        "ix_users_active_email",
+        users.c.email,
+        postgresql_where=text("is_active"),
+        sqlite_where=text("is_active = 1"),
+    ),
+    Index(
+        "ix_todos_user_id_completed_created_at_id",
+        todos.c.user_id,
+        todos.c.completed,
+        todos.c.created_at,
+        todos.c.id,
+    ),
+    Index(
+        "ix_todos_user_id_created_at_id",
+        todos.c.user_id,
+        todos.c.created_at,
+        todos.c.id,
+    ),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for index in indexes:
+        index.create(connection, checkfirst=True)
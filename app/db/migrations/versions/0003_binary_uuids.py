@@ -0,0 +1,165 @@
+"""
+Store users.id, todos.id and todos.user_id as 16-byte BLOBs on SQLite.
+
+They used to be 32-character hex text. SQLite cannot change a column's type
+in place, so both tables are rebuilt: the old ones are renamed aside, which
+also repoints the todos foreign key, and the rows are copied over in batches
+with their keys converted. PostgreSQL already stores native uuid and is left
+as it is.
+
+The copy also rewrites the timestamps that func.now() defaults used to
+store as second precision text ('2025-01-01 10:00:00') in the microsecond
+format of the DateTime type. Keyset cursors compare against that text, so
+rows from the same second would otherwise sort before their own cursor and
+be skipped.
+"""
+
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.types import TypeDecorator
+
+BATCH_SIZE = 10000
+
+
+class GUID(TypeDecorator):
+    """
+    db.types.GUID as of this migration, which only runs on SQLite: uuid.UUID
+    values stored as 16-byte BLOBs.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Optional[bytes]:
+        return None if value is None else value.bytes
+
+
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", GUID(), primary_key=True),
+    Column("username", String),
+    Column("email", String),
+    Column("hashed_password", String),
+    Column("is_superuser", Boolean),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+todos = Table(
+    "todos",
+    metadata,
+    Column("id", GUID(), primary_key=True),
+    Column("user_id", GUID(), ForeignKey("users.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("completed", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+# Created once the old tables, which still own these names, are dropped; the
+# more selective per-user index goes first as in 0002
+indexes = [
+    Index("ix_users_username", users.c.username, unique=True),
+    Index("ix_users_email", users.c.email, unique=True),
+    Index(
+        "ix_users_active_email",
+        users.c.email,
+        postgresql_where=text("is_active"),
+        sqlite_where=text("is_active = 1"),
+    ),
+    Index("ix_todos_title", todos.c.title),
+    Index("ix_todos_created_at_id", todos.c.created_at, todos.c.id),
+    Index(
+        "ix_todos_user_id_completed_created_at_id",
+        todos.c.user_id,
+        todos.c.completed,
+        todos.c.created_at,
+        todos.c.id,
+    ),
+    Index(
+        "ix_todos_user_id_created_at_id",
+        todos.c.user_id,
+        todos.c.created_at,
+        todos.c.id,
+    ),
+]
+
+UUID_COLUMNS = {"users": ("id",), "todos": ("id", "user_id")}
+
+
+def to_uuid(value: Any) -> Optional[uuid.UUID]:
+    """
+    Read a key in its old hex text form, or already as a BLOB.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        return uuid.UUID(bytes=value)
+    return uuid.UUID(str(value))
+
+
+def copy_rows(connection: Connection, table: Table) -> None:
+    uuid_columns = UUID_COLUMNS[table.name]
+    # Typed like the new table, keys aside, so timestamps and flags are read
+    # back into Python values the new columns accept
+    old_table = Table(
+        f"{table.name}__old",
+        MetaData(),
+        *(
+            Column(column.name, String if column.name in uuid_columns else column.type)
+            for column in table.columns
+        ),
+    )
+    result = connection.execution_options(yield_per=BATCH_SIZE).execute(
+        select(old_table)
+    )
+    for rows in result.partitions():
+        connection.execute(
+            table.insert(),
+            [
+                {
+                    name: to_uuid(value) if name in uuid_columns else value
+                    for name, value in row._mapping.items()
+                }
+                for row in rows
+            ],
+        )
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+
+    for table in metadata.sorted_tables:
+        connection.exec_driver_sql(
+            f'ALTER TABLE "{table.name}" RENAME TO "{table.name}__old"'
+        )
+    for table in metadata.sorted_tables:
+        # Without its indexes; their names are still taken by the old tables
+        connection.execute(CreateTable(table))
+        copy_rows(connection, table)
+    # Children first, so no foreign key is left pointing at a dropped table
+    for table in reversed(metadata.sorted_tables):
+        connection.exec_driver_sql(f'DROP TABLE "{table.name}__old"')
+    for index in indexes:
+        index.create(connection)
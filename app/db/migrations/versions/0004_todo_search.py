@@ -0,0 +1,51 @@
+"""
+Full-text search over todo titles.
+
+On SQLite, an external-content FTS5 table indexes todos.title by the todos
+rowid. Triggers update it in the same statement as every insert, title
+update and delete. Existing rows are indexed when it is created. The todos
+rowid is implicit, and VACUUM may renumber it. After a VACUUM, run
+``INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')``.
+
+On PostgreSQL, a stored generated tsvector column with a GIN index is
+recomputed by the database whenever the title changes.
+"""
+
+from sqlalchemy.engine import Connection
+
+SQLITE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts "
+    "USING fts5(title, content='todos', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN "
+    "INSERT INTO todos_fts (rowid, title) VALUES (new.rowid, new.title); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN "
+    "INSERT INTO todos_fts (todos_fts, rowid, title) "
+    "VALUES ('delete', old.rowid, old.title); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_update "
+    "AFTER UPDATE OF title ON todos BEGIN "
+    "INSERT INTO todos_fts (todos_fts, rowid, title) "
+    "VALUES ('delete', old.rowid, old.title); "
+    "INSERT INTO todos_fts (rowid, title) VALUES (new.rowid, new.title); "
+    "END",
+    "INSERT INTO todos_fts (todos_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_STATEMENTS = [
+    "ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_todos_search_vector "
+    "ON todos USING gin (search_vector)",
+]
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name == "sqlite":
+        statements = SQLITE_STATEMENTS
+    elif connection.dialect.name == "postgresql":
+        statements = POSTGRES_STATEMENTS
+    else:
+        return
+    for statement in statements:
+        connection.exec_driver_sql(statement)
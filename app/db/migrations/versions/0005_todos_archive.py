@@ -0,0 +1,65 @@
+"""
+todos_archive table for completed todos moved out of todos, and a partial
+index on todos that the archiver uses to find them.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class GUID(TypeDecorator):
+    """
+    db.types.GUID as of this migration, for the DDL: native uuid on
+    PostgreSQL, a 16-byte BLOB everywhere else.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+
+metadata = MetaData()
+
+users = Table("users", metadata, Column("id", GUID(), primary_key=True))
+todos = Table("todos", metadata, Column("completed"), Column("updated_at"))
+
+todos_archive = Table(
+    "todos_archive",
+    metadata,
+    Column("id", GUID(), primary_key=True),
+    Column("user_id", GUID(), ForeignKey("users.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("completed", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("archived_at", DateTime),
+)
+
+ix_todos_completed_updated_at = Index(
+    "ix_todos_completed_updated_at",
+    todos.c.updated_at,
+    postgresql_where=text("completed"),
+    sqlite_where=text("completed = 1"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    todos_archive.create(connection, checkfirst=True)
+    ix_todos_completed_updated_at.create(connection, checkfirst=True)
@@ -0,0 +1,96 @@
+"""
+user_todo_stats table of per-user todo counters, backfilled from todos and
+todos_archive.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    MetaData,
+    Table,
+    case,
+    func,
+    insert,
+    literal,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class GUID(TypeDecorator):
+    """
+    db.types.GUID as of this migration, for the DDL: native uuid on
+    PostgreSQL, a 16-byte BLOB everywhere else.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+
+metadata = MetaData()
+
+users = Table("users", metadata, Column("id", GUID(), primary_key=True))
+todos = Table(
+    "todos", metadata, Column("user_id", GUID()), Column("completed", Boolean)
+)
+todos_archive = Table(
+    "todos_archive",
+    metadata,
+    Column("user_id", GUID()),
+    Column("completed", Boolean),
+)
+
+user_todo_stats = Table(
+    "user_todo_stats",
+    metadata,
+    Column(
+        "user_id",
+        GUID(),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("total", Integer, nullable=False),
+    Column("completed", Integer, nullable=False),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    user_todo_stats.create(connection, checkfirst=True)
+
+    rows = union_all(
+        select(todos.c.user_id, todos.c.completed),
+        select(todos_archive.c.user_id, todos_archive.c.completed),
+    ).subquery()
+    counts = (
+        select(
+            rows.c.user_id,
+            func.count(),
+            func.sum(case((rows.c.completed == True, 1), else_=0)),
+            # Naive UTC, as db.models.utc_now stamps it
+            literal(datetime.now(timezone.utc).replace(tzinfo=None), DateTime),
+        )
+        .where(
+            rows.c.user_id.not_in(select(user_todo_stats.c.user_id)),
+        )
+        .group_by(rows.c.user_id)
+    )
+    connection.execute(
+        insert(user_todo_stats).from_select(
+            ["user_id", "total", "completed", "updated_at"], counts
+        )
+    )
@@ -0,0 +1,11 @@
+"""
+Drop the partial index on active users' emails. The unique ix_users_email
+already serves the lookup by email, is_active being checked on the one row
+it finds, so the partial index only cost space and writes.
+"""
+
+from sqlalchemy.engine import Connection
+
+
+def upgrade(connection: Connection) -> None:
+    connection.exec_driver_sql("DROP INDEX IF EXISTS ix_users_active_email")
@@ -1,18 +1,76 @@
+import os
+import threading
+import time
 import uuid
+from datetime import datetime, timezone
 from sqlalchemy import (
     Column,
     String,
     Boolean,
     ForeignKey,
     DateTime,
-    func,
+    Index,
+    Integer,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 
+from db.types import GUID
+
 Base = declarative_base()
 
 
+def utc_now() -> datetime:
+    """
+    Naive UTC timestamp with microseconds, generated on the client so every
+    backend stores the same precision and keyset comparisons are exact.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+_uuid7_lock = threading.Lock()
+_uuid7_last_timestamp = 0
+_uuid7_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7) used as the primary key default.
+
+    The leading 48 bits are the Unix time in milliseconds, so new rows are
+    appended to the right edge of the primary key index instead of being
+    scattered across it the way random UUID4 keys are. Within a millisecond a
+    42-bit counter, seeded randomly, keeps the ids generated by this process
+    strictly increasing; the remaining 32 bits are random.
+    """
+    global _uuid7_last_timestamp, _uuid7_counter
+
+    with _uuid7_lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp > _uuid7_last_timestamp:
+            # Leave the top bit clear so the counter has room to increment
+            _uuid7_counter = int.from_bytes(os.urandom(6)) >> 7
+        else:
+            timestamp = _uuid7_last_timestamp
+            _uuid7_counter += 1
+            if _uuid7_counter >> 42:
+                # Counter exhausted; borrow the next millisecond
+                timestamp += 1
+                _uuid7_counter = int.from_bytes(os.urandom(6)) >> 7
+        _uuid7_last_timestamp = timestamp
+        counter = _uuid7_counter
+
+    value = (
+        timestamp << 80
+        | 0x7 << 76
+        | (counter >> 30) << 64
+        | 0b10 << 62
+        | (counter & 0x3FFFFFFF) << 32
+        | int.from_bytes(os.urandom(4))
+    )
+    return uuid.UUID(int=value)
+
+
 class BaseModel(Base):
     __abstract__ = (
         True  # This makes BaseModel an abstract class, so it won't create a table
@@ -26,22 +84,79 @@ class BaseModel(Base):
 class User(BaseModel):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid7)
     username = Column(String, unique=True, index=True)
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     is_superuser = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=utc_now)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
 
 
 class Todo(BaseModel):
     __tablename__ = "todos"
+    __table_args__ = (
+        # Backs the (created_at, id) ordering and keyset pagination of todos
+        Index("ix_todos_created_at_id", "created_at", "id"),
+        # Back a user's own todos in (created_at, id) order, with and without
+        # the completed filter; the leading user_id also serves the foreign key
+        Index("ix_todos_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_todos_user_id_completed_created_at_id",
+            "user_id",
+            "completed",
+            "created_at",
+            "id",
+        ),
+        # Lets the archiver find completed todos, oldest first, without
+        # scanning the open ones
+        Index(
+            "ix_todos_completed_updated_at",
+            "updated_at",
+            postgresql_where=text("completed"),
+            sqlite_where=text("completed = 1"),
+        ),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid7)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
     title = Column(String, index=True, nullable=False)
     completed = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=utc_now)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+
+
+class TodoArchive(BaseModel):
+    """
+    Cold storage for completed todos, moved out of todos by the archiver so
+    the hot table and its indexes stay small. Rows keep their todo id.
+    """
+
+    __tablename__ = "todos_archive"
+
+    id = Column(GUID(), primary_key=True)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
+    title = Column(String, nullable=False)
+    completed = Column(Boolean)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=utc_now)
+
+
+class UserTodoStats(BaseModel):
+    """
+    Per-user todo counters, kept up to date by the writes of TodoRepository
+    in the same transaction, so reading them never aggregates over todos.
+    Archived todos still count; `python -m db.stats rebuild` recomputes every
+    row from the todos and todos_archive tables.
+    """
+
+    __tablename__ = "user_todo_stats"
+
+    user_id = Column(
+        GUID(), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
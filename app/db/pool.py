@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+from settings import settings
+
+
+class PoolStatistics:
+    """
+    Live connection pool statistics collected from pool events.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def attach(self, target) -> None:
+        """
+        Listen to the pool events of an engine or pool.
+
+        Args:
+            target: The Engine or Pool to collect statistics from.
+        """
+        event.listen(target, "connect", self._on_connect)
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "checkin", self._on_checkin)
+        event.listen(target, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out -= 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float) -> None:
+        """
+        Record a checkout that had to wait for a connection to be returned.
+
+        Args:
+            seconds (float): How long the checkout waited.
+        """
+        with self._lock:
+            self.wait_count += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def as_dict(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Snapshot the statistics together with the pool's current sizing.
+
+        Args:
+            pool (Pool): The pool the statistics were collected from.
+
+        Returns:
+            dict: The pool statistics.
+        """
+        with self._lock:
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "checked_in": (
+                    pool.checkedin() if hasattr(pool, "checkedin") else None
+                ),
+                "checked_out": self.checked_out,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "wait_count": self.wait_count,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_max": self.wait_time_max,
+            }
+
+
+def instrumented_pool_class(
+    pool_class: Type[QueuePool], statistics: PoolStatistics
+) -> Type[QueuePool]:
+    """
+    Build a subclass of a queue pool that times checkouts made while the pool
+    is saturated, i.e. every connection including overflow is checked out.
+
+    Pool events only fire once a connection has been handed out, so the time
+    spent blocked on the queue is measured around the pool's own get.
+
+    Args:
+        pool_class (Type[QueuePool]): QueuePool or AsyncAdaptedQueuePool.
+        statistics (PoolStatistics): Where waits are recorded.
+
+    Returns:
+        Type[QueuePool]: The instrumented pool class.
+    """
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            saturated = (
+                self._max_overflow > -1
+                and self.checkedout() >= self.size() + self._max_overflow
+            )
+            started_at = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                if saturated:
+                    statistics.record_wait(time.perf_counter() - started_at)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    InstrumentedPool.__qualname__ = InstrumentedPool.__name__
+    return InstrumentedPool
+
+
+def get_engine_options(
+    url: str, pool_class: Type[QueuePool], statistics: PoolStatistics
+) -> Dict[str, Any]:
+    """
+    Build the create_engine pool options from the settings.
+
+    In-memory SQLite keeps its single shared connection pool, so only the
+    options every pool accepts are applied to it.
+
+    Args:
+        url (str): The database URL.
+        pool_class (Type[QueuePool]): The queue pool class for the driver.
+        statistics (PoolStatistics): Where checkout waits are recorded.
+
+    Returns:
+        dict: Keyword arguments for create_engine / create_async_engine.
+    """
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    database_url = make_url(url)
+    if database_url.get_backend_name() == "sqlite" and database_url.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return options
+
+    options.update(
+        poolclass=instrumented_pool_class(pool_class, statistics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    )
+    return options
@@ -0,0 +1,109 @@
+import itertools
+import time
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from logger import logger
+from utils.cache import TTLCache
+
+
+class ReplicaRouter:
+    """
+    Hands out sessions for read-only handlers.
+
+    Reads rotate round-robin over the replicas. A replica whose connection
+    fails is skipped for ``retry_after`` seconds and the next one is tried,
+    falling back to the primary when none is reachable. Callers that wrote
+    within the read-your-writes window are kept on the primary, so they never
+    read a replica that has not caught up with their own change yet.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: List[async_sessionmaker],
+        retry_after: float,
+        read_your_writes_window: float,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            primary (async_sessionmaker): Sessions on the primary database.
+            replicas (List[async_sessionmaker]): Sessions on each replica.
+            retry_after (float): Seconds a failed replica is skipped for.
+            read_your_writes_window (float): Seconds after a write during
+                which the writer's reads stay on the primary.
+        """
+        self.primary = primary
+        self.replicas = replicas
+        self.retry_after = retry_after
+        self.read_your_writes_window = read_your_writes_window
+        self._rotation = itertools.count()
+        self._down_until: Dict[int, float] = {}
+        self._recent_writes = TTLCache(ttl=read_your_writes_window)
+
+    def mark_write(self, key: str) -> None:
+        """
+        Record that a caller has just written to the primary.
+
+        Args:
+            key (str): Identifies the caller, e.g. the user's email.
+        """
+        self._recent_writes.set(key, True)
+
+    def wrote_recently(self, key: Optional[str]) -> bool:
+        """
+        Check whether a caller wrote within the read-your-writes window.
+
+        Args:
+            key (str): Identifies the caller, None for anonymous callers.
+
+        Returns:
+            bool: True if the caller's reads must go to the primary.
+        """
+        return key is not None and self._recent_writes.get(key, False)
+
+    def _replica_order(self) -> Iterator[int]:
+        """
+        Yield the replicas that are up, starting at the next round-robin slot.
+        """
+        start = next(self._rotation)
+        now = time.monotonic()
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self._down_until.get(index, 0) <= now:
+                yield index
+
+    async def open_session(
+        self, key: Optional[str] = None, primary: bool = False
+    ) -> AsyncSession:
+        """
+        Open a session for a read-only handler.
+
+        A connection is checked out eagerly so an unreachable replica is
+        detected here, before the handler runs, and the next one is tried.
+
+        Args:
+            key (str): Identifies the caller, None for anonymous callers.
+            primary (bool): Read from the primary regardless, e.g. when the
+                caller says it wrote recently through another process.
+
+        Returns:
+            AsyncSession: A session on a replica, or on the primary.
+        """
+        if primary or self.wrote_recently(key):
+            return self.primary()
+
+        for index in self._replica_order():
+            session = self.replicas[index]()
+            try:
+                await session.connection()
+                return session
+            except (DBAPIError, OSError) as e:
+                await session.close()
+                self._down_until[index] = time.monotonic() + self.retry_after
+                logger.warning(f"Replica {index} is unavailable: {e}")
+        return self.primary()
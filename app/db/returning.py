@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import ColumnElement, Row, Table, delete, select, update
+from sqlalchemy.orm import Session
+
+
+def update_returning(
+    session: Session, table: Table, where: ColumnElement, values: Dict[str, Any]
+) -> Optional[Row]:
+    """
+    Update the row matching ``where`` and return it as it is after the update.
+
+    Uses a single UPDATE ... RETURNING where the dialect supports it, and
+    otherwise emulates it with an UPDATE followed by a SELECT in the same
+    transaction.
+
+    Args:
+        session (Session): The database session.
+        table (Table): The table to update.
+        where (ColumnElement): Condition selecting the row.
+        values (dict): Column values to set.
+
+    Returns:
+        Row: The updated row, or None if no row matched.
+    """
+    statement = update(table).where(where).values(**values)
+    if session.get_bind().dialect.update_returning:
+        return session.execute(statement.returning(*table.c)).first()
+
+    if session.execute(statement).rowcount == 0:
+        return None
+    return session.execute(select(*table.c).where(where)).first()
+
+
+def delete_returning(
+    session: Session, table: Table, where: ColumnElement
+) -> Optional[Row]:
+    """
+    Delete the row matching ``where`` and return it as it was.
+
+    Args:
+        session (Session): The database session.
+        table (Table): The table to delete from.
+        where (ColumnElement): Condition selecting the row.
+
+    Returns:
+        Row: The deleted row, or None if no row matched.
+    """
+    rows = delete_returning_all(session, table, where)
+    return rows[0] if rows else None
+
+
+def delete_returning_all(
+    session: Session, table: Table, where: ColumnElement
+) -> List[Row]:
+    """
+    Delete the rows matching ``where`` and return them as they were.
+
+    Uses a single DELETE ... RETURNING where the dialect supports it, and
+    otherwise emulates it with a SELECT ... FOR UPDATE followed by a DELETE in
+    the same transaction.
+
+    Args:
+        session (Session): The database session.
+        table (Table): The table to delete from.
+        where (ColumnElement): Condition selecting the rows.
+
+    Returns:
+        List[Row]: The deleted rows.
+    """
+    statement = delete(table).where(where)
+    if session.get_bind().dialect.delete_returning:
+        return session.execute(statement.returning(*table.c)).all()
+
+    rows = session.execute(select(*table.c).where(where).with_for_update()).all()
+    if rows:
+        session.execute(statement)
+    return rows
@@ -0,0 +1,46 @@
+import re
+from typing import List
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table
+
+# Text search configuration of the PostgreSQL tsvector column; "simple" does
+# no stemming, matching the unicode61 tokenizer of the SQLite FTS5 index
+POSTGRES_SEARCH_CONFIG = "simple"
+
+# Words are runs of letters and digits, which is also how both indexes
+# tokenize titles; anything else in a query is a separator
+SEARCH_TERM_PATTERN = re.compile(r"[^\W_]+")
+
+# External-content FTS5 index over todos.title on SQLite, keyed by the todos
+# rowid and kept in sync by triggers (see migration 0004)
+todos_fts = Table(
+    "todos_fts",
+    MetaData(),
+    Column("rowid", Integer),
+    Column("title", String),
+    Column("rank", Float),
+)
+
+
+def search_terms(q: str) -> List[str]:
+    """
+    Split a search query into lowercase words.
+
+    Only words reach the FTS5 MATCH or tsquery expression, so quotes,
+    operators and other query syntax in the input are never interpreted.
+    """
+    return SEARCH_TERM_PATTERN.findall(q.lower())
+
+
+def fts5_query(terms: List[str]) -> str:
+    """
+    FTS5 query matching rows that contain every term.
+    """
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def tsquery(terms: List[str]) -> str:
+    """
+    to_tsquery input matching rows that contain every term.
+    """
+    return " & ".join(terms)
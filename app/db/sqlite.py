@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from logger import logger
+from settings import settings
+
+
+def is_sqlite(url: str) -> bool:
+    """
+    Check whether a database URL points at SQLite, whatever the driver.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        bool: True for sqlite:// and sqlite+aiosqlite:// URLs.
+    """
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def get_sqlite_pragmas() -> Dict[str, Any]:
+    """
+    Build the SQLite tuning profile from the settings.
+
+    WAL lets readers run alongside a writer, and synchronous=NORMAL only
+    fsyncs at checkpoints instead of on every commit, which is still safe
+    against corruption in WAL mode.
+
+    Returns:
+        dict: PRAGMA names and values, in the order they are applied.
+    """
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_sqlite_pragmas(engine: Engine) -> None:
+    """
+    Apply the SQLite tuning profile to every connection the engine opens.
+
+    Args:
+        engine (Engine): The sync engine, or an async engine's sync_engine.
+    """
+    pragmas = get_sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+async def run_sqlite_maintenance(engine: AsyncEngine) -> None:
+    """
+    Fold the WAL back into the database file and refresh planner statistics.
+
+    Checkpointing bounds the size of the -wal file, which otherwise only
+    shrinks when no reader holds it open, and PRAGMA optimize re-analyzes
+    tables whose statistics have gone stale.
+
+    Args:
+        engine (AsyncEngine): The async engine to run the maintenance on.
+    """
+    async with engine.connect() as connection:
+        await connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        await connection.exec_driver_sql("PRAGMA optimize")
+
+
+async def sqlite_maintenance_loop(engine: AsyncEngine, interval: float) -> None:
+    """
+    Run the SQLite maintenance every ``interval`` seconds until cancelled.
+
+    Failures are logged and retried on the next tick, so a busy database
+    never stops the loop.
+
+    Args:
+        engine (AsyncEngine): The async engine to run the maintenance on.
+        interval (float): Seconds between two runs.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_sqlite_maintenance(engine)
+        except Exception as e:
+            logger.warning(f"SQLite maintenance failed: {e}")
@@ -0,0 +1,118 @@
+"""
+Per-user todo counters in the user_todo_stats table.
+
+Repositories apply deltas with add_todo_stats inside the transaction of the
+write that causes them; rebuild_todo_stats recomputes every counter from
+scratch should they ever drift, e.g. after rows were changed by hand.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from db.models import Todo, TodoArchive, UserTodoStats, utc_now
+
+# Change to a user's (total, completed) counters
+TodoStatsDelta = Tuple[int, int]
+
+
+def todo_stats_deltas(
+    added: Iterable[Tuple[UUID, Optional[bool]]] = (),
+    removed: Iterable[Tuple[UUID, Optional[bool]]] = (),
+) -> Dict[UUID, TodoStatsDelta]:
+    """
+    Counter deltas of adding and removing todos, given as (user_id, completed)
+    pairs. An update is the removal of the todo as it was and the addition of
+    it as it is, which nets out to the change of its completed flag.
+
+    Returns:
+        dict: (total, completed) delta per user id.
+    """
+    deltas: Dict[UUID, TodoStatsDelta] = {}
+    for todos, sign in ((added, 1), (removed, -1)):
+        for user_id, completed in todos:
+            total, done = deltas.get(user_id, (0, 0))
+            deltas[user_id] = (total + sign, done + sign * bool(completed))
+    return deltas
+
+
+def add_todo_stats(session: Session, deltas: Dict[UUID, TodoStatsDelta]) -> None:
+    """
+    Add deltas to users' counters with one INSERT ... ON CONFLICT DO UPDATE,
+    creating the rows of users who have none yet.
+
+    Rows are written in user_id order so concurrent bulk writes lock them in
+    the same order, and users whose counters do not change are skipped.
+
+    Args:
+        session (Session): The session of the write the deltas belong to.
+        deltas (dict): (total, completed) delta per user id.
+    """
+    params = [
+        {"user_id": user_id, "total": total, "completed": completed}
+        for user_id, (total, completed) in sorted(
+            deltas.items(), key=lambda item: str(item[0])
+        )
+        if total or completed
+    ]
+    if not params:
+        return
+
+    table = UserTodoStats.__table__
+    if session.get_bind().dialect.name == "postgresql":
+        statement = postgresql.insert(table)
+    else:
+        statement = sqlite.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={
+            "total": table.c.total + statement.excluded.total,
+            "completed": table.c.completed + statement.excluded.completed,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    updated_at = utc_now()
+    session.execute(statement, [dict(p, updated_at=updated_at) for p in params])
+
+
+def rebuild_todo_stats(connection: Connection) -> int:
+    """
+    Replace every user's counters with a fresh count of their todos, archived
+    ones included.
+
+    On PostgreSQL the todo tables are locked against writes for the rebuild
+    so no write lands between the count and the new counters; SQLite holds
+    its single write lock from the first statement anyway.
+
+    Args:
+        connection (Connection): A connection inside a transaction.
+
+    Returns:
+        int: The number of users with counters.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(
+            "LOCK TABLE todos, todos_archive IN SHARE ROW EXCLUSIVE MODE"
+        )
+    table = UserTodoStats.__table__
+    connection.execute(delete(table))
+
+    rows = union_all(
+        select(Todo.user_id, Todo.completed),
+        select(TodoArchive.user_id, TodoArchive.completed),
+    ).subquery()
+    counts = select(
+        rows.c.user_id,
+        func.count(),
+        func.coalesce(func.sum(case((rows.c.completed == True, 1), else_=0)), 0),
+        literal(utc_now(), table.c.updated_at.type),
+    ).group_by(rows.c.user_id)
+    return connection.execute(
+        insert(table).from_select(
+            ["user_id", "total", "completed", "updated_at"], counts
+        )
+    ).rowcount
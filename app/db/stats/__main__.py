@@ -0,0 +1,29 @@
+"""
+Repair the per-user todo counters.
+
+Usage, from the app directory or with PYTHONPATH=app:
+
+    python -m db.stats rebuild
+"""
+
+import argparse
+
+from db.base import engine
+from db.stats import rebuild_todo_stats
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m db.stats", description="Per-user todo counters."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Recompute every counter from the todos")
+    parser.parse_args(argv)
+
+    with engine.begin() as connection:
+        users = rebuild_todo_stats(connection)
+    print(f"Rebuilt todo counters of {users} users")
+
+
+if __name__ == "__main__":
+    main()
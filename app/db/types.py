@@ -0,0 +1,47 @@
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class GUID(TypeDecorator):
+    """
+    UUID column stored as the native uuid type on PostgreSQL and as a 16-byte
+    BLOB everywhere else.
+
+    The postgresql UUID type falls back to 32-character hex text on SQLite,
+    twice the size in the table and in every index the key appears in. Values
+    are uuid.UUID objects either way; strings are accepted when binding.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return uuid.UUID
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Any:
+        if value is None or dialect.name == "postgresql":
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value.bytes
+
+    def process_literal_param(self, value: Any, dialect: Dialect) -> str:
+        if dialect.name == "postgresql":
+            return f"'{uuid.UUID(str(value))}'"
+        return f"X'{self.process_bind_param(value, dialect).hex()}'"
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Optional[uuid.UUID]:
+        if value is None or dialect.name == "postgresql":
+            return value
+        return uuid.UUID(bytes=bytes(value))
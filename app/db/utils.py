@@ -1,20 +1,47 @@
 from db.base import engine
-from db.models import Base, User, Todo
+from db.migrations import current_version, head_version, schema_version, upgrade
+from db.models import Base
+from db.search import todos_fts
+from logger import logger
+from settings import settings
 
 
 def create_tables():
     """
-    Creates all database tables defined in the application.
+    Brings the database schema up to date by applying the pending migrations.
     """
-    Base.metadata.create_all(bind=engine)
-    User.metadata.create_all(bind=engine)
-    Todo.metadata.create_all(bind=engine)
+    upgrade(engine)
 
 
 def drop_tables():
     """
-    Drops all database tables defined in the application.
+    Drops all database tables defined in the application, along with the
+    search index and the schema version so the next create_tables starts
+    from scratch.
     """
     Base.metadata.drop_all(bind=engine)
-    User.metadata.drop_all(bind=engine)
-    Todo.metadata.drop_all(bind=engine)
+    todos_fts.drop(bind=engine, checkfirst=True)
+    schema_version.drop(bind=engine, checkfirst=True)
+
+
+def check_schema():
+    """
+    Checks at startup that the database schema is at the head version.
+
+    Costs a single query when the schema is up to date, instead of
+    reflecting every table. A schema that is behind is migrated when
+    DB_AUTO_MIGRATE is on, and refused otherwise.
+
+    Raises:
+        RuntimeError: If the schema is behind and DB_AUTO_MIGRATE is off.
+    """
+    version, head = current_version(engine), head_version()
+    if version >= head:
+        return
+    if not settings.DB_AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {head}. "
+            "Run `python -m db.migrations upgrade` first."
+        )
+    logger.info(f"Migrating database schema from version {version} to {head}...")
+    upgrade(engine)
@@ -1,15 +1,37 @@
 # lifespan.py
+import asyncio
 from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from logger import logger
-from db.utils import create_tables
+from settings import settings
+from db.base import SQLALCHEMY_DATABASE_URL, AsyncSessionLocal, async_engine
+from db.sqlite import is_sqlite, sqlite_maintenance_loop
+from db.utils import check_schema
+from services.todo_archiver import todo_archive_loop
 
 
 # Lifespan function to initialize the database
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Creating database tables...")
-    create_tables()
+    logger.info("Checking database schema version...")
+    check_schema()
+    maintenance = None
+    if settings.SQLITE_MAINTENANCE_INTERVAL > 0 and is_sqlite(SQLALCHEMY_DATABASE_URL):
+        logger.info("Starting SQLite maintenance task...")
+        maintenance = asyncio.create_task(
+            sqlite_maintenance_loop(async_engine, settings.SQLITE_MAINTENANCE_INTERVAL)
+        )
+    archiver = None
+    if settings.TODO_ARCHIVE_INTERVAL > 0:
+        logger.info("Starting todo archiver task...")
+        archiver = asyncio.create_task(
+            todo_archive_loop(AsyncSessionLocal, settings.TODO_ARCHIVE_INTERVAL)
+        )
     yield  # The application runs here
     logger.info("Shutting down...")
+    for task in (maintenance, archiver):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
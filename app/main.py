@@ -2,7 +2,12 @@ from fastapi import FastAPI
 
 from app.settings import settings
 from utils.openapi import custom_openapi
-from middlewares import log_requests_middleware, add_cors_middleware
+from utils.responses import DefaultJSONResponse
+from middlewares import (
+    log_requests_middleware,
+    add_compression_middleware,
+    add_cors_middleware,
+)
 from routers.api import router
 from exception_handlers import global_exception_handler
 from lifespan import lifespan
@@ -10,9 +15,12 @@ from lifespan import lifespan
 app = FastAPI(
     lifespan=lifespan,
     debug=bool(settings.DEBUG),
+    default_response_class=DefaultJSONResponse,
 )
 
 # Add middlewares to the app
+# Compression goes innermost: the logging middleware streams every body
+add_compression_middleware(app)
 app.middleware("http")(log_requests_middleware)
 add_cors_middleware(app)
 
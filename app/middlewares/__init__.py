@@ -1,2 +1,3 @@
+from .compression import *
 from .cors import *
 from .logging import *
@@ -0,0 +1,171 @@
+import gzip
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from settings import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Compressors by content coding, in order of preference
+COMPRESSORS: Dict[str, Callable[[bytes, int], bytes]] = {
+    "gzip": lambda body, level: gzip.compress(body, compresslevel=level, mtime=0),
+    "deflate": lambda body, level: zlib.compress(body, level),
+}
+if brotli is not None:  # pragma: no cover
+    COMPRESSORS = {
+        "br": lambda body, level: brotli.compress(body, quality=level),
+        **COMPRESSORS,
+    }
+
+# Media types whose payload is compressed already
+COMPRESSED_MEDIA_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "application/gzip",
+    "application/zip",
+    "application/x-7z-compressed",
+)
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the preferred content coding the client accepts.
+
+    :param accept_encoding: The Accept-Encoding request header.
+    :return: The content coding, or None to send the body as it is.
+    """
+    qualities = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in COMPRESSORS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with gzip, deflate or, when the brotli package
+    is installed, br, as negotiated by Accept-Encoding.
+
+    Only responses sent in one body message are compressed: streamed bodies,
+    such as exports, go out as they are, so are bodies below the minimum
+    size, already content-encoded bodies and compressed media types. The
+    compressed bytes of the cached paths are kept and sent again while the
+    body they were made from does not change.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        level: int = 6,
+        minimum_size: int = 1024,
+        cached_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.level = level
+        self.minimum_size = minimum_size
+        self.cached_paths = frozenset(cached_paths)
+        # (path, coding) -> (body, compressed body)
+        self.cache: Dict[Tuple[str, str], Tuple[bytes, bytes]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start: List[Message] = []
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start.append(message)
+            elif message["type"] != "http.response.body":
+                await send(message)
+            elif message.get("more_body", False):
+                # Streamed body: send it chunk by chunk as it is
+                passthrough = True
+                await send(start.pop())
+                await send(message)
+            else:
+                await self.send_body(scope, start.pop(), message, encoding, send)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def send_body(
+        self,
+        scope: Scope,
+        start: Message,
+        message: Message,
+        encoding: Optional[str],
+        send: Send,
+    ) -> None:
+        body = message.get("body", b"")
+        headers = MutableHeaders(scope=start)
+        if (
+            len(body) < self.minimum_size
+            or "content-encoding" in headers
+            or headers.get("content-type", "").startswith(COMPRESSED_MEDIA_TYPES)
+        ):
+            await send(start)
+            await send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if encoding is not None:
+            body = self.compress(scope["path"], body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
+
+    def compress(self, path: str, body: bytes, encoding: str) -> bytes:
+        if path not in self.cached_paths:
+            return COMPRESSORS[encoding](body, self.level)
+
+        key = (path, encoding)
+        cached = self.cache.get(key)
+        if cached is None or cached[0] != body:
+            cached = self.cache[key] = (body, COMPRESSORS[encoding](body, self.level))
+        return cached[1]
+
+
+def add_compression_middleware(app):
+    """
+    Add the compression middleware to the FastAPI app, keeping the compressed
+    OpenAPI document. A COMPRESSION_LEVEL of 0 leaves responses uncompressed.
+
+    :param app: The FastAPI app instance.
+    """
+    if not settings.COMPRESSION_LEVEL:
+        return
+
+    app.add_middleware(
+        CompressionMiddleware,
+        level=settings.COMPRESSION_LEVEL,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        cached_paths=[app.openapi_url] if app.openapi_url else [],
+    )
@@ -1,10 +1,50 @@
-from typing import Type, Tuple, List
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    Tuple,
+    List,
+    Optional,
+    Sequence,
+)
 from pydantic import UUID4
 
+from sqlalchemy import (
+    Row,
+    Select,
+    bindparam,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from schemas.todo import TodoInput, TodoOutput
-from db.models import Todo
+from schemas.todo import TodoInput, TodoBulkUpdateItem, TodoImportItem
+from db.copy import copy_rows
+from db.models import Todo, TodoArchive, UserTodoStats, utc_now, uuid7
+from db.returning import update_returning, delete_returning, delete_returning_all
+from db.search import POSTGRES_SEARCH_CONFIG, todos_fts, fts5_query, tsquery
+from db.stats import add_todo_stats, todo_stats_deltas
+
+# List reads select these columns directly; Core columns, unlike the mapped
+# Todo attributes, keep the statements off the ORM compilation path
+todos = Todo.__table__
+
+
+def all_todos_statement(columns: Optional[Sequence[str]] = None) -> Select:
+    """
+    Every todo, in the (created_at, id) order of ix_todos_created_at_id.
+    ``columns`` limits the columns selected, all by default.
+    """
+    selected = todos.c if columns is None else [todos.c[name] for name in columns]
+    return select(*selected).order_by(todos.c.created_at, todos.c.id)
 
 
 class TodoRepository:
@@ -13,35 +53,517 @@ class TodoRepository:
         self.session = session
 
     def create(self, data: TodoInput) -> Todo:
+        """
+        Insert a todo and count it in its user's stats, in one transaction.
+
+        id and timestamps are generated client-side and sent with the INSERT,
+        so the session does not need to read the row back after the commit.
+        """
         db_item = Todo(**data.model_dump())
         self.session.add(db_item)
+        # Write the todo before its counters, the order every write locks in
+        self.session.flush()
+        add_todo_stats(
+            self.session,
+            todo_stats_deltas(added=[(db_item.user_id, db_item.completed)]),
+        )
         self.session.commit()
-        self.session.refresh(db_item)
         return db_item
 
-    def get_all(self, page: int = 1, page_size: int = 15) -> Tuple[int, List[Todo]]:
-        offset = (page - 1) * page_size
-        limit = page_size
-        total_count = self.session.query(Todo).count()
-        db_items = self.session.query(Todo).offset(offset).limit(limit).all()
-        return total_count, db_items
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 15,
+        after: Optional[Tuple[datetime, UUID4]] = None,
+        limit: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Row]:
+        """
+        List todos ordered by (created_at, id), with only ``columns`` when
+        set.
+
+        With ``after`` set, seek past that (created_at, id) position on
+        ix_todos_created_at_id instead of skipping rows with OFFSET, so every
+        page costs the same regardless of depth. ``limit`` defaults to
+        page_size and lets callers read ahead past the page.
+
+        Like the other list reads, returns plain column rows rather than Todo
+        instances: pages are only serialized, so building ORM objects in the
+        identity map would be wasted work.
+        """
+        statement = all_todos_statement(columns)
+        if after is not None:
+            statement = statement.where(tuple_(todos.c.created_at, todos.c.id) > after)
+        else:
+            statement = statement.offset((page - 1) * page_size)
+        return self.session.execute(statement.limit(limit or page_size)).all()
+
+    def get_all_by_user(
+        self,
+        user_id: UUID4,
+        completed: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, UUID4]] = None,
+        limit: int = 15,
+    ) -> List[Row]:
+        """
+        List a user's todos ordered by (created_at, id).
+
+        The equality filters lead ix_todos_user_id_completed_created_at_id, or
+        ix_todos_user_id_created_at_id without ``completed``, so the creation
+        range, the ``after`` seek and the ordering are all read off the index.
+        """
+        statement = select(*todos.c).where(todos.c.user_id == user_id)
+        if completed is not None:
+            statement = statement.where(todos.c.completed == completed)
+        if created_from is not None:
+            statement = statement.where(todos.c.created_at >= created_from)
+        if created_to is not None:
+            statement = statement.where(todos.c.created_at < created_to)
+        if after is not None:
+            statement = statement.where(tuple_(todos.c.created_at, todos.c.id) > after)
+        statement = statement.order_by(todos.c.created_at, todos.c.id).limit(limit)
+        return self.session.execute(statement).all()
+
+    def search(
+        self, user_id: UUID4, terms: List[str], offset: int = 0, limit: int = 15
+    ) -> List[Row]:
+        """
+        Full-text search of a user's todo titles, best matches first.
+
+        Todos match when their title contains every term. On PostgreSQL the
+        GIN-indexed search_vector column is ranked with ts_rank, elsewhere the
+        todos_fts FTS5 index is ranked with bm25. Ties are broken by id so
+        pages are stable.
+        """
+        statement = select(*todos.c).where(todos.c.user_id == user_id)
+        if self.session.get_bind().dialect.name == "postgresql":
+            search_vector = literal_column("todos.search_vector")
+            ts_query = func.to_tsquery(POSTGRES_SEARCH_CONFIG, tsquery(terms))
+            statement = statement.where(search_vector.op("@@")(ts_query)).order_by(
+                func.ts_rank(search_vector, ts_query).desc(), todos.c.id
+            )
+        else:
+            statement = (
+                statement.join(
+                    todos_fts, todos_fts.c.rowid == literal_column("todos.rowid")
+                )
+                .where(literal_column("todos_fts").op("MATCH")(fts5_query(terms)))
+                .order_by(todos_fts.c.rank, todos.c.id)
+            )
+        return self.session.execute(statement.offset(offset).limit(limit)).all()
+
+    def stream_all(self, batch_size: int = 1000) -> Iterator[List[Row]]:
+        """
+        Read every todo ordered by (created_at, id), batch_size rows at a time.
+
+        The rows come off a server-side cursor (yield_per), so only one batch
+        is held in memory however many todos there are, and the first batch
+        is available before the database has produced the rest.
+        """
+        result = self.session.execute(
+            all_todos_statement(), execution_options={"yield_per": batch_size}
+        )
+        yield from result.partitions()
+
+    def count(self) -> int:
+        return self.session.query(Todo).count()
+
+    def estimate_count(self) -> Optional[int]:
+        """
+        Read the planner's row estimate for the todos table.
+
+        Returns None where no estimate exists: on backends other than
+        PostgreSQL, or before the table has been analyzed.
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = self.session.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table_name)"
+            ),
+            {"table_name": Todo.__tablename__},
+        ).scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
+
+    def get_stats(self, user_id: UUID4) -> Optional[UserTodoStats]:
+        """
+        Read a user's todo counters, None if they never had a todo.
+        """
+        return self.session.get(UserTodoStats, user_id)
 
     def get_by_id(self, _id: UUID4) -> Todo:
         return self.session.query(Todo).filter_by(id=_id).first()
 
-    def delete(self, db_item: Type[Todo]) -> bool:
-        self.session.delete(db_item)
+    def get_archived_by_id(self, _id: UUID4) -> Optional[TodoArchive]:
+        return self.session.get(TodoArchive, _id)
+
+    def get_columns_by_id(
+        self, _id: UUID4, columns: Sequence[str], archived: bool = False
+    ) -> Optional[Row]:
+        """
+        Read only some columns of a todo, from todos_archive with archived.
+        """
+        table = TodoArchive.__table__ if archived else todos
+        statement = select(*[table.c[name] for name in columns]).where(
+            table.c.id == _id
+        )
+        return self.session.execute(statement).first()
+
+    def archive_completed(self, completed_before: datetime, limit: int) -> int:
+        """
+        Move up to ``limit`` todos completed and last updated before
+        ``completed_before`` into todos_archive, in one transaction.
+
+        The oldest are moved first, found through the partial
+        ix_todos_completed_updated_at index.
+
+        Returns:
+            int: The number of todos moved.
+        """
+        batch = (
+            select(Todo.id)
+            .where(Todo.completed == True, Todo.updated_at < completed_before)
+            .order_by(Todo.updated_at)
+            .limit(limit)
+        )
+        rows = delete_returning_all(self.session, Todo.__table__, Todo.id.in_(batch))
+        if rows:
+            archived_at = utc_now()
+            self.session.execute(
+                insert(TodoArchive.__table__),
+                [dict(row._mapping, archived_at=archived_at) for row in rows],
+            )
+        self.session.commit()
+        return len(rows)
+
+    def restore_archived(self, ids: List[UUID4]) -> int:
+        """
+        Move archived todos back into todos, in the caller's transaction, so
+        a write retried after missing them finds them there. Their stats
+        never stopped counting them.
+
+        Returns:
+            int: The number of todos restored.
+        """
+        rows = delete_returning_all(
+            self.session, TodoArchive.__table__, TodoArchive.id.in_(ids)
+        )
+        if rows:
+            self.session.execute(
+                insert(todos),
+                [
+                    {column.name: row._mapping[column.name] for column in todos.c}
+                    for row in rows
+                ],
+            )
+        return len(rows)
+
+    def delete(self, _id: UUID4) -> Optional[Row]:
+        """
+        Delete a todo in one DELETE ... RETURNING round trip, and uncount it
+        from its user's stats in the same transaction.
+
+        Returns the deleted row, or None if no todo has this id.
+        """
+        row = delete_returning(self.session, Todo.__table__, Todo.id == _id)
+        if row is not None:
+            add_todo_stats(
+                self.session,
+                todo_stats_deltas(removed=[(row.user_id, row.completed)]),
+            )
         self.session.commit()
-        return True
+        return row
 
     def exists_by_id(self, _id: UUID4) -> bool:
         db_item = self.session.query(Todo).filter_by(id=_id).first()
         return db_item is not None
 
-    def update(self, db_item: TodoOutput, updated: TodoInput) -> Todo:
-        db_item.title = updated.title
-        db_item.completed = updated.completed
+    def update(self, _id: UUID4, updated: TodoInput) -> Optional[Row]:
+        """
+        Update a todo with UPDATE ... RETURNING.
+
+        The UPDATE is conditioned on the todo's completed flag staying as it
+        is. Only when that misses is it run again conditioned on the flag
+        changing, which counts the change in the user's stats in the same
+        transaction.
+
+        Returns the updated row, or None if no todo has this id.
+        """
+        values = {"title": updated.title, "completed": updated.completed}
+        completed = func.coalesce(todos.c.completed, False)
+        row = update_returning(
+            self.session,
+            todos,
+            (todos.c.id == _id) & (completed == updated.completed),
+            values,
+        )
+        if row is None:
+            row = update_returning(
+                self.session,
+                todos,
+                (todos.c.id == _id) & (completed != updated.completed),
+                values,
+            )
+            if row is not None:
+                add_todo_stats(
+                    self.session,
+                    todo_stats_deltas(
+                        added=[(row.user_id, row.completed)],
+                        removed=[(row.user_id, not row.completed)],
+                    ),
+                )
+        self.session.commit()
+        return row
+
+    def create_many(self, items: List[TodoInput]) -> List[Todo]:
+        """
+        Insert todos and count them in their users' stats, in one
+        transaction.
+
+        ids and timestamps are generated client-side, so the unit of work
+        batches the rows into a multi-row INSERT instead of one per todo.
+        """
+        db_items = [Todo(**item.model_dump()) for item in items]
+        self.session.add_all(db_items)
+        self.session.flush()
+        add_todo_stats(
+            self.session,
+            todo_stats_deltas(
+                added=[(todo.user_id, todo.completed) for todo in db_items]
+            ),
+        )
+        self.session.commit()
+        return db_items
+
+    def import_many(self, user_id: UUID4, items: List[TodoImportItem]) -> int:
+        """
+        Insert a batch of imported todos for a user, and count them in the
+        user's stats, in one transaction.
+
+        The rows go in with COPY on PostgreSQL and an executemany INSERT
+        elsewhere, and are not read back.
+
+        Returns:
+            int: The number of todos inserted.
+        """
+        now = utc_now()
+        copy_rows(
+            self.session,
+            todos,
+            [
+                {
+                    "id": uuid7(),
+                    "user_id": user_id,
+                    "title": item.title,
+                    "completed": item.completed,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for item in items
+            ],
+        )
+        add_todo_stats(
+            self.session,
+            todo_stats_deltas(added=[(user_id, item.completed) for item in items]),
+        )
+        self.session.commit()
+        return len(items)
+
+    def update_many(self, items: List[TodoBulkUpdateItem]) -> List[Dict[str, Any]]:
+        """
+        Update todos in one transaction.
+
+        Reads and locks the current rows with a single SELECT ... IN, then
+        applies the updates with one executemany UPDATE per combination of
+        fields sent, and counts the changes of completed in the users' stats.
+        Only the fields set on an item are updated.
+
+        Returns the updated todos as column dicts; ids with no todo are left
+        out.
+        """
+        ids = [item.id for item in items]
+        rows = {
+            row.id: dict(row._mapping)
+            for row in self.session.execute(
+                select(*Todo.__table__.c).where(Todo.id.in_(ids)).with_for_update()
+            )
+        }
+        updated_at = utc_now()
+        batches: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        added, removed = [], []
+        for item in items:
+            if item.id not in rows:
+                continue
+            removed.append((rows[item.id]["user_id"], rows[item.id]["completed"]))
+            values = item.model_dump(include={"title", "completed"}, exclude_unset=True)
+            values["updated_at"] = updated_at
+            rows[item.id].update(values)
+            added.append((rows[item.id]["user_id"], rows[item.id]["completed"]))
+            batches.setdefault(tuple(sorted(values)), []).append(
+                {"_id": item.id, **values}
+            )
+
+        # The SET clause is taken from the keys of the parameter sets
+        statement = update(Todo.__table__).where(Todo.id == bindparam("_id"))
+        for params in batches.values():
+            self.session.execute(statement, params)
+        add_todo_stats(self.session, todo_stats_deltas(added, removed))
+        self.session.commit()
+        return [rows[item.id] for item in items if item.id in rows]
+
+    def delete_many(self, ids: List[UUID4]) -> List[Row]:
+        """
+        Delete todos in one DELETE ... RETURNING round trip, and uncount them
+        from their users' stats in the same transaction.
+
+        Returns the deleted rows; ids with no todo are left out.
+        """
+        rows = delete_returning_all(self.session, Todo.__table__, Todo.id.in_(ids))
+        add_todo_stats(
+            self.session,
+            todo_stats_deltas(removed=[(row.user_id, row.completed) for row in rows]),
+        )
         self.session.commit()
-        self.session.refresh(db_item)
-        updated_item = self.session.query(Todo).filter_by(id=db_item.id).first()
-        return updated_item
+        return rows
+
+
+class AsyncTodoRepository:
+    """
+    Async counterpart of TodoRepository, run on the AsyncSession via run_sync.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, data: TodoInput) -> Todo:
+        return await self.session.run_sync(lambda s: TodoRepository(s).create(data))
+
+    async def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 15,
+        after: Optional[Tuple[datetime, UUID4]] = None,
+        limit: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Row]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).get_all(
+                page=page,
+                page_size=page_size,
+                after=after,
+                limit=limit,
+                columns=columns,
+            )
+        )
+
+    async def search(
+        self, user_id: UUID4, terms: List[str], offset: int = 0, limit: int = 15
+    ) -> List[Row]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).search(
+                user_id, terms, offset=offset, limit=limit
+            )
+        )
+
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """
+        Async counterpart of TodoRepository.stream_all.
+
+        Unlike the other reads it cannot go through run_sync, which has to
+        finish before returning; the rows are streamed with
+        AsyncSession.stream instead, the cursor staying open between batches.
+        """
+        result = await self.session.stream(
+            all_todos_statement().execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def count(self) -> int:
+        return await self.session.run_sync(lambda s: TodoRepository(s).count())
+
+    async def estimate_count(self) -> Optional[int]:
+        return await self.session.run_sync(lambda s: TodoRepository(s).estimate_count())
+
+    async def get_all_by_user(
+        self,
+        user_id: UUID4,
+        completed: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, UUID4]] = None,
+        limit: int = 15,
+    ) -> List[Row]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).get_all_by_user(
+                user_id,
+                completed=completed,
+                created_from=created_from,
+                created_to=created_to,
+                after=after,
+                limit=limit,
+            )
+        )
+
+    async def get_stats(self, user_id: UUID4) -> Optional[UserTodoStats]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).get_stats(user_id)
+        )
+
+    async def get_by_id(self, _id: UUID4) -> Todo:
+        return await self.session.run_sync(lambda s: TodoRepository(s).get_by_id(_id))
+
+    async def get_archived_by_id(self, _id: UUID4) -> Optional[TodoArchive]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).get_archived_by_id(_id)
+        )
+
+    async def get_columns_by_id(
+        self, _id: UUID4, columns: Sequence[str], archived: bool = False
+    ) -> Optional[Row]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).get_columns_by_id(_id, columns, archived)
+        )
+
+    async def archive_completed(self, completed_before: datetime, limit: int) -> int:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).archive_completed(completed_before, limit)
+        )
+
+    async def delete(self, _id: UUID4) -> Optional[Row]:
+        return await self.session.run_sync(lambda s: TodoRepository(s).delete(_id))
+
+    async def exists_by_id(self, _id: UUID4) -> bool:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).exists_by_id(_id)
+        )
+
+    async def update(self, _id: UUID4, updated: TodoInput) -> Optional[Row]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).update(_id, updated)
+        )
+
+    async def create_many(self, items: List[TodoInput]) -> List[Todo]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).create_many(items)
+        )
+
+    async def import_many(self, user_id: UUID4, items: List[TodoImportItem]) -> int:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).import_many(user_id, items)
+        )
+
+    async def update_many(
+        self, items: List[TodoBulkUpdateItem]
+    ) -> List[Dict[str, Any]]:
+        return await self.session.run_sync(
+            lambda s: TodoRepository(s).update_many(items)
+        )
+
+    async def delete_many(self, ids: List[UUID4]) -> List[Row]:
+        return await self.session.run_sync(lambda s: TodoRepository(s).delete_many(ids))
@@ -1,9 +1,13 @@
-from typing import Type
+from typing import Optional, Type
 
 from pydantic import UUID4
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from db.models import User
+from db.returning import delete_returning
 from schemas.user import UserIn, UserInDBBase, UserInDB, UserRegister
 
 
@@ -23,7 +27,12 @@ class UserRepository:
 
     def create(self, data: UserRegister, hashed_password: str) -> User:
         """
-        Create a new user.
+        Create a new user in a single INSERT.
+
+        id and timestamps are generated client-side, so the row is not read
+        back after the commit. Uniqueness of email and username is enforced
+        by the database; on a violation the transaction is rolled back and
+        the IntegrityError is re-raised.
 
         Args:
             data (UserIn): The user data.
@@ -31,13 +40,19 @@ class UserRepository:
 
         Returns:
             UserInDBBase: The created user.
+
+        Raises:
+            IntegrityError: If the email or username is already taken.
         """
         db_user = User(
             **data.model_dump(exclude={"password"}), hashed_password=hashed_password
         )
         self.session.add(db_user)
-        self.session.commit()
-        self.session.refresh(db_user)
+        try:
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+            raise
         return db_user
 
     def user_exists_by_email(self, email: str) -> bool:
@@ -139,6 +154,20 @@ class UserRepository:
             is not None
         )
 
+    def get_superuser_flag(self, _id: UUID4) -> Optional[bool]:
+        """
+        Get the is_superuser flag of an active user in a single query.
+
+        Args:
+            _id (UUID4): The ID of the user.
+
+        Returns:
+            bool: The user's is_superuser flag, or None if the user does not exist.
+        """
+        return self.session.execute(
+            select(User.is_superuser).where(User.id == _id, User.is_active == True)
+        ).scalar_one_or_none()
+
     def inactive_user(self, user: Type[User]) -> bool:
         """
         De-register a user.
@@ -151,12 +180,161 @@ class UserRepository:
         """
         user.is_active = False
         self.session.commit()
-        self.session.refresh(user)
         return True
 
-    def delete_user(self, user: Type[User]) -> bool:
+    def delete_user(self, _id: UUID4) -> bool:
+        """
+        Delete an active user in one DELETE ... RETURNING round trip.
+
+        Args:
+            _id (UUID4): The ID of the user.
+
+        Returns:
+            bool: True if deletion was successful, False if no active user matched.
         """
-        Delete a user.
+        row = delete_returning(
+            self.session, User.__table__, (User.id == _id) & (User.is_active == True)
+        )
+        self.session.commit()
+        return row is not None
+
+
+class AsyncUserRepository:
+    """
+    Async repository class for handling users.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the repository with an async database session.
+
+        Args:
+            session (AsyncSession): The async database session.
+        """
+        self.session = session
+
+    async def create(self, data: UserRegister, hashed_password: str) -> User:
+        """
+        Create a new user in a single INSERT.
+
+        id and timestamps are generated client-side, so the row is not read
+        back after the commit.
+
+        Args:
+            data (UserRegister): The user data.
+            hashed_password (str): The hashed password.
+
+        Returns:
+            User: The created user.
+
+        Raises:
+            IntegrityError: If the email or username is already taken.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).create(data, hashed_password)
+        )
+
+    async def user_exists_by_email(self, email: str) -> bool:
+        """
+        Check if a user exists by email.
+
+        Args:
+            email (str): The email to check.
+
+        Returns:
+            bool: True if the user exists, False otherwise.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).user_exists_by_email(email)
+        )
+
+    async def user_exists_by_username(self, username: str) -> bool:
+        """
+        Check if a user exists by username.
+
+        Args:
+            username (str): The username to check.
+
+        Returns:
+            bool: True if the user exists, False otherwise.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).user_exists_by_username(username)
+        )
+
+    async def get_user_by_email(self, email: str):
+        """
+        Get a user by email.
+
+        Args:
+            email (str): The email of the user.
+
+        Returns:
+            User: The user.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).get_user_by_email(email)
+        )
+
+    async def get_user_by_username(self, username: str) -> Type[User]:
+        """
+        Get a user by username.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            User: The user.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).get_user_by_username(username)
+        )
+
+    async def get_user_object_by_id(self, _id: UUID4) -> Type[User]:
+        """
+        Get a user object by ID.
+
+        Args:
+            _id (UUID4): The ID of the user.
+
+        Returns:
+            Type[User]: The user instance.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).get_user_object_by_id(_id)
+        )
+
+    async def user_exists_by_id(self, _id: UUID4) -> bool:
+        """
+        Check if a user exists by ID.
+
+        Args:
+            _id (UUID4): The ID of the user.
+
+        Returns:
+            bool: True if the user exists, False otherwise.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).user_exists_by_id(_id)
+        )
+
+    async def get_superuser_flag(self, _id: UUID4) -> Optional[bool]:
+        """
+        Get the is_superuser flag of an active user in a single query.
+
+        Args:
+            _id (UUID4): The ID of the user.
+
+        Returns:
+            bool: The user's is_superuser flag, or None if the user does not exist.
+        """
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).get_superuser_flag(_id)
+        )
+
+    async def inactive_user(self, user: Type[User]) -> bool:
+        """
+        De-register a user.
 
         Args:
             user (Type[User]): The user instance.
@@ -164,6 +342,18 @@ class UserRepository:
         Returns:
             bool: True if deletion was successful, False otherwise.
         """
-        self.session.delete(user)
-        self.session.commit()
-        return True
+        return await self.session.run_sync(
+            lambda s: UserRepository(s).inactive_user(user)
+        )
+
+    async def delete_user(self, _id: UUID4) -> bool:
+        """
+        Delete an active user in one DELETE ... RETURNING round trip.
+
+        Args:
+            _id (UUID4): The ID of the user.
+
+        Returns:
+            bool: True if deletion was successful, False if no active user matched.
+        """
+        return await self.session.run_sync(lambda s: UserRepository(s).delete_user(_id))
@@ -1,6 +1,14 @@
 from fastapi import APIRouter
 
 from settings import settings
+from db.base import (
+    engine,
+    async_engine,
+    pool_statistics,
+    async_pool_statistics,
+    replica_engines,
+    replica_pool_statistics,
+)
 from utils.datetime_helper import DateTimeHelper
 
 router = APIRouter(prefix="/system", tags=["system"])
@@ -20,3 +28,15 @@ def info():
         "version": settings.VERSION,
         "iso_time": helper.iso_format(current_time),
     }
+
+
+@router.get("/pool", status_code=200)
+def pool():
+    return {
+        "engine": pool_statistics.as_dict(engine.pool),
+        "async_engine": async_pool_statistics.as_dict(async_engine.sync_engine.pool),
+        "replicas": [
+            statistics.as_dict(replica.sync_engine.pool)
+            for replica, statistics in zip(replica_engines, replica_pool_statistics)
+        ],
+    }
@@ -1,61 +1,244 @@
-from pydantic import UUID4
-from fastapi import APIRouter, status, Depends, Query
-from sqlalchemy.orm import Session
+from typing import Awaitable, Callable, List, Optional
+
+from fastapi import APIRouter, status, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from schemas.response import CommonResponse
-from schemas.todo import TodoInput, TodoOutput, TodoList
+from schemas.types import UUID4or7
+from schemas.todo import (
+    TodoInput,
+    TodoOutput,
+    TodoList,
+    CountStrategy,
+    TodoFileFormat,
+    TodoBulkCreate,
+    TodoBulkUpdate,
+    TodoBulkDelete,
+    TodoBulkResult,
+    TodoImportResult,
+)
 from schemas.user import UserInDBBase
-from services.todo_service import TodoService
-from db.base import get_session
-from core.auth import get_current_user
+from services.todo_service import AsyncTodoService, TODO_FILE_MEDIA_TYPES
+from db.base import get_async_session
+from core.auth import (
+    get_current_reader,
+    get_current_writer,
+    get_read_session,
+    get_read_session_opener,
+)
+from utils.responses import DefaultJSONResponse, ModelRoute
 
-router = APIRouter(prefix="/todos", tags=["todos"])
+router = APIRouter(prefix="/todos", tags=["todos"], route_class=ModelRoute)
+
+# Sparse fieldsets of todo reads; only the listed columns are selected
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated todo fields to return, e.g. id,title,completed; "
+    "all of them by default",
+)
 
 
 @router.post(
     "", status_code=status.HTTP_201_CREATED, response_model=CommonResponse[TodoOutput]
 )
-def create_new_todo(
+async def create_new_todo(
     data: TodoInput,
-    session: Session = Depends(get_session),
-    current_user: UserInDBBase = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: UserInDBBase = Depends(get_current_writer),
 ):
     data.user_id = current_user.id
-    _service = TodoService(session)
-    created_todo = _service.create(data)
+    _service = AsyncTodoService(session)
+    created_todo = await _service.create(data)
     return CommonResponse[TodoOutput](
         message="Todo is created successfully.", data=created_todo
     )
 
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=TodoList)
-def get_all_todos(
-    session: Session = Depends(get_session),
+async def get_all_todos(
+    session: AsyncSession = Depends(get_read_session),
     page: int = Query(1, gt=0),
     page_size: int = Query(15, gt=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous page's next_cursor, "
+        "switches to keyset pagination and ignores page",
+    ),
+    count: Optional[CountStrategy] = Query(
+        None,
+        description="How total_count is computed, defaults to TODO_COUNT_STRATEGY",
+    ),
+    fields: Optional[str] = FIELDS_QUERY,
 ):
-    _service = TodoService(session)
-    total_count, todos = _service.get_all(page=page, page_size=page_size)
-    return TodoList(
-        todos=todos, page=page, page_size=len(todos), total_count=total_count
+    _service = AsyncTodoService(session)
+    todos = await _service.get_all(
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        count_strategy=count,
+        fields=fields,
+    )
+    if fields is not None:
+        # Sparse pages leave out fields TodoList requires, render them as they are
+        return DefaultJSONResponse(todos)
+    return todos
+
+
+# Fixed paths (/export, /import, /search, /bulk) are declared before /{_id} so they are
+# not parsed as an id
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {
+                media_type: {} for media_type in TODO_FILE_MEDIA_TYPES.values()
+            },
+            "description": "Every todo, oldest first",
+        }
+    },
+)
+async def export_todos(
+    format: TodoFileFormat = Query(TodoFileFormat.NDJSON),
+    open_session: Callable[[], Awaitable[AsyncSession]] = Depends(
+        get_read_session_opener
+    ),
+):
+    async def content():
+        session = await open_session()
+        try:
+            async for chunk in AsyncTodoService(session).export(format):
+                yield chunk
+        finally:
+            await session.close()
+
+    return StreamingResponse(
+        content(),
+        media_type=TODO_FILE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format.value}"'},
+    )
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=CommonResponse[TodoImportResult],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in TODO_FILE_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_todos(
+    request: Request,
+    format: TodoFileFormat = Query(TodoFileFormat.NDJSON),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: UserInDBBase = Depends(get_current_writer),
+):
+    # The body is read as it arrives, never buffered whole
+    result = await AsyncTodoService(session).import_todos(
+        current_user.id, request.stream(), format
+    )
+    return CommonResponse[TodoImportResult](
+        message="Todos are imported successfully.", data=result
+    )
+
+
+@router.get("/search", status_code=status.HTTP_200_OK, response_model=TodoList)
+async def search_todos(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Words to look for; todos whose title contains all of them match",
+    ),
+    page: int = Query(1, gt=0),
+    page_size: int = Query(15, gt=0),
+    session: AsyncSession = Depends(get_read_session),
+    current_user: UserInDBBase = Depends(get_current_reader),
+):
+    _service = AsyncTodoService(session)
+    return await _service.search(current_user.id, q, page=page, page_size=page_size)
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=CommonResponse[List[TodoBulkResult]],
+)
+async def create_todos_bulk(
+    data: TodoBulkCreate,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: UserInDBBase = Depends(get_current_writer),
+):
+    for todo in data.todos:
+        todo.user_id = current_user.id
+    created_todos = await AsyncTodoService(session).create_many(data.todos)
+    return CommonResponse[List[TodoBulkResult]](
+        message="Todos are created successfully.", data=created_todos
+    )
+
+
+@router.patch(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=CommonResponse[List[TodoBulkResult]],
+)
+async def update_todos_bulk(
+    data: TodoBulkUpdate,
+    session: AsyncSession = Depends(get_async_session),
+    _: UserInDBBase = Depends(get_current_writer),
+):
+    updated_todos = await AsyncTodoService(session).update_many(data.todos)
+    return CommonResponse[List[TodoBulkResult]](
+        message="Todos are updated successfully.", data=updated_todos
+    )
+
+
+@router.delete(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=CommonResponse[List[TodoBulkResult]],
+)
+async def delete_todos_bulk(
+    data: TodoBulkDelete,
+    session: AsyncSession = Depends(get_async_session),
+    _: UserInDBBase = Depends(get_current_writer),
+):
+    deleted_todos = await AsyncTodoService(session).delete_many(data.ids)
+    return CommonResponse[List[TodoBulkResult]](
+        message="Todos are deleted successfully.", data=deleted_todos
     )
 
 
 @router.get("/{_id}", response_model=TodoOutput)
-def get_todo_details(_id: UUID4, session: Session = Depends(get_session)):
-    _service = TodoService(session)
-    return _service.get_by_id(_id)
+async def get_todo_details(
+    _id: UUID4or7,
+    session: AsyncSession = Depends(get_read_session),
+    fields: Optional[str] = FIELDS_QUERY,
+):
+    _service = AsyncTodoService(session)
+    todo = await _service.get_by_id(_id, fields=fields)
+    if fields is not None:
+        return DefaultJSONResponse(todo)
+    return todo
 
 
 @router.delete(
     "/{_id}", status_code=status.HTTP_200_OK, response_model=CommonResponse[TodoOutput]
 )
-def delete_todo(
-    _id: UUID4,
-    session: Session = Depends(get_session),
-    _: UserInDBBase = Depends(get_current_user),
+async def delete_todo(
+    _id: UUID4or7,
+    session: AsyncSession = Depends(get_async_session),
+    _: UserInDBBase = Depends(get_current_writer),
 ):
-    deleted_todo = TodoService(session).delete(_id)
+    deleted_todo = await AsyncTodoService(session).delete(_id)
     return CommonResponse[TodoOutput](
         message="Todo is deleted successfully.", data=deleted_todo
     )
@@ -64,14 +247,14 @@ def delete_todo(
 @router.put(
     "/{_id}", status_code=status.HTTP_200_OK, response_model=CommonResponse[TodoOutput]
 )
-def update_todo(
-    _id: UUID4,
+async def update_todo(
+    _id: UUID4or7,
     data: TodoInput,
-    session: Session = Depends(get_session),
-    _: UserInDBBase = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    _: UserInDBBase = Depends(get_current_writer),
 ):
-    _service = TodoService(session)
-    updated_todo = _service.update(_id, data)
+    _service = AsyncTodoService(session)
+    updated_todo = await _service.update(_id, data)
     return CommonResponse[TodoOutput](
         message="Todo is updated successfully.", data=updated_todo
     )
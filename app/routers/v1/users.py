@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
 
-from core.auth import get_current_user
-from db.base import get_session
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth import get_current_reader, get_read_session, mark_write
+from db.base import get_async_session
 from schemas.response import CommonResponse
 from schemas.user import UserIn, UserLogin, UserRegister, UserInDBBase, Token
-from services.user_service import UserService
+from schemas.todo import TodoList, TodoStats
+from services.todo_service import AsyncTodoService
+from services.user_service import AsyncUserService
+from utils.responses import ModelRoute
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=ModelRoute)
 
 
 @router.post(
@@ -15,42 +21,48 @@ router = APIRouter(prefix="/users", tags=["users"])
     status_code=status.HTTP_201_CREATED,
     response_model=CommonResponse[UserInDBBase],
 )
-def register(data: UserRegister, session: Session = Depends(get_session)):
+async def register(
+    data: UserRegister,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
     """
     Register a new user.
 
     Args:
         data (UserRegister): Details of the user to be registered.
-        session (Session): Database session.
+        response (Response): The response, which carries the write cookie.
+        session (AsyncSession): Async database session.
 
     Returns:
         UserInDBBase: Details of the registered user.
     """
-    _service = UserService(session)
-    registered_user = _service.create(data)
+    _service = AsyncUserService(session)
+    registered_user = await _service.create(data)
+    mark_write(response, data.email)
     return CommonResponse[UserInDBBase](
         message="User is registered successfully.", data=registered_user
     )
 
 
 @router.post("/login", status_code=status.HTTP_200_OK, response_model=Token)
-def login(data: UserLogin, session: Session = Depends(get_session)):
+async def login(data: UserLogin, session: AsyncSession = Depends(get_async_session)):
     """
     Login user.
 
     Args:
         data (UserLogin): Login data with email and password.
-        session (Session): Database session.
+        session (AsyncSession): Async database session.
 
     Returns:
         None
     """
-    _service = UserService(session)
-    return _service.login(data)
+    _service = AsyncUserService(session)
+    return await _service.login(data)
 
 
 @router.get("/me", status_code=status.HTTP_200_OK, response_model=UserInDBBase)
-def get_me(user: UserIn = Depends(get_current_user)):
+async def get_me(user: UserIn = Depends(get_current_reader)):
     """
     Retrieve information of the authenticated user.
 
@@ -61,3 +73,65 @@ def get_me(user: UserIn = Depends(get_current_user)):
         UserInDBBase: Details of the authenticated user.
     """
     return user
+
+
+@router.get("/me/todos", status_code=status.HTTP_200_OK, response_model=TodoList)
+async def get_my_todos(
+    session: AsyncSession = Depends(get_read_session),
+    user: UserIn = Depends(get_current_reader),
+    page_size: int = Query(15, gt=0),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous page's next_cursor"
+    ),
+    completed: Optional[bool] = Query(None, description="Only (un)completed todos"),
+    created_from: Optional[datetime] = Query(
+        None, description="Only todos created at or after this time"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Only todos created before this time"
+    ),
+):
+    """
+    List the authenticated user's todos, oldest first.
+
+    Args:
+        session (AsyncSession): Async read session.
+        user (UserIn): Current user's details.
+        page_size (int): Todos per page.
+        cursor (str): Cursor of the page to fetch.
+        completed (bool): Filter on completion.
+        created_from (datetime): Inclusive lower bound of created_at.
+        created_to (datetime): Exclusive upper bound of created_at.
+
+    Returns:
+        TodoList: A page of the user's todos.
+    """
+    _service = AsyncTodoService(session)
+    return await _service.get_all_for_user(
+        user.id,
+        page_size=page_size,
+        cursor=cursor,
+        completed=completed,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+
+@router.get("/me/todos/stats", status_code=status.HTTP_200_OK, response_model=TodoStats)
+async def get_my_todo_stats(
+    session: AsyncSession = Depends(get_read_session),
+    user: UserIn = Depends(get_current_reader),
+):
+    """
+    Count the authenticated user's todos, read from counters maintained on
+    every write rather than aggregated per request.
+
+    Args:
+        session (AsyncSession): Async read session.
+        user (UserIn): Current user's details.
+
+    Returns:
+        TodoStats: The user's total and completed todo counts.
+    """
+    _service = AsyncTodoService(session)
+    return await _service.get_stats(user.id)
@@ -1,7 +1,12 @@
-from typing import List, Any, Optional
+import functools
+from enum import Enum
+from typing import List, Any, Optional, Tuple, Type
 from datetime import datetime
 
-from pydantic import BaseModel, UUID4, Field
+from pydantic import BaseModel, Field, create_model
+
+from settings import settings
+from schemas.types import UUID4or7
 
 
 class TodoInput(BaseModel):
@@ -13,12 +18,12 @@ class TodoInput(BaseModel):
     )
     # user_id is set to None, and it's defined as Optional
     # because user_id is assigned on the app site not from client
-    user_id: Optional[UUID4] = Field(None, description="The authenticated user id")
+    user_id: Optional[UUID4or7] = Field(None, description="The authenticated user id")
 
 
 class TodoOutput(BaseModel):
-    id: UUID4
-    user_id: UUID4
+    id: UUID4or7
+    user_id: UUID4or7
     title: str
     completed: bool
     created_at: datetime
@@ -28,8 +33,121 @@ class TodoOutput(BaseModel):
         from_attributes = True
 
 
+class CountStrategy(str, Enum):
+    """How the total_count of a todo list is computed."""
+
+    # COUNT(*) on every request
+    EXACT = "exact"
+    # COUNT(*) cached for a TTL and dropped on writes
+    CACHED = "cached"
+    # Planner row estimate, falls back to exact where unavailable
+    ESTIMATE = "estimate"
+    # No count at all, only has_more
+    NONE = "none"
+
+
 class TodoList(BaseModel):
-    page: int
+    # page is only set for offset pagination, cursor pages have no page number
+    page: Optional[int] = None
     page_size: int
-    total_count: int
+    # total_count is null when the count strategy is none
+    total_count: Optional[int] = None
+    has_more: bool = Field(False, description="Whether another page follows")
     todos: List[TodoOutput]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to fetch the next page, null on the last"
+    )
+
+
+# Sparse fieldsets are tuples of TodoOutput field names in declaration order,
+# so there are few enough to build each model once
+@functools.lru_cache(maxsize=None)
+def sparse_todo_output(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    A TodoOutput with only the given fields, for ?fields= requests.
+    """
+    return create_model(
+        "TodoOutput",
+        **{name: (TodoOutput.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def sparse_todo_list(fields: Tuple[str, ...]) -> Type[TodoList]:
+    """
+    A TodoList of sparse_todo_output todos.
+    """
+    return create_model(
+        "TodoList", __base__=TodoList, todos=(List[sparse_todo_output(fields)], ...)
+    )
+
+
+class TodoStats(BaseModel):
+    # Archived todos are included
+    total: int = Field(0, description="Number of todos the user has")
+    completed: int = Field(0, description="Number of them that are completed")
+
+
+class TodoFileFormat(str, Enum):
+    """File format of GET /todos/export and POST /todos/import."""
+
+    # One JSON object per line
+    NDJSON = "ndjson"
+    # Comma-separated values with a header row
+    CSV = "csv"
+
+
+class TodoImportItem(BaseModel):
+    # Other fields, e.g. those of an export, are ignored
+    title: str = Field(..., min_length=1, description="Title of the todo item")
+    completed: bool = Field(False, description="Whether the todo item is completed")
+
+
+class TodoImportError(BaseModel):
+    line: int = Field(..., description="Line of the upload the record starts on")
+    detail: str
+
+
+class TodoImportResult(BaseModel):
+    imported: int = Field(0, description="Number of todos created")
+    failed: int = Field(0, description="Number of records rejected")
+    # Only the first TODO_IMPORT_MAX_ERRORS rejected records are listed
+    errors: List[TodoImportError] = []
+
+
+class TodoBulkCreateItem(TodoInput):
+    # Every item of a bulk create needs its own title
+    title: str = Field(
+        ..., description="Title of the todo item", examples=["Watch a movie"]
+    )
+
+
+class TodoBulkCreate(BaseModel):
+    todos: List[TodoBulkCreateItem] = Field(
+        ..., min_length=1, max_length=settings.TODO_BULK_MAX_ITEMS
+    )
+
+
+class TodoBulkUpdateItem(TodoInput):
+    id: UUID4or7
+
+
+class TodoBulkUpdate(BaseModel):
+    # Only the fields sent for an item are updated
+    todos: List[TodoBulkUpdateItem] = Field(
+        ..., min_length=1, max_length=settings.TODO_BULK_MAX_ITEMS
+    )
+
+
+class TodoBulkDelete(BaseModel):
+    ids: List[UUID4or7] = Field(
+        ..., min_length=1, max_length=settings.TODO_BULK_MAX_ITEMS
+    )
+
+
+class TodoBulkResult(BaseModel):
+    # One result per requested item, in request order
+    id: UUID4or7
+    status_code: int = Field(..., description="HTTP status of this item")
+    detail: Optional[str] = None
+    todo: Optional[TodoOutput] = None
@@ -0,0 +1,24 @@
+from typing import Annotated
+from uuid import UUID
+
+from pydantic import AfterValidator
+
+# Versions of the UUIDs used as primary keys: rows created before ids became
+# time-ordered carry UUID4 keys, newer rows UUID7 keys
+ID_UUID_VERSIONS = (4, 7)
+
+
+def check_id_version(value: UUID) -> UUID:
+    """
+    Reject UUIDs that are not one of the primary key versions.
+    """
+    if value.version not in ID_UUID_VERSIONS:
+        raise ValueError(
+            f"UUID version {value.version} is not a valid id, "
+            f"expected one of {', '.join(map(str, ID_UUID_VERSIONS))}"
+        )
+    return value
+
+
+# A user or todo id; accepts the same UUID4 values as before plus UUID7
+UUID4or7 = Annotated[UUID, AfterValidator(check_id_version)]
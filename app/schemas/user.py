@@ -1,6 +1,8 @@
 from typing import Optional
 
-from pydantic import BaseModel, UUID4, Field
+from pydantic import BaseModel, Field
+
+from schemas.types import UUID4or7
 
 
 class UserBase(BaseModel):
@@ -28,7 +30,7 @@ class UserIn(UserBase):
 
 
 class UserInDBBase(UserBase):
-    id: UUID4
+    id: UUID4or7
 
     class ConfigDict:
         from_attributes = True
@@ -0,0 +1,32 @@
+import asyncio
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from logger import logger
+from services.todo_service import AsyncTodoService
+
+
+async def todo_archive_loop(
+    session_factory: Callable[[], AsyncSession], interval: float
+) -> None:
+    """
+    Archive completed todos every ``interval`` seconds until cancelled.
+
+    Each run moves every todo completed more than TODO_ARCHIVE_AFTER_DAYS
+    ago, TODO_ARCHIVE_BATCH_SIZE per transaction. Failures are logged and
+    retried on the next tick.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Opens a primary session.
+        interval (float): Seconds between two runs.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                archived = await AsyncTodoService(session).archive_completed()
+            if archived:
+                logger.info(f"Archived {archived} completed todos")
+        except Exception as e:
+            logger.warning(f"Todo archiving failed: {e}")
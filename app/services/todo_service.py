@@ -1,12 +1,226 @@
-from typing import Tuple, List
-from pydantic import UUID4
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    Tuple,
+    List,
+    Optional,
+    Union,
+)
+from pydantic import UUID4, BaseModel, ValidationError
 
 from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from schemas.todo import TodoInput, TodoOutput
+from settings import settings
+from schemas.todo import (
+    TodoInput,
+    TodoOutput,
+    TodoList,
+    TodoStats,
+    CountStrategy,
+    TodoFileFormat,
+    TodoImportItem,
+    TodoImportError,
+    TodoImportResult,
+    TodoBulkUpdateItem,
+    TodoBulkResult,
+    sparse_todo_output,
+    sparse_todo_list,
+)
 from services.user_service import UserService
-from repositories.todo_repository import TodoRepository
+from db.models import utc_now
+from db.search import search_terms
+from repositories.todo_repository import TodoRepository, AsyncTodoRepository
+from utils.cache import TTLCache
+from utils.pagination import encode_cursor, decode_cursor
+from utils.records import (
+    RecordError,
+    iter_csv_records,
+    iter_lines,
+    iter_ndjson_records,
+)
+
+# Process-wide cache for the cached count strategy, dropped by todo writes
+todo_count_cache = TTLCache(ttl=settings.TODO_COUNT_CACHE_TTL)
+TODO_COUNT_CACHE_KEY = "todos"
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID4]]:
+    """
+    Decode a pagination cursor, rejecting malformed ones with a 400.
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ?fields= list into TodoOutput field names, in
+    declaration order, rejecting unknown ones with a 400.
+    """
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",")} - {""}
+    unknown = names - TodoOutput.model_fields.keys()
+    if not names or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields {fields!r}, expected a comma-separated list "
+            f"of {', '.join(TodoOutput.model_fields)}",
+        )
+    return tuple(name for name in TodoOutput.model_fields if name in names)
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a datetime to naive UTC, the form timestamps are stored in.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def todo_page(
+    todos: List[Row],
+    page_size: int,
+    page: Optional[int] = None,
+    total_count: Optional[int] = None,
+    keyset: bool = True,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> TodoList:
+    """
+    Build a page from rows read one past page_size, so the extra row tells
+    whether another page follows.
+
+    Pages of rows that are not in (created_at, id) order pass keyset=False,
+    as a cursor could not resume them.
+
+    The column rows are validated straight into TodoOutput, without going
+    through ORM instances or a per-row dict; with ``fields`` set, into a
+    TodoOutput of only those fields, in a sparse_todo_list page.
+    """
+    has_more = len(todos) > page_size
+    rows = todos[:page_size]
+    next_cursor = None
+    if has_more and keyset:
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    todo_output, todo_list = TodoOutput, TodoList
+    if fields is not None:
+        todo_output, todo_list = sparse_todo_output(fields), sparse_todo_list(fields)
+    todos = [todo_output.model_validate(row._mapping) for row in rows]
+    return todo_list(
+        todos=todos,
+        page=page,
+        page_size=len(todos),
+        total_count=total_count,
+        has_more=has_more,
+        next_cursor=next_cursor,
+    )
+
+
+# Content types of GET /todos/export and POST /todos/import
+TODO_FILE_MEDIA_TYPES = {
+    TodoFileFormat.NDJSON: "application/x-ndjson",
+    TodoFileFormat.CSV: "text/csv",
+}
+
+
+def export_header(export_format: TodoFileFormat) -> bytes:
+    """
+    The start of an export, the header row of CSV and nothing for NDJSON.
+    """
+    if export_format == TodoFileFormat.CSV:
+        return encode_csv([list(TodoOutput.model_fields)])
+    return b""
+
+
+def export_chunk(todos: List[Row], export_format: TodoFileFormat) -> bytes:
+    """
+    Encode a batch of todo rows as lines of an export, in the JSON form of
+    TodoOutput.
+    """
+    todos = [TodoOutput.model_validate(todo._mapping) for todo in todos]
+    if export_format == TodoFileFormat.CSV:
+        return encode_csv(todo.model_dump(mode="json").values() for todo in todos)
+    serializer = TodoOutput.__pydantic_serializer__
+    return b"".join(serializer.to_json(todo) + b"\n" for todo in todos)
+
+
+def encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+# A record of an upload: an NDJSON document, CSV fields keyed by the header
+# row, or why the record could not be read
+ImportRecord = Union[bytes, Dict[str, str], RecordError]
+
+
+async def import_records(
+    chunks: AsyncIterable[bytes],
+    import_format: TodoFileFormat,
+    max_length: int = settings.TODO_IMPORT_MAX_RECORD_BYTES,
+) -> AsyncIterator[Tuple[int, ImportRecord]]:
+    """
+    Read the records of an NDJSON or CSV upload as its chunks arrive,
+    numbered by the line each starts on.
+    """
+    lines = iter_lines(chunks, max_length)
+    if import_format == TodoFileFormat.NDJSON:
+        async for line_number, record in iter_ndjson_records(lines):
+            yield line_number, record
+        return
+
+    header = None
+    async for line_number, fields in iter_csv_records(lines, max_length):
+        if isinstance(fields, RecordError):
+            yield line_number, fields
+        elif header is None:
+            header = fields
+        elif len(fields) != len(header):
+            yield line_number, RecordError(
+                f"Expected {len(header)} fields, got {len(fields)}"
+            )
+        else:
+            yield line_number, dict(zip(header, fields))
+
+
+def validation_detail(error: ValidationError) -> str:
+    """
+    Summarize the errors of a record on one line, e.g. "title: Field required".
+    """
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors(include_url=False)
+    )
+
+
+def bulk_result(
+    _id: UUID4, todo: Optional[Dict[str, Any]], status_code: int
+) -> TodoBulkResult:
+    """
+    Build the result of one item of a bulk request, 404 when no todo matched.
+    """
+    if todo is None:
+        return TodoBulkResult(
+            id=_id,
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Todo with ID {_id} not found",
+        )
+    return TodoBulkResult(id=_id, status_code=status_code, todo=TodoOutput(**todo))
 
 
 class TodoService:
@@ -20,34 +234,431 @@ class TodoService:
         #         status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden"
         #     )
         created_todo = self.repository.create(data)
+        todo_count_cache.invalidate(TODO_COUNT_CACHE_KEY)
         return TodoOutput(**created_todo.as_dict())
 
     def get_all(
-        self, page: int = 1, page_size: int = 15
-    ) -> Tuple[int, List[TodoOutput]]:
-        total_count, todos = self.repository.get_all(page=page, page_size=page_size)
-        todos = [TodoOutput(**todo.as_dict()) for todo in todos]
-        return total_count, todos
+        self,
+        page: int = 1,
+        page_size: int = 15,
+        cursor: Optional[str] = None,
+        count_strategy: Optional[CountStrategy] = None,
+        fields: Optional[str] = None,
+    ) -> TodoList:
+        """
+        List todos with offset or keyset pagination. With ``fields`` set,
+        only those columns are read, plus the created_at and id the next
+        cursor is made of, and only those fields are returned.
+        """
+        fields = parse_fields(fields)
+        columns = None
+        if fields is not None:
+            columns = tuple(dict.fromkeys(fields + ("created_at", "id")))
+        # Read one row past the page to learn whether another page follows
+        todos = self.repository.get_all(
+            page=page,
+            page_size=page_size,
+            after=parse_cursor(cursor),
+            limit=page_size + 1,
+            columns=columns,
+        )
+        return todo_page(
+            todos,
+            page_size,
+            page=page if cursor is None else None,
+            total_count=self.count(count_strategy),
+            fields=fields,
+        )
+
+    def get_all_for_user(
+        self,
+        user_id: UUID4,
+        page_size: int = 15,
+        cursor: Optional[str] = None,
+        completed: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> TodoList:
+        """
+        List a user's own todos with keyset pagination, optionally filtered by
+        completion and by a [created_from, created_to) creation range.
+        """
+        todos = self.repository.get_all_by_user(
+            user_id,
+            completed=completed,
+            created_from=to_utc_naive(created_from),
+            created_to=to_utc_naive(created_to),
+            after=parse_cursor(cursor),
+            limit=page_size + 1,
+        )
+        return todo_page(todos, page_size)
 
-    def get_by_id(self, _id: UUID4) -> TodoOutput:
-        return TodoOutput(**self.repository.get_by_id(_id).as_dict())
+    def search(
+        self, user_id: UUID4, q: str, page: int = 1, page_size: int = 15
+    ) -> TodoList:
+        """
+        Search a user's todo titles for every word of ``q``, best matches
+        first, with offset pagination.
+        """
+        terms = search_terms(q)
+        todos = []
+        if terms:
+            todos = self.repository.search(
+                user_id,
+                terms,
+                offset=(page - 1) * page_size,
+                limit=page_size + 1,
+            )
+        return todo_page(todos, page_size, page=page, keyset=False)
+
+    def get_stats(self, user_id: UUID4) -> TodoStats:
+        """
+        Read a user's todo counters, zero for users who never had a todo.
+        """
+        stats = self.repository.get_stats(user_id)
+        if stats is None:
+            return TodoStats()
+        return TodoStats(total=stats.total, completed=stats.completed)
+
+    def count(self, strategy: Optional[CountStrategy] = None) -> Optional[int]:
+        strategy = CountStrategy(strategy or settings.TODO_COUNT_STRATEGY)
+        if strategy == CountStrategy.NONE:
+            return None
+        if strategy == CountStrategy.ESTIMATE:
+            estimate = self.repository.estimate_count()
+            if estimate is not None:
+                return estimate
+        if strategy == CountStrategy.CACHED:
+            total_count = todo_count_cache.get(TODO_COUNT_CACHE_KEY)
+            if total_count is None:
+                total_count = self.repository.count()
+                todo_count_cache.set(TODO_COUNT_CACHE_KEY, total_count)
+            return total_count
+        return self.repository.count()
 
-    def delete(self, _id: int) -> TodoOutput:
-        if not self.repository.exists_by_id(_id):
+    def export(
+        self,
+        export_format: TodoFileFormat,
+        batch_size: int = settings.TODO_EXPORT_BATCH_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Encode every todo as NDJSON or CSV, one chunk per batch read off the
+        cursor, so memory stays flat however many todos there are. Archived
+        todos are left out.
+        """
+        yield export_header(export_format)
+        for todos in self.repository.stream_all(batch_size):
+            yield export_chunk(todos, export_format)
+
+    def get_by_id(self, _id: UUID4, fields: Optional[str] = None) -> TodoOutput:
+        """
+        Read a todo, archived or not. With ``fields`` set, only those columns
+        are read and a sparse_todo_output is returned.
+        """
+        fields = parse_fields(fields)
+        if fields is not None:
+            return self.get_fields_by_id(_id, fields)
+        todo = self.repository.get_by_id(_id)
+        if todo is None:
+            # Completed todos may have been moved to the archive
+            todo = self.repository.get_archived_by_id(_id)
+        if todo is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Todo with ID {_id} not found",
             )
-        todo = self.repository.get_by_id(_id)
-        self.repository.delete(todo)
         return TodoOutput(**todo.as_dict())
 
+    def get_fields_by_id(self, _id: UUID4, fields: Tuple[str, ...]) -> BaseModel:
+        todo = self.repository.get_columns_by_id(_id, fields)
+        if todo is None:
+            todo = self.repository.get_columns_by_id(_id, fields, archived=True)
+        if todo is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Todo with ID {_id} not found",
+            )
+        return sparse_todo_output(fields).model_validate(todo._mapping)
+
+    def archive_completed(
+        self,
+        older_than_days: float = settings.TODO_ARCHIVE_AFTER_DAYS,
+        batch_size: int = settings.TODO_ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """
+        Move todos completed more than ``older_than_days`` ago to the archive,
+        one transaction per batch, so writers are never blocked for long.
+
+        A todo's updated_at is when it was last changed, which for a
+        completed todo is when it was completed or edited afterwards.
+
+        Returns:
+            int: The number of todos archived.
+        """
+        completed_before = utc_now() - timedelta(days=older_than_days)
+        archived = 0
+        while True:
+            moved = self.repository.archive_completed(completed_before, batch_size)
+            archived += moved
+            if moved < batch_size:
+                break
+        if archived:
+            todo_count_cache.invalidate(TODO_COUNT_CACHE_KEY)
+        return archived
+
+    def restore_archived(self, ids: List[UUID4]) -> bool:
+        """
+        Move the archived todos among ``ids`` back into todos, for a write
+        that missed them to be retried in the same transaction.
+
+        Returns:
+            bool: True if any todo was restored.
+        """
+        if not self.repository.restore_archived(ids):
+            return False
+        todo_count_cache.invalidate(TODO_COUNT_CACHE_KEY)
+        return True
+
+    def delete(self, _id: UUID4) -> TodoOutput:
+        # Writes go to the hot table first, archived todos only when missed
+        deleted_todo = self.repository.delete(_id)
+        if deleted_todo is None and self.restore_archived([_id]):
+            deleted_todo = self.repository.delete(_id)
+        if deleted_todo is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Todo with ID {_id} not found",
+            )
+        todo_count_cache.invalidate(TODO_COUNT_CACHE_KEY)
+        return TodoOutput(**deleted_todo._mapping)
+
     def update(self, _id: UUID4, data: TodoInput) -> TodoOutput:
-        if not self.repository.exists_by_id(_id):
+        updated_todo = self.repository.update(_id, data)
+        if updated_todo is None and self.restore_archived([_id]):
+            updated_todo = self.repository.update(_id, data)
+        if updated_todo is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Todo with ID {_id} not found",
             )
+        return TodoOutput(**updated_todo._mapping)
+
+    def create_many(self, items: List[TodoInput]) -> List[TodoBulkResult]:
+        created_todos = self.repository.create_many(items)
+        todo_count_cache.invalidate(TODO_COUNT_CACHE_KEY)
+        return [
+            bulk_result(todo.id, todo.as_dict(), status.HTTP_201_CREATED)
+            for todo in created_todos
+        ]
+
+    def import_batch(
+        self, user_id: UUID4, records: List[Tuple[int, ImportRecord]]
+    ) -> Tuple[int, List[TodoImportError]]:
+        """
+        Validate a batch of uploaded records and insert the valid ones for
+        the user in one transaction.
+
+        Returns:
+            tuple: The number of todos imported, and the errors of the
+            rejected records.
+        """
+        items, errors = [], []
+        for line, record in records:
+            try:
+                if isinstance(record, RecordError):
+                    errors.append(TodoImportError(line=line, detail=str(record)))
+                elif isinstance(record, bytes):
+                    items.append(TodoImportItem.model_validate_json(record))
+                else:
+                    items.append(TodoImportItem.model_validate(record))
+            except ValidationError as e:
+                errors.append(TodoImportError(line=line, detail=validation_detail(e)))
+        if items:
+            self.repository.import_many(user_id, items)
+            todo_count_cache.invalidate(TODO_COUNT_CACHE_KEY)
+        return len(items), errors
+
+    def update_many(self, items: List[TodoBulkUpdateItem]) -> List[TodoBulkResult]:
+        updated_todos = {
+            todo["id"]: todo for todo in self.repository.update_many(items)
+        }
+        missed = [item for item in items if item.id not in updated_todos]
+        if missed and self.restore_archived([item.id for item in missed]):
+            updated_todos.update(
+                (todo["id"], todo) for todo in self.repository.update_many(missed)
+            )
+        return [
+            bulk_result(item.id, updated_todos.get(item.id), status.HTTP_200_OK)
+            for item in items
+        ]
+
+    def delete_many(self, ids: List[UUID4]) -> List[TodoBulkResult]:
+        unique_ids = list(dict.fromkeys(ids))
+        deleted_todos = {
+            todo.id: dict(todo._mapping)
+            for todo in self.repository.delete_many(unique_ids)
+        }
+        missed = [_id for _id in unique_ids if _id not in deleted_todos]
+        if missed and self.restore_archived(missed):
+            deleted_todos.update(
+                (todo.id, dict(todo._mapping))
+                for todo in self.repository.delete_many(missed)
+            )
+        if deleted_todos:
+            todo_count_cache.invalidate(TODO_COUNT_CACHE_KEY)
+        # A todo is deleted once; repeated ids after the first find nothing
+        return [
+            bulk_result(_id, deleted_todos.pop(_id, None), status.HTTP_200_OK)
+            for _id in ids
+        ]
+
+
+class AsyncTodoService:
+    """
+    Async counterpart of TodoService.
+
+    Each operation runs TodoService on the AsyncSession's underlying Session
+    via run_sync, so a whole operation costs a single hop into the greenlet
+    and its queries go through the async driver.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, data: TodoInput) -> TodoOutput:
+        return await self.session.run_sync(lambda s: TodoService(s).create(data))
+
+    async def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 15,
+        cursor: Optional[str] = None,
+        count_strategy: Optional[CountStrategy] = None,
+        fields: Optional[str] = None,
+    ) -> TodoList:
+        return await self.session.run_sync(
+            lambda s: TodoService(s).get_all(
+                page=page,
+                page_size=page_size,
+                cursor=cursor,
+                count_strategy=count_strategy,
+                fields=fields,
+            )
+        )
+
+    async def get_all_for_user(
+        self,
+        user_id: UUID4,
+        page_size: int = 15,
+        cursor: Optional[str] = None,
+        completed: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> TodoList:
+        return await self.session.run_sync(
+            lambda s: TodoService(s).get_all_for_user(
+                user_id,
+                page_size=page_size,
+                cursor=cursor,
+                completed=completed,
+                created_from=created_from,
+                created_to=created_to,
+            )
+        )
+
+    async def search(
+        self, user_id: UUID4, q: str, page: int = 1, page_size: int = 15
+    ) -> TodoList:
+        return await self.session.run_sync(
+            lambda s: TodoService(s).search(user_id, q, page=page, page_size=page_size)
+        )
+
+    async def get_stats(self, user_id: UUID4) -> TodoStats:
+        return await self.session.run_sync(lambda s: TodoService(s).get_stats(user_id))
+
+    async def export(
+        self,
+        export_format: TodoFileFormat,
+        batch_size: int = settings.TODO_EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Async counterpart of TodoService.export, reading the batches with
+        AsyncTodoRepository.stream_all.
+        """
+        yield export_header(export_format)
+        repository = AsyncTodoRepository(self.session)
+        async for todos in repository.stream_all(batch_size):
+            yield export_chunk(todos, export_format)
+
+    async def get_by_id(self, _id: UUID4, fields: Optional[str] = None) -> TodoOutput:
+        return await self.session.run_sync(
+            lambda s: TodoService(s).get_by_id(_id, fields=fields)
+        )
+
+    async def archive_completed(
+        self,
+        older_than_days: float = settings.TODO_ARCHIVE_AFTER_DAYS,
+        batch_size: int = settings.TODO_ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        return await self.session.run_sync(
+            lambda s: TodoService(s).archive_completed(older_than_days, batch_size)
+        )
+
+    async def delete(self, _id: UUID4) -> TodoOutput:
+        return await self.session.run_sync(lambda s: TodoService(s).delete(_id))
+
+    async def update(self, _id: UUID4, data: TodoInput) -> TodoOutput:
+        return await self.session.run_sync(lambda s: TodoService(s).update(_id, data))
+
+    async def create_many(self, items: List[TodoInput]) -> List[TodoBulkResult]:
+        return await self.session.run_sync(lambda s: TodoService(s).create_many(items))
+
+    async def import_todos(
+        self,
+        user_id: UUID4,
+        chunks: AsyncIterable[bytes],
+        import_format: TodoFileFormat,
+        batch_size: int = settings.TODO_IMPORT_BATCH_SIZE,
+    ) -> TodoImportResult:
+        """
+        Import the todos of an NDJSON or CSV upload for a user while it is
+        being received.
+
+        Records are validated and inserted batch_size at a time, each batch
+        in its own transaction, so memory holds one batch however large the
+        upload is. Batches committed before a database error stay imported.
+        The first TODO_IMPORT_MAX_ERRORS rejected records are reported with
+        their line numbers.
+        """
+        result = TodoImportResult()
+        batch = []
+        async for record in import_records(chunks, import_format):
+            batch.append(record)
+            if len(batch) == batch_size:
+                await self._import_batch(user_id, batch, result)
+                batch = []
+        if batch:
+            await self._import_batch(user_id, batch, result)
+        return result
+
+    async def _import_batch(
+        self,
+        user_id: UUID4,
+        records: List[Tuple[int, ImportRecord]],
+        result: TodoImportResult,
+    ) -> None:
+        imported, errors = await self.session.run_sync(
+            lambda s: TodoService(s).import_batch(user_id, records)
+        )
+        result.imported += imported
+        result.failed += len(errors)
+        room = max(settings.TODO_IMPORT_MAX_ERRORS - len(result.errors), 0)
+        result.errors.extend(errors[:room])
+
+    async def update_many(
+        self, items: List[TodoBulkUpdateItem]
+    ) -> List[TodoBulkResult]:
+        return await self.session.run_sync(lambda s: TodoService(s).update_many(items))
 
-        current_todo = self.repository.get_by_id(_id)
-        return TodoOutput(**self.repository.update(current_todo, data).as_dict())
+    async def delete_many(self, ids: List[UUID4]) -> List[TodoBulkResult]:
+        return await self.session.run_sync(lambda s: TodoService(s).delete_many(ids))
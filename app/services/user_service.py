@@ -3,17 +3,73 @@ from datetime import timedelta, datetime
 
 from fastapi import HTTPException, status
 from pydantic import UUID4
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from utils.datetime_helper import DateTimeHelper
 from core.security import get_password_hash, pwd_context, create_access_token
 from settings import settings
-from repositories.user_repository import UserRepository
+from db.errors import unique_violation_column
+from db.models import User
+from repositories.user_repository import UserRepository, AsyncUserRepository
 from schemas.user import UserRegister, UserLogin, UserInDBBase
 from core.password_validator import validate_password
 from core.email_validator import validate_email
 
 
+def issue_access_token(email: str) -> Dict[str, Any]:
+    """
+    Issue an access token for an authenticated user.
+
+    Args:
+        email (str): Email of the authenticated user.
+
+    Returns:
+        dict: Token response.
+    """
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    datetime_helper = DateTimeHelper()
+    expired_at_datetime = datetime_helper.now() + access_token_expires
+    expired_at = datetime_helper.format(expired_at_datetime)
+
+    access_token = create_access_token(
+        data={"sub": email}, expires_delta=access_token_expires
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expired_at": expired_at,
+    }
+
+
+def registration_conflict(data: UserRegister, exc: IntegrityError) -> Exception:
+    """
+    Map a unique violation raised while registering a user to its 400 response.
+
+    Args:
+        data (UserRegister): User data that was being registered.
+        exc (IntegrityError): The error raised by the INSERT.
+
+    Returns:
+        Exception: The HTTPException to raise, or the original error if it was
+            not caused by a taken email or username.
+    """
+    column = unique_violation_column(exc, User.__table__)
+    if column == "email":
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Email {data.email} already registered",
+        )
+    if column == "username":
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Username {data.username} already registered",
+        )
+    return exc
+
+
 class UserService:
     """
     Service class for handling user-related operations.
@@ -32,28 +88,23 @@ class UserService:
         """
         Create a new user.
 
+        Goes straight to the INSERT and relies on the unique indexes on email
+        and username, so concurrent registrations cannot both succeed.
+
         Args:
             data (UserRegister): User data.
 
         Returns:
             UserInDBBase: Created user data.
         """
-        if self.repository.user_exists_by_email(data.email):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Email {data.email} already registered",
-            )
-        if self.repository.user_exists_by_username(data.username):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Username {data.username} already registered",
-            )
-
         validate_password(data.password)
         validate_email(data.email)
 
         hashed_password = get_password_hash(data.password)
-        user = self.repository.create(data, hashed_password)
+        try:
+            user = self.repository.create(data, hashed_password)
+        except IntegrityError as e:
+            raise registration_conflict(data, e)
         return UserInDBBase(**user.as_dict())
 
     def login(self, data: UserLogin) -> Dict[str, Any]:
@@ -73,19 +124,7 @@ class UserService:
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        datetime_helper = DateTimeHelper()
-        expired_at_datetime = datetime_helper.now() + access_token_expires
-        expired_at = datetime_helper.format(expired_at_datetime)
-
-        access_token = create_access_token(
-            data={"sub": user.email}, expires_delta=access_token_expires
-        )
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "expired_at": expired_at,
-        }
+        return issue_access_token(user.email)
 
     def is_superuser(self, _id: UUID4) -> bool:
         """
@@ -97,13 +136,12 @@ class UserService:
         Returns:
             bool: True if the user is a superuser, False otherwise.
         """
-        if not self.repository.user_exists_by_id(_id):
+        is_superuser = self.repository.get_superuser_flag(_id)
+        if is_superuser is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=f"User {_id} not found"
             )
-
-        user = self.repository.get_user_object_by_id(_id)
-        return user.is_superuser
+        return is_superuser
 
     def delete_user(self, _id: UUID4) -> bool:
         """
@@ -115,11 +153,95 @@ class UserService:
         Returns:
             bool: True if the user is successfully deleted, False otherwise.
         """
-        if not self.repository.user_exists_by_id(_id):
+        if not self.repository.delete_user(_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=f"User {_id} not found"
             )
-
-        user = self.repository.get_user_object_by_id(_id)
-        self.repository.delete_user(user)
         return True
+
+
+class AsyncUserService:
+    """
+    Async service class for handling user-related operations.
+
+    Queries go through AsyncUserRepository, and bcrypt hashing/verification
+    is pushed to the threadpool so it never stalls the event loop.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the service.
+
+        Args:
+            session (AsyncSession): Async database session.
+        """
+        self.session = session
+        self.repository = AsyncUserRepository(session)
+
+    async def create(self, data: UserRegister) -> UserInDBBase:
+        """
+        Create a new user.
+
+        Goes straight to the INSERT and relies on the unique indexes on email
+        and username, so concurrent registrations cannot both succeed.
+
+        Args:
+            data (UserRegister): User data.
+
+        Returns:
+            UserInDBBase: Created user data.
+        """
+        validate_password(data.password)
+        validate_email(data.email)
+
+        hashed_password = await run_in_threadpool(get_password_hash, data.password)
+        try:
+            user = await self.repository.create(data, hashed_password)
+        except IntegrityError as e:
+            raise registration_conflict(data, e)
+        return UserInDBBase(**user.as_dict())
+
+    async def login(self, data: UserLogin) -> Dict[str, Any]:
+        """
+        User login.
+
+        Args:
+            data (UserLogin): Login data with email and password.
+
+        Returns:
+            dict: Token response.
+        """
+        user = await self.repository.get_user_by_email(data.email)
+        if not user or not await run_in_threadpool(
+            pwd_context.verify, data.password, user.hashed_password
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return issue_access_token(user.email)
+
+    async def is_superuser(self, _id: UUID4) -> bool:
+        """
+        Check if the user is a superuser.
+
+        Args:
+            _id (UUID4): User ID.
+
+        Returns:
+            bool: True if the user is a superuser, False otherwise.
+        """
+        return await self.session.run_sync(lambda s: UserService(s).is_superuser(_id))
+
+    async def delete_user(self, _id: UUID4) -> bool:
+        """
+        Delete a user.
+
+        Args:
+            _id (UUID4): User ID.
+
+        Returns:
+            bool: True if the user is successfully deleted, False otherwise.
+        """
+        return await self.session.run_sync(lambda s: UserService(s).delete_user(_id))
@@ -29,6 +29,90 @@ class Settings(BaseSettings):
     SQLITE_CONNECTION_STRING: Optional[str] = os.getenv(
         "SQLITE_CONNECTION_STRING", "sqlite:///sqlite.db"
     )
+    # SQLite tuning profile applied to every new connection
+    SQLITE_PRAGMAS_ENABLED: Optional[bool] = (
+        os.getenv("SQLITE_PRAGMAS_ENABLED", "True") == "True"
+    )
+    SQLITE_JOURNAL_MODE: Optional[str] = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: Optional[str] = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    # Page cache per connection, negative values are in KiB
+    SQLITE_CACHE_SIZE: Optional[int] = int(os.getenv("SQLITE_CACHE_SIZE", -64000))
+    # Bytes of the database file memory-mapped per connection, 0 disables mmap
+    SQLITE_MMAP_SIZE: Optional[int] = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+    # Milliseconds a connection waits on a locked database before failing
+    SQLITE_BUSY_TIMEOUT: Optional[int] = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+    SQLITE_TEMP_STORE: Optional[str] = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+    # Seconds between WAL checkpoint / PRAGMA optimize runs, 0 disables them
+    SQLITE_MAINTENANCE_INTERVAL: Optional[float] = float(
+        os.getenv("SQLITE_MAINTENANCE_INTERVAL", 300)
+    )
+    # Apply pending schema migrations at startup; turn off when migrations
+    # are run with `python -m db.migrations upgrade` before the workers start
+    DB_AUTO_MIGRATE: Optional[bool] = os.getenv("DB_AUTO_MIGRATE", "True") == "True"
+    # Database connection pool
+    DB_POOL_SIZE: Optional[int] = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: Optional[int] = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: Optional[float] = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    # Recycle connections older than this many seconds, -1 disables recycling
+    DB_POOL_RECYCLE: Optional[int] = int(os.getenv("DB_POOL_RECYCLE", -1))
+    DB_POOL_PRE_PING: Optional[bool] = os.getenv("DB_POOL_PRE_PING", "False") == "True"
+    DB_POOL_USE_LIFO: Optional[bool] = os.getenv("DB_POOL_USE_LIFO", "False") == "True"
+    # Comma-separated read replica URLs, read-only handlers are spread over them
+    DB_REPLICA_URLS: Optional[str] = os.getenv("DB_REPLICA_URLS", "")
+    # Seconds an unreachable replica is skipped before it is tried again
+    DB_REPLICA_RETRY_AFTER: Optional[float] = float(
+        os.getenv("DB_REPLICA_RETRY_AFTER", 30)
+    )
+    # Seconds after a user's own write during which their reads use the primary
+    DB_READ_YOUR_WRITES_WINDOW: Optional[float] = float(
+        os.getenv("DB_READ_YOUR_WRITES_WINDOW", 5)
+    )
+    # How GET /todos fills total_count: exact, cached, estimate or none
+    TODO_COUNT_STRATEGY: Optional[str] = os.getenv("TODO_COUNT_STRATEGY", "exact")
+    # Seconds a cached todo count stays valid
+    TODO_COUNT_CACHE_TTL: Optional[float] = float(os.getenv("TODO_COUNT_CACHE_TTL", 30))
+    # Most items accepted by one /todos/bulk request
+    TODO_BULK_MAX_ITEMS: Optional[int] = int(os.getenv("TODO_BULK_MAX_ITEMS", 1000))
+    # Completed todos untouched for this many days are moved to todos_archive
+    TODO_ARCHIVE_AFTER_DAYS: Optional[float] = float(
+        os.getenv("TODO_ARCHIVE_AFTER_DAYS", 30)
+    )
+    # Seconds between archiver runs, 0 (the default) disables the archiver
+    TODO_ARCHIVE_INTERVAL: Optional[float] = float(
+        os.getenv("TODO_ARCHIVE_INTERVAL", 0)
+    )
+    # Todos moved per archiver transaction
+    TODO_ARCHIVE_BATCH_SIZE: Optional[int] = int(
+        os.getenv("TODO_ARCHIVE_BATCH_SIZE", 1000)
+    )
+    # Todos read from the cursor and sent per chunk by GET /todos/export
+    TODO_EXPORT_BATCH_SIZE: Optional[int] = int(
+        os.getenv("TODO_EXPORT_BATCH_SIZE", 1000)
+    )
+    # Records validated and inserted per transaction by POST /todos/import
+    TODO_IMPORT_BATCH_SIZE: Optional[int] = int(
+        os.getenv("TODO_IMPORT_BATCH_SIZE", 1000)
+    )
+    # Longest record POST /todos/import accepts, in bytes
+    TODO_IMPORT_MAX_RECORD_BYTES: Optional[int] = int(
+        os.getenv("TODO_IMPORT_MAX_RECORD_BYTES", 65536)
+    )
+    # Rejected records listed in the POST /todos/import summary
+    TODO_IMPORT_MAX_ERRORS: Optional[int] = int(
+        os.getenv("TODO_IMPORT_MAX_ERRORS", 100)
+    )
+    # JSON encoder of API responses: stdlib, orjson (needs orjson installed)
+    # or pydantic
+    JSON_RESPONSE_ENCODER: Optional[str] = os.getenv(
+        "JSON_RESPONSE_ENCODER", "pydantic"
+    )
+    # gzip/deflate level (1-9, brotli quality too) of responses, 0 disables
+    # compression
+    COMPRESSION_LEVEL: Optional[int] = int(os.getenv("COMPRESSION_LEVEL", 6))
+    # Smallest response body compressed, in bytes
+    COMPRESSION_MINIMUM_SIZE: Optional[int] = int(
+        os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)
+    )
     # JWT
     SECRET_KEY: Optional[str] = os.getenv("SECRET_KEY")
     ALGORITHM: Optional[str] = os.getenv("ALGORITHM", "HS256")
@@ -0,0 +1,60 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    A small thread-safe in-process cache whose entries expire after a fixed
+    time-to-live.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Initialize the cache.
+
+        :param ttl: Seconds an entry stays valid after it is set.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+
+        :param key: The cache key.
+        :param default: Returned when the key is missing or expired.
+        :return: The cached value or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value for the configured time-to-live.
+
+        :param key: The cache key.
+        :param value: The value to cache.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop a cached value, or every value when no key is given.
+
+        :param key: The cache key to drop.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
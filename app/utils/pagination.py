@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, _id: UUID) -> str:
+    """
+    Encode a keyset position into an opaque cursor.
+
+    :param created_at: The created_at of the last row on the page.
+    :param _id: The id of the last row on the page.
+    :return: URL-safe cursor string.
+    """
+    payload = json.dumps([created_at.isoformat(), str(_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode an opaque cursor back into a keyset position.
+
+    :param cursor: Cursor string produced by encode_cursor.
+    :return: The (created_at, id) position the cursor points after.
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        created_at, _id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(_id)
+    except (binascii.Error, TypeError, ValueError):
+        raise ValueError(f"Invalid cursor {cursor!r}")
@@ -0,0 +1,120 @@
+import csv
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple, Union
+
+
+class RecordError(ValueError):
+    """A record of an upload that cannot be read."""
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_length: int
+) -> AsyncIterator[Optional[bytes]]:
+    """
+    Split a byte stream into lines, without their line endings.
+
+    At most one line and one chunk are held in memory. A line longer than
+    ``max_length`` is dropped as it arrives and None is yielded in its place,
+    so callers can still count it.
+
+    :param chunks: The byte stream, e.g. a request body.
+    :param max_length: Longest line kept, in bytes.
+    :return: Async iterator of the lines.
+    """
+    buffer = bytearray()
+    too_long = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if not too_long:
+                buffer += chunk[start:end]
+            if too_long or len(buffer) > max_length:
+                yield None
+            else:
+                yield bytes(buffer[:-1] if buffer.endswith(b"\r") else buffer)
+            buffer.clear()
+            too_long = False
+            start = end + 1
+        if not too_long:
+            buffer += chunk[start:]
+            if len(buffer) > max_length:
+                buffer.clear()
+                too_long = True
+    if too_long:
+        yield None
+    elif buffer:
+        yield bytes(buffer[:-1] if buffer.endswith(b"\r") else buffer)
+
+
+async def iter_ndjson_records(
+    lines: AsyncIterable[Optional[bytes]],
+) -> AsyncIterator[Tuple[int, Union[bytes, RecordError]]]:
+    """
+    Number the records of NDJSON lines, skipping blank lines.
+
+    :param lines: Lines from iter_lines.
+    :return: Async iterator of (line number, JSON document or RecordError).
+    """
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if line is None:
+            yield line_number, RecordError("Record is too long")
+        elif line.strip():
+            yield line_number, line
+
+
+async def iter_csv_records(
+    lines: AsyncIterable[Optional[bytes]], max_length: int
+) -> AsyncIterator[Tuple[int, Union[List[str], RecordError]]]:
+    """
+    Parse CSV lines into records, numbered by the line each starts on.
+
+    A quoted field may span lines, which are joined until its quotes balance.
+    Records that are too long, not UTF-8 or malformed are yielded as a
+    RecordError, and reading goes on with the next line. Blank lines are
+    skipped.
+
+    :param lines: Lines from iter_lines.
+    :param max_length: Longest record kept, in bytes.
+    :return: Async iterator of (line number, fields or RecordError).
+    """
+    line_number = start = 0
+    pending: List[str] = []
+    length = quotes = 0
+    async for line in lines:
+        line_number += 1
+        if not pending:
+            start = line_number
+        error = None
+        if line is None or length + len(line) > max_length:
+            error = RecordError("Record is too long")
+        else:
+            try:
+                # Spreadsheets often start CSV files with a byte order mark
+                text = line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+            except UnicodeDecodeError as e:
+                error = RecordError(f"Record is not UTF-8: {e.reason}")
+        if error is not None:
+            yield start, error
+            pending.clear()
+            length = quotes = 0
+            continue
+
+        pending.append(text)
+        length += len(line) + 1
+        quotes += text.count('"')
+        if quotes % 2:
+            # Inside a quoted field that goes on on the next line
+            continue
+
+        record = "\n".join(pending)
+        pending.clear()
+        length = quotes = 0
+        if not record.strip():
+            continue
+        try:
+            yield start, next(csv.reader([record], strict=True))
+        except csv.Error as e:
+            yield start, RecordError(f"Malformed CSV record: {e}")
+    if pending:
+        yield start, RecordError("Quoted field is not closed")
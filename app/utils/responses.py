@@ -0,0 +1,179 @@
+import asyncio
+import dataclasses
+import functools
+from typing import Any, Callable, Coroutine, Dict, Type
+
+import pydantic_core
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, get_request_handler
+from pydantic import BaseModel
+
+from settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response that also renders pydantic models, which ModelRoute hands
+    over without serializing them first. Encodes with the stdlib json module.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump(mode="json")
+        return super().render(content)
+
+
+class ORJSONResponse(ModelJSONResponse):
+    """
+    JSON response encoded by orjson, which writes UUIDs and datetimes
+    natively. Needs the optional orjson package.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump()
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class PydanticJSONResponse(ModelJSONResponse):
+    """
+    JSON response encoded by pydantic-core, models with their own compiled
+    serializer.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return pydantic_core.to_json(content)
+
+
+# Values of JSON_RESPONSE_ENCODER
+JSON_RESPONSE_CLASSES: Dict[str, Type[ModelJSONResponse]] = {
+    "stdlib": ModelJSONResponse,
+    "orjson": ORJSONResponse,
+    "pydantic": PydanticJSONResponse,
+}
+
+
+def get_json_response_class(encoder: str) -> Type[ModelJSONResponse]:
+    """
+    Look up the response class of a JSON encoder.
+
+    Args:
+        encoder (str): stdlib, orjson or pydantic.
+
+    Returns:
+        Type[ModelJSONResponse]: The response class.
+
+    Raises:
+        ValueError: For an unknown encoder, or orjson when it is not installed.
+    """
+    if encoder not in JSON_RESPONSE_CLASSES:
+        raise ValueError(
+            f"Unknown JSON response encoder {encoder!r}, "
+            f"expected one of {', '.join(JSON_RESPONSE_CLASSES)}"
+        )
+    if encoder == "orjson" and orjson is None:
+        raise ValueError("The orjson JSON response encoder needs orjson installed")
+    return JSON_RESPONSE_CLASSES[encoder]
+
+
+# Response class of the app and its exception handler
+DefaultJSONResponse = get_json_response_class(settings.JSON_RESPONSE_ENCODER)
+
+
+class ModelRoute(APIRoute):
+    """
+    Route that hands an endpoint's result straight to the response class
+    when it already is an instance of the route's response_model.
+
+    The model was validated when the service built it. FastAPI would check
+    it against response_model once more, serialize it to a dict of JSON
+    values and encode that dict again; here the response class renders the
+    model itself, a ModelJSONResponse as configured or PydanticJSONResponse
+    in place of FastAPI's plain JSONResponse. Anything else, e.g. ORM objects
+    or subclasses whose extra fields response_model filters out, takes
+    FastAPI's usual path.
+
+    FastAPI sends a Response an endpoint returns as it is, so the headers and
+    status code that dependencies or the endpoint set on their Response
+    parameter are copied onto the rendered one here, as FastAPI does when it
+    renders the result itself.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        model = self.response_model
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if response_class is JSONResponse:
+            response_class = PydanticJSONResponse
+        if not (
+            isinstance(model, type)
+            and issubclass(response_class, ModelJSONResponse)
+            and issubclass(model, BaseModel)
+            and self.response_model_include is None
+            and self.response_model_exclude is None
+            and not self.response_model_exclude_unset
+            and not self.response_model_exclude_defaults
+            and not self.response_model_exclude_none
+        ):
+            return super().get_route_handler()
+
+        endpoint = self.dependant.call
+        is_coroutine = asyncio.iscoroutinefunction(endpoint)
+        # The Response dependencies share, under the endpoint's own name for
+        # it if it takes one
+        own_response_param = self.dependant.response_param_name
+        response_param = own_response_param or "model_route_response"
+
+        @functools.wraps(endpoint)
+        async def send_model(**values: Any) -> Any:
+            if own_response_param:
+                sub_response = values[response_param]
+            else:
+                sub_response = values.pop(response_param)
+            if is_coroutine:
+                result = await endpoint(**values)
+            else:
+                result = await run_in_threadpool(endpoint, **values)
+            if type(result) is not model:
+                return result
+
+            status_code = sub_response.status_code or self.status_code
+            if status_code is None:
+                response = response_class(result)
+            else:
+                response = response_class(result, status_code=status_code)
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        # The handler calls the wrapper; the route's own dependant, which the
+        # OpenAPI schema is built from, is left as it is. The arguments are
+        # those APIRoute.get_route_handler passes in FastAPI 0.115, the
+        # version pinned in requirements.txt.
+        return get_request_handler(
+            dependant=dataclasses.replace(
+                self.dependant, call=send_model, response_param_name=response_param
+            ),
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=self.secure_cloned_response_field,
+            response_model_include=self.response_model_include,
+            response_model_exclude=self.response_model_exclude,
+            response_model_by_alias=self.response_model_by_alias,
+            response_model_exclude_unset=self.response_model_exclude_unset,
+            response_model_exclude_defaults=self.response_model_exclude_defaults,
+            response_model_exclude_none=self.response_model_exclude_none,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+            embed_body_fields=self._embed_body_fields,
+        )
@@ -0,0 +1,119 @@
+"""
+Latency and CPU time of GET /todos with each JSON_RESPONSE_ENCODER: the
+stdlib json module, orjson and pydantic-core.
+
+Every encoder serves the same prebuilt page of todos through ModelRoute, so
+the numbers isolate the response encoding from the database. Requests go
+through the ASGI app in-process with TestClient; the time to render the page
+alone is reported next to them.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/json_encoders.py [--requests N]
+"""
+
+import argparse
+import time
+import uuid
+from typing import Dict, List, Optional, Type
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from db.models import utc_now, uuid7
+from schemas.todo import TodoList, TodoOutput
+from utils.responses import JSON_RESPONSE_CLASSES, ModelJSONResponse, ModelRoute
+
+PAGE_SIZES = (15, 100, 1000)
+
+
+def build_page(page_size: int) -> TodoList:
+    user_id = uuid.uuid4()
+    now = utc_now()
+    return TodoList(
+        page_size=page_size,
+        todos=[
+            TodoOutput(
+                id=uuid7(),
+                user_id=user_id,
+                title=f"Todo {i}",
+                completed=bool(i % 2),
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(page_size)
+        ],
+    )
+
+
+def build_app(
+    pages: Dict[int, TodoList], response_class: Type[ModelJSONResponse]
+) -> FastAPI:
+    router = APIRouter(route_class=ModelRoute)
+
+    @router.get("/todos", response_model=TodoList)
+    async def get_todos(page_size: int):
+        return pages[page_size]
+
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(router)
+    return app
+
+
+def run(client: TestClient, page_size: int, requests: int) -> Dict:
+    url = f"/todos?page_size={page_size}"
+    client.get(url)
+    started_at, cpu_started_at = time.perf_counter(), time.process_time()
+    for _ in range(requests):
+        client.get(url)
+    elapsed = time.perf_counter() - started_at
+    cpu = time.process_time() - cpu_started_at
+    return {
+        "latency_ms": elapsed / requests * 1000,
+        "cpu_ms": cpu / requests * 1000,
+    }
+
+
+def render(
+    response_class: Type[ModelJSONResponse], page: TodoList, requests: int
+) -> float:
+    """
+    Milliseconds to render the page once.
+    """
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        response_class(page)
+    return (time.perf_counter() - started_at) / requests * 1000
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    pages = {page_size: build_page(page_size) for page_size in PAGE_SIZES}
+    clients = {
+        encoder: TestClient(build_app(pages, response_class))
+        for encoder, response_class in JSON_RESPONSE_CLASSES.items()
+    }
+    expected = pages[PAGE_SIZES[0]].model_dump(mode="json")
+    for client in clients.values():
+        assert client.get(f"/todos?page_size={PAGE_SIZES[0]}").json() == expected
+
+    print(f"{args.requests} requests per run")
+    for page_size in PAGE_SIZES:
+        print(f"  page_size={page_size}:")
+        for encoder, client in clients.items():
+            result = run(client, page_size, args.requests)
+            render_ms = render(
+                JSON_RESPONSE_CLASSES[encoder], pages[page_size], args.requests
+            )
+            print(
+                f"    {encoder}: {result['latency_ms']:.3f} ms/request, "
+                f"{result['cpu_ms']:.3f} ms CPU/request, "
+                f"{render_ms:.3f} ms render"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Size and compression time of GET /todos pages and the OpenAPI document with
+each content coding and COMPRESSION_LEVEL, and the cost of serving the
+OpenAPI document from the precompressed cache.
+
+Pages are rendered as GET /todos renders them and the OpenAPI document is
+built from the todo routes.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/response_compression.py [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+
+from middlewares.compression import COMPRESSORS, CompressionMiddleware
+from routers.v1.todos import router
+from utils.openapi import custom_openapi
+from utils.responses import DefaultJSONResponse
+
+from json_encoders import build_page
+
+PAGE_SIZES = (15, 100, 1000)
+LEVELS = (1, 6, 9)
+
+
+def compress(body: bytes, encoding: str, level: int, repeat: int) -> Dict:
+    compressed = COMPRESSORS[encoding](body, level)
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        COMPRESSORS[encoding](body, level)
+    elapsed = time.perf_counter() - started_at
+    return {"ms": elapsed / repeat * 1000, "bytes": len(compressed)}
+
+
+def cached(body: bytes, repeat: int) -> float:
+    """
+    Milliseconds to serve the body from the precompressed cache once.
+    """
+    middleware = CompressionMiddleware(None, cached_paths=["/openapi.json"])
+    middleware.compress("/openapi.json", body, "gzip")
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        middleware.compress("/openapi.json", body, "gzip")
+    return (time.perf_counter() - started_at) / repeat * 1000
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    bodies = {
+        f"page_size={page_size}": DefaultJSONResponse(build_page(page_size)).body
+        for page_size in PAGE_SIZES
+    }
+    app = FastAPI()
+    app.include_router(router)
+    bodies["/openapi.json"] = DefaultJSONResponse(custom_openapi(app)).body
+
+    print(f"{args.repeat} compressions per run")
+    for name, body in bodies.items():
+        print(f"  {name}: {len(body)} bytes uncompressed")
+        for encoding in COMPRESSORS:
+            for level in LEVELS:
+                result = compress(body, encoding, level, args.repeat)
+                print(
+                    f"    {encoding} level {level}: {result['bytes']} bytes "
+                    f"({result['bytes'] / len(body):.0%}), {result['ms']:.3f} ms"
+                )
+    print(
+        f"  /openapi.json from the cache: "
+        f"{cached(bodies['/openapi.json'], args.repeat):.4f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
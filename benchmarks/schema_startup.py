@@ -0,0 +1,107 @@
+"""
+Cold-start cost of the startup schema check: the schema version check that
+lifespan runs (db.utils.check_schema) versus Base.metadata.create_all, which
+startup used to run.
+
+Each startup runs in a fresh interpreter, so it pays for the imports and the
+first connection as the app does. It is timed against a database that is
+already up to date, the usual case, and against an empty one, which the
+check migrates and create_all creates.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/schema_startup.py [--repeat N] [--url URL]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+
+from db.migrations import schema_version, upgrade
+from db.models import Base
+from db.search import todos_fts
+
+# Run in a fresh interpreter with the database URL as argv[1]; print the
+# seconds the imports took and the seconds the schema step took after them
+STARTUPS: Dict[str, str] = {
+    "check_schema": """
+import sys, time
+started_at = time.perf_counter()
+from sqlalchemy import create_engine
+from db.migrations import current_version, head_version, upgrade
+imported_at = time.perf_counter()
+engine = create_engine(sys.argv[1])
+if current_version(engine) < head_version():
+    upgrade(engine)
+print(imported_at - started_at, time.perf_counter() - imported_at)
+""",
+    "create_all": """
+import sys, time
+started_at = time.perf_counter()
+from sqlalchemy import create_engine
+from db.models import Base
+imported_at = time.perf_counter()
+engine = create_engine(sys.argv[1])
+Base.metadata.create_all(engine)
+print(imported_at - started_at, time.perf_counter() - imported_at)
+""",
+}
+
+
+def startup_seconds(startup: str, url: str) -> Tuple[float, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUPS[startup], url],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    ).stdout
+    imports, schema = output.split()
+    return float(imports), float(schema)
+
+
+def reset(url: str, up_to_date: bool) -> None:
+    engine = create_engine(url)
+    # As db.utils.drop_tables does for the app's engine
+    Base.metadata.drop_all(engine)
+    todos_fts.drop(engine, checkfirst=True)
+    schema_version.drop(engine, checkfirst=True)
+    if up_to_date:
+        upgrade(engine)
+    engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--url", help="Database URL to benchmark (default: a temporary SQLite file)"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        print(f"{url}: median of {args.repeat} startups")
+        for up_to_date in (True, False):
+            print("  up-to-date database:" if up_to_date else "  empty database:")
+            for startup in STARTUPS:
+                runs = []
+                for _ in range(args.repeat):
+                    reset(url, up_to_date)
+                    runs.append(startup_seconds(startup, url))
+                imports, schema = (statistics.median(run) * 1000 for run in zip(*runs))
+                print(
+                    f"    {startup}: {imports + schema:.1f} ms "
+                    f"({imports:.1f} ms imports, {schema:.1f} ms schema)"
+                )
+        reset(url, up_to_date=False)
+
+
+if __name__ == "__main__":
+    main()
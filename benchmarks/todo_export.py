@@ -0,0 +1,119 @@
+"""
+Memory and time to first byte of exporting every todo as NDJSON, streamed
+off a cursor by AsyncTodoService.export, versus reading all of them as one
+list first.
+
+Both read a SQLite database seeded with todos through the async driver, as
+GET /todos/export does. Peak memory is measured with tracemalloc, so it
+covers Python allocations only, and slows both paths down alike.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/todo_export.py [--rows N ...]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from db.migrations import upgrade
+from db.models import Todo, utc_now, uuid7
+from repositories.todo_repository import AsyncTodoRepository
+from schemas.todo import TodoFileFormat
+from services.todo_service import AsyncTodoService, export_chunk
+
+
+async def streamed(session: AsyncSession) -> AsyncIterator[bytes]:
+    async for chunk in AsyncTodoService(session).export(TodoFileFormat.NDJSON):
+        if chunk:
+            yield chunk
+
+
+async def materialized(session: AsyncSession) -> AsyncIterator[bytes]:
+    # Every row read into a list before the first line is encoded
+    rows = await AsyncTodoRepository(session).get_all(page_size=2**62)
+    yield export_chunk(rows, TodoFileFormat.NDJSON)
+
+
+PATHS = {
+    "stream": streamed,
+    "list": materialized,
+}
+
+
+def seed(url: str, rows: int) -> None:
+    engine = create_engine(url)
+    upgrade(engine)
+    user_id, now = uuid.uuid4(), utc_now()
+    with engine.begin() as connection:
+        for start in range(0, rows, 10_000):
+            connection.execute(
+                insert(Todo),
+                [
+                    {
+                        "id": uuid7(),
+                        "user_id": user_id,
+                        "title": f"Todo {i}",
+                        "completed": bool(i % 2),
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(start, min(start + 10_000, rows))
+                ],
+            )
+    engine.dispose()
+
+
+async def run(url: str, path: str) -> Dict:
+    engine = create_async_engine(url)
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    first_byte = None
+    size = 0
+    async with AsyncSession(engine) as session:
+        async for chunk in PATHS[path](session):
+            if first_byte is None:
+                first_byte = time.perf_counter() - started_at
+            size += len(chunk)
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await engine.dispose()
+    return {
+        "first_byte_ms": first_byte * 1000,
+        "total_ms": elapsed * 1000,
+        "peak_mb": peak / 2**20,
+        "size_mb": size / 2**20,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.db")
+            seed(f"sqlite:///{path}", rows)
+            print(f"SQLite: {rows} todos")
+            for name in PATHS:
+                result = asyncio.run(run(f"sqlite+aiosqlite:///{path}", name))
+                print(
+                    f"  {name}: first byte {result['first_byte_ms']:.1f} ms, "
+                    f"total {result['total_ms']:.0f} ms, "
+                    f"peak {result['peak_mb']:.1f} MiB "
+                    f"for {result['size_mb']:.1f} MiB of NDJSON"
+                )
+
+
+if __name__ == "__main__":
+    main()
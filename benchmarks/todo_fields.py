@@ -0,0 +1,83 @@
+"""
+Time and response size of a page of todos with every field versus a sparse
+fieldset (?fields=id,title,completed), whose SELECT only reads those columns
+plus the cursor's created_at.
+
+Each page is read from a SQLite database seeded with todos in a fresh
+session, validated and rendered to JSON bytes, as GET /todos does.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/todo_fields.py [--pages N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from db.migrations import upgrade
+from db.models import Todo
+from services.todo_service import TodoService
+from utils.responses import PydanticJSONResponse
+
+PAGE_SIZES = (15, 100, 500)
+
+FIELDSETS = {
+    "all": None,
+    "id,title,completed": "id,title,completed",
+}
+
+
+def seed(engine: Engine, rows: int) -> None:
+    upgrade(engine)
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add_all(Todo(user_id=user_id, title=f"Todo {i}") for i in range(rows))
+        session.commit()
+
+
+def run(engine: Engine, fields: Optional[str], page_size: int, pages: int) -> Dict:
+    def read_page() -> bytes:
+        with Session(engine) as session:
+            page = TodoService(session).get_all(
+                page_size=page_size, count_strategy="none", fields=fields
+            )
+        return PydanticJSONResponse(page).body
+
+    body = read_page()
+    started_at = time.perf_counter()
+    for _ in range(pages):
+        read_page()
+    elapsed = time.perf_counter() - started_at
+    return {"ms": elapsed / pages * 1000, "bytes": len(body)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        seed(engine, max(PAGE_SIZES) + 1)
+        print(f"SQLite: {args.pages} pages per run")
+        for page_size in PAGE_SIZES:
+            print(f"  page_size={page_size}:")
+            for name, fields in FIELDSETS.items():
+                result = run(engine, fields, page_size, args.pages)
+                print(
+                    f"    {name}: {result['ms']:.3f} ms/page, "
+                    f"{result['bytes']} bytes"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
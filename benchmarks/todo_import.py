@@ -0,0 +1,130 @@
+"""
+Throughput and peak memory of importing todos from an NDJSON upload with
+AsyncTodoService.import_todos, versus creating them one at a time as a
+POST /todos per row does.
+
+Both write to a SQLite database through the async driver. The upload is
+generated in 64 KiB chunks as it is read, like a request body, so peak
+memory (tracemalloc, Python allocations only) shows what the import itself
+holds.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/todo_import.py [--rows N ...]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from db.migrations import upgrade
+from db.models import User
+from schemas.todo import TodoFileFormat, TodoInput
+from services.todo_service import AsyncTodoService
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def upload(rows: int) -> AsyncIterator[bytes]:
+    chunk = bytearray()
+    for i in range(rows):
+        chunk += b'{"title": "Todo %d", "completed": %s}\n' % (
+            i,
+            b"true" if i % 2 else b"false",
+        )
+        if len(chunk) >= CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    yield bytes(chunk)
+
+
+async def streamed(session: AsyncSession, user_id: uuid.UUID, rows: int) -> int:
+    result = await AsyncTodoService(session).import_todos(
+        user_id, upload(rows), TodoFileFormat.NDJSON
+    )
+    return result.imported
+
+
+async def one_by_one(session: AsyncSession, user_id: uuid.UUID, rows: int) -> int:
+    service = AsyncTodoService(session)
+    for i in range(rows):
+        await service.create(
+            TodoInput(title=f"Todo {i}", completed=bool(i % 2), user_id=user_id)
+        )
+    return rows
+
+
+PATHS = {
+    "import": streamed,
+    "one by one": one_by_one,
+}
+
+
+def seed(url: str) -> uuid.UUID:
+    engine = create_engine(url)
+    upgrade(engine)
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add(User(id=user_id, email="bench@example.com", username="bench"))
+        session.commit()
+    engine.dispose()
+    return user_id
+
+
+async def run(url: str, user_id: uuid.UUID, path: str, rows: int) -> Dict:
+    engine = create_async_engine(url)
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        imported = await PATHS[path](session, user_id, rows)
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await engine.dispose()
+    assert imported == rows
+    return {"rows_per_s": rows / elapsed, "peak_mb": peak / 2**20}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--one-by-one-rows",
+        type=int,
+        default=2_000,
+        help="Rows created one at a time, which is too slow for the full counts",
+    )
+    args = parser.parse_args(argv)
+
+    for rows in args.rows:
+        print(f"SQLite: {rows} todos")
+        for name in PATHS:
+            count = rows if name == "import" else min(rows, args.one_by_one_rows)
+            with tempfile.TemporaryDirectory() as directory:
+                url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+                user_id = seed(url)
+                result = asyncio.run(
+                    run(
+                        url.replace("sqlite", "sqlite+aiosqlite", 1),
+                        user_id,
+                        name,
+                        count,
+                    )
+                )
+            print(
+                f"  {name} ({count} rows): {result['rows_per_s']:.0f} rows/s, "
+                f"peak {result['peak_mb']:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-row cost of turning a page of todos into TodoOutput models: ORM Todo
+instances converted through as_dict, versus the column rows the repository
+list reads now return, validated straight from their mapping.
+
+Both paths read the same page of a SQLite database seeded with todos, each
+in a fresh session as a request would, and the time per row covers the
+query, the hydration and the validation.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/todo_list_rows.py [--rows N] [--pages N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from db.migrations import upgrade
+from db.models import Todo
+from repositories.todo_repository import TodoRepository
+from schemas.todo import TodoOutput
+from services.todo_service import todo_page
+
+PAGE_SIZES = (15, 100, 500)
+
+
+def orm_page(session: Session, page_size: int) -> List[TodoOutput]:
+    # The list read as it was before column rows
+    todos = session.query(Todo).order_by(Todo.created_at, Todo.id).limit(page_size)
+    return [TodoOutput(**todo.as_dict()) for todo in todos.all()]
+
+
+def core_page(session: Session, page_size: int) -> List[TodoOutput]:
+    rows = TodoRepository(session).get_all(page_size=page_size)
+    return todo_page(rows, page_size).todos
+
+
+PATHS: Dict[str, Callable[[Session, int], List[TodoOutput]]] = {
+    "orm": orm_page,
+    "core": core_page,
+}
+
+
+def seed(engine: Engine, rows: int) -> None:
+    upgrade(engine)
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add_all(Todo(user_id=user_id, title=f"Todo {i}") for i in range(rows))
+        session.commit()
+
+
+def run(engine: Engine, path: str, page_size: int, pages: int) -> float:
+    """
+    Microseconds per row of reading ``pages`` pages.
+    """
+    read_page = PATHS[path]
+    # Warm up the statement cache
+    with Session(engine) as session:
+        read_page(session, page_size)
+
+    started_at = time.perf_counter()
+    for _ in range(pages):
+        with Session(engine) as session:
+            read_page(session, page_size)
+    elapsed = time.perf_counter() - started_at
+    return elapsed / (pages * page_size) * 1_000_000
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=max(PAGE_SIZES))
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        seed(engine, args.rows)
+        print(f"SQLite: {args.rows} todos, {args.pages} pages per run")
+        for page_size in PAGE_SIZES:
+            results = {path: run(engine, path, page_size, args.pages) for path in PATHS}
+            print(
+                f"  page_size={page_size}: "
+                + ", ".join(f"{path} {us:.1f} us/row" for path, us in results.items())
+                + f" ({results['orm'] / results['core']:.2f}x)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Latency and CPU time of serving a page of todos through FastAPI's usual
+response_model path versus utils.responses.ModelRoute, which writes the
+already validated TodoList straight to JSON bytes.
+
+Both routes return the same prebuilt page, so the numbers isolate the
+response layer from the database. Requests go through the ASGI app
+in-process with TestClient.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/todo_responses.py [--requests N]
+"""
+
+import argparse
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from db.models import utc_now, uuid7
+from schemas.todo import TodoList, TodoOutput
+from utils.responses import ModelRoute
+
+PAGE_SIZES = (15, 100, 500)
+
+ROUTE_CLASSES = {
+    "fastapi": APIRoute,
+    "model": ModelRoute,
+}
+
+
+def build_page(page_size: int) -> TodoList:
+    user_id = uuid.uuid4()
+    now = utc_now()
+    return TodoList(
+        page_size=page_size,
+        todos=[
+            TodoOutput(
+                id=uuid7(),
+                user_id=user_id,
+                title=f"Todo {i}",
+                completed=bool(i % 2),
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(page_size)
+        ],
+    )
+
+
+def build_app(pages: Dict[int, TodoList]) -> FastAPI:
+    app = FastAPI()
+    for name, route_class in ROUTE_CLASSES.items():
+        router = APIRouter(prefix=f"/{name}", route_class=route_class)
+
+        @router.get("/todos", response_model=TodoList)
+        async def get_todos(page_size: int):
+            return pages[page_size]
+
+        app.include_router(router)
+    return app
+
+
+def run(client: TestClient, path: str, page_size: int, requests: int) -> Dict:
+    url = f"{path}?page_size={page_size}"
+    client.get(url)
+    started_at, cpu_started_at = time.perf_counter(), time.process_time()
+    for _ in range(requests):
+        client.get(url)
+    elapsed = time.perf_counter() - started_at
+    cpu = time.process_time() - cpu_started_at
+    return {
+        "latency_ms": elapsed / requests * 1000,
+        "cpu_ms": cpu / requests * 1000,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    pages = {page_size: build_page(page_size) for page_size in PAGE_SIZES}
+    with TestClient(build_app(pages)) as client:
+        for name in ROUTE_CLASSES:
+            body = client.get(f"/{name}/todos?page_size={PAGE_SIZES[0]}").json()
+            assert body == pages[PAGE_SIZES[0]].model_dump(mode="json")
+        print(f"{args.requests} requests per run")
+        for page_size in PAGE_SIZES:
+            print(f"  page_size={page_size}:")
+            for name in ROUTE_CLASSES:
+                result = run(client, f"/{name}/todos", page_size, args.requests)
+                print(
+                    f"    {name}: {result['latency_ms']:.3f} ms/request, "
+                    f"{result['cpu_ms']:.3f} ms CPU/request"
+                )
+
+
+if __name__ == "__main__":
+    main()
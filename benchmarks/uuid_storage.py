@@ -0,0 +1,123 @@
+"""
+Storage benchmark for UUID keys on SQLite: 32-character hex text, what the
+postgresql UUID type falls back to, versus the 16-byte BLOBs of db.types.GUID.
+
+The same todos-shaped rows are loaded into one table per key type. The script
+then reports the table and index sizes and the rate of primary key lookups.
+
+Usage, from the repository root:
+
+    PYTHONPATH=app python benchmarks/uuid_storage.py [--rows N] [--lookups N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Engine
+
+from db.models import utc_now, uuid7
+from db.types import GUID
+
+KEY_TYPES = {
+    "text": lambda: UUID(as_uuid=True),
+    "blob": GUID,
+}
+
+
+def bench_table(name: str, key_type) -> Table:
+    return Table(
+        name,
+        MetaData(),
+        Column("id", key_type(), primary_key=True),
+        Column("user_id", key_type(), nullable=False),
+        Column("title", String, nullable=False),
+        Column("completed", Boolean),
+        Column("created_at", DateTime),
+        Index(f"ix_{name}_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
+
+def sizes(engine: Engine, table: Table) -> dict:
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT dbstat.name, sum(pgsize) FROM dbstat "
+                "JOIN sqlite_master ON sqlite_master.name = dbstat.name "
+                "WHERE sqlite_master.tbl_name = :table_name GROUP BY dbstat.name"
+            ),
+            {"table_name": table.name},
+        ).all()
+    return dict(rows)
+
+
+def run(engine: Engine, label: str, rows: int, lookups: int, user_ids: List) -> None:
+    table = bench_table(f"bench_{label}", KEY_TYPES[label])
+    table.create(engine)
+    ids = [uuid7() for _ in range(rows)]
+    with engine.begin() as connection:
+        connection.execute(
+            table.insert(),
+            [
+                {
+                    "id": _id,
+                    "user_id": user_ids[i % len(user_ids)],
+                    "title": f"Todo {i}",
+                    "completed": False,
+                    "created_at": utc_now(),
+                }
+                for i, _id in enumerate(ids)
+            ],
+        )
+
+    # Bind the keys up front and go through the DBAPI cursor, so the rate
+    # reflects the index lookups rather than statement construction
+    bind = table.c.id.type.bind_processor(engine.dialect)
+    sample = [(bind(_id),) for _id in random.sample(ids, lookups)]
+    with engine.connect() as connection:
+        cursor = connection.connection.cursor()
+        statement = f"SELECT title FROM {table.name} WHERE id = ?"
+        started_at = time.perf_counter()
+        for parameters in sample:
+            cursor.execute(statement, parameters).fetchone()
+        elapsed = time.perf_counter() - started_at
+
+    print(f"  {label}: {lookups / elapsed:,.0f} lookups/s")
+    for name, size in sorted(sizes(engine, table).items()):
+        print(f"    {name}: {size / 1024 / 1024:.1f} MiB")
+    table.drop(engine)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    user_ids = [uuid.uuid4() for _ in range(100)]
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        print(f"SQLite: {args.rows} rows")
+        for label in KEY_TYPES:
+            run(engine, label, args.rows, args.lookups, user_ids)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
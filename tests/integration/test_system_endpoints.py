@@ -41,3 +41,14 @@ class TestSystemRouterIntegration(unittest.TestCase):
             datetime.fromisoformat(response_data["iso_time"])
         except ValueError:
             self.fail("iso_time is not a valid ISO format datetime string")
+
+    def test_openapi_is_compressed(self):
+        # Act
+        response = self.client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        again = self.client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+        # Assert: decoded by the client
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.json(), app.openapi())
+        self.assertEqual(again.content, response.content)
@@ -1,6 +1,12 @@
+import csv
+import io
+import json
 import unittest
+import uuid
 import pytest
 from fastapi import status
+from app.db.base import SessionLocal
+from app.services.todo_service import TodoService
 from tests.conftest import generate_random_username
 
 # Define API_PREFIX for todos and users
@@ -64,6 +70,8 @@ class TestTodoEndpoints(unittest.TestCase):
         self.assertEqual(response_data["message"], "Todo is created successfully.")
         self.assertEqual(response_data["data"]["title"], todo_data["title"])
         self.assertEqual(response_data["data"]["completed"], todo_data["completed"])
+        # Keeps the writer's next reads on the primary in any worker
+        self.assertEqual(response.cookies.get("read_primary"), "1")
 
     def test_get_all_todos(self):
         # Make the request to the /api/v1/todos endpoint
@@ -92,6 +100,8 @@ class TestTodoEndpoints(unittest.TestCase):
             headers={"Authorization": f"Bearer {self.access_token}"},
         )
         todo_id = create_response.json()["data"]["id"]
+        # New todos get time-ordered UUID7 ids, accepted by the id path param
+        self.assertEqual(uuid.UUID(todo_id).version, 7)
 
         # Make the request to the /api/v1/todos/{_id} endpoint
         response = self.client.get(
@@ -163,3 +173,470 @@ class TestTodoEndpoints(unittest.TestCase):
         self.assertEqual(response_data["message"], "Todo is updated successfully.")
         self.assertEqual(response_data["data"]["title"], update_data["title"])
         self.assertEqual(response_data["data"]["completed"], update_data["completed"])
+
+    def test_get_all_todos_with_cursor(self):
+        # Create a few todos to page through
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        created_ids = [
+            self.client.post(
+                f"{API_PREFIX_TODOS}",
+                json={"title": f"Todo {i}", "completed": False},
+                headers=headers,
+            ).json()["data"]["id"]
+            for i in range(5)
+        ]
+
+        # Walk every page following next_cursor
+        seen_ids = []
+        response = self.client.get(f"{API_PREFIX_TODOS}", params={"page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response_data = response.json()
+            seen_ids.extend(todo["id"] for todo in response_data["todos"])
+            if response_data["next_cursor"] is None:
+                break
+            response = self.client.get(
+                f"{API_PREFIX_TODOS}",
+                params={"page_size": 2, "cursor": response_data["next_cursor"]},
+            )
+            self.assertIsNone(response.json()["page"])
+
+        # Assert every todo is returned exactly once, in creation order
+        self.assertEqual(seen_ids, created_ids)
+
+    def test_get_todos_with_fields(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        todo = self.client.post(
+            f"{API_PREFIX_TODOS}", json={"title": "Sparse"}, headers=headers
+        ).json()["data"]
+        self.client.post(f"{API_PREFIX_TODOS}", json={"title": "More"}, headers=headers)
+
+        # Pages of only the requested fields still hand out cursors
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}",
+            params={"fields": "completed,id,title", "page_size": 1, "count": "none"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.json()
+        self.assertEqual(list(first_page["todos"][0]), ["id", "title", "completed"])
+        self.assertTrue(first_page["has_more"])
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}",
+            params={"fields": "id", "cursor": first_page["next_cursor"]},
+        )
+        self.assertEqual(list(response.json()["todos"][0]), ["id"])
+
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/{todo['id']}", params={"fields": "title,completed"}
+        )
+        self.assertEqual(response.json(), {"title": "Sparse", "completed": False})
+
+        response = self.client.get(f"{API_PREFIX_TODOS}", params={"fields": "secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_all_todos_with_invalid_cursor(self):
+        response = self.client.get(f"{API_PREFIX_TODOS}", params={"cursor": "bogus"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_all_todos_count_strategies(self):
+        # Create a todo so there is something to count
+        self.client.post(
+            f"{API_PREFIX_TODOS}",
+            json={"title": "Test Todo", "completed": False},
+            headers={"Authorization": f"Bearer {self.access_token}"},
+        )
+
+        # Exact, cached and estimate (falls back to exact on SQLite) agree
+        for count in ["exact", "cached", "estimate"]:
+            response = self.client.get(f"{API_PREFIX_TODOS}", params={"count": count})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()["total_count"], 1)
+
+        # No count only reports whether more pages follow
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}", params={"count": "none", "page_size": 1}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.json()["total_count"])
+        self.assertFalse(response.json()["has_more"])
+
+    def test_get_todo_details_rejects_other_uuid_versions(self):
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/{uuid.uuid1()}",
+            headers={"Authorization": f"Bearer {self.access_token}"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_update_and_delete_missing_todo(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        missing_id = "c9bf9e57-1685-4c89-bafb-ff5af830be8a"
+
+        response = self.client.put(
+            f"{API_PREFIX_TODOS}/{missing_id}",
+            json={"title": "Updated Todo", "completed": True},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.delete(
+            f"{API_PREFIX_TODOS}/{missing_id}", headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_update_delete(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        missing_id = "c9bf9e57-1685-4c89-bafb-ff5af830be8a"
+
+        # Create three todos in one request
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={"todos": [{"title": f"Bulk Todo {i}"} for i in range(3)]},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = response.json()["data"]
+        self.assertEqual([item["status_code"] for item in created], [201] * 3)
+        self.assertEqual(
+            [item["todo"]["title"] for item in created],
+            [f"Bulk Todo {i}" for i in range(3)],
+        )
+        ids = [item["id"] for item in created]
+
+        # Update two of them, plus one that does not exist
+        response = self.client.patch(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={
+                "todos": [
+                    {"id": ids[0], "completed": True},
+                    {"id": missing_id, "completed": True},
+                    {"id": ids[1], "title": "Renamed"},
+                ]
+            },
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updated = response.json()["data"]
+        self.assertEqual([item["status_code"] for item in updated], [200, 404, 200])
+        self.assertTrue(updated[0]["todo"]["completed"])
+        self.assertEqual(updated[0]["todo"]["title"], "Bulk Todo 0")
+        self.assertEqual(updated[2]["todo"]["title"], "Renamed")
+        self.assertFalse(updated[2]["todo"]["completed"])
+
+        # Delete them all, plus one that does not exist
+        response = self.client.request(
+            "DELETE",
+            f"{API_PREFIX_TODOS}/bulk",
+            json={"ids": ids + [missing_id, ids[0]]},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        deleted = response.json()["data"]
+        # The repeated id was already deleted by its first copy
+        self.assertEqual(
+            [item["status_code"] for item in deleted], [200, 200, 200, 404, 404]
+        )
+
+        # Nothing is left to delete
+        response = self.client.request(
+            "DELETE", f"{API_PREFIX_TODOS}/bulk", json={"ids": ids}, headers=headers
+        )
+        self.assertEqual(
+            [item["status_code"] for item in response.json()["data"]], [404] * 3
+        )
+
+    def test_bulk_rejects_empty_and_unauthenticated(self):
+        response = self.client.post(f"{API_PREFIX_TODOS}/bulk", json={"todos": []})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={"todos": []},
+            headers={"Authorization": f"Bearer {self.access_token}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_bulk_create_rejects_item_without_title(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={"todos": [{"title": "Has a title"}, {"completed": True}]},
+            headers=headers,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(
+            response.json()["detail"][0]["loc"], ["body", "todos", 1, "title"]
+        )
+        # Nothing of the batch was created
+        response = self.client.get(f"{API_PREFIX_TODOS}", headers=headers)
+        self.assertEqual(response.json()["todos"], [])
+
+    def test_get_my_todos(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={"todos": [{"title": f"My Todo {i}"} for i in range(3)]},
+            headers=headers,
+        )
+        ids = [item["id"] for item in response.json()["data"]]
+        self.client.patch(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={"todos": [{"id": ids[1], "completed": True}]},
+            headers=headers,
+        )
+
+        # Open todos only, one per page, oldest first
+        response = self.client.get(
+            f"{API_PREFIX_USERS}/me/todos",
+            params={"completed": False, "page_size": 1},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.json()
+        self.assertEqual([todo["id"] for todo in first_page["todos"]], [ids[0]])
+        self.assertTrue(first_page["has_more"])
+
+        response = self.client.get(
+            f"{API_PREFIX_USERS}/me/todos",
+            params={
+                "completed": False,
+                "page_size": 1,
+                "cursor": first_page["next_cursor"],
+            },
+            headers=headers,
+        )
+        second_page = response.json()
+        self.assertEqual([todo["id"] for todo in second_page["todos"]], [ids[2]])
+        self.assertFalse(second_page["has_more"])
+
+        # Nothing was created before 2000
+        response = self.client.get(
+            f"{API_PREFIX_USERS}/me/todos",
+            params={"created_to": "2000-01-01T00:00:00Z"},
+            headers=headers,
+        )
+        self.assertEqual(response.json()["todos"], [])
+
+        # Anonymous callers have no todos of their own
+        response = self.client.get(f"{API_PREFIX_USERS}/me/todos")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_my_todo_stats(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        response = self.client.get(
+            f"{API_PREFIX_USERS}/me/todos/stats", headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"total": 0, "completed": 0})
+
+        # Every write is counted
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={
+                "todos": [
+                    {"title": "Buy milk"},
+                    {"title": "Walk the dog", "completed": True},
+                    {"title": "Read a book"},
+                ]
+            },
+            headers=headers,
+        )
+        ids = [item["id"] for item in response.json()["data"]]
+        self.client.put(
+            f"{API_PREFIX_TODOS}/{ids[0]}",
+            json={"title": "Buy milk", "completed": True},
+            headers=headers,
+        )
+        self.client.delete(f"{API_PREFIX_TODOS}/{ids[2]}", headers=headers)
+        self.client.post(f"{API_PREFIX_TODOS}", json={"title": "Cook"}, headers=headers)
+
+        response = self.client.get(
+            f"{API_PREFIX_USERS}/me/todos/stats", headers=headers
+        )
+        self.assertEqual(response.json(), {"total": 3, "completed": 2})
+
+        response = self.client.get(f"{API_PREFIX_USERS}/me/todos/stats")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_search_todos(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={
+                "todos": [
+                    {"title": "Buy milk"},
+                    {"title": "Buy milk and more milk"},
+                    {"title": "Walk the dog"},
+                ]
+            },
+            headers=headers,
+        )
+        ids = [item["id"] for item in response.json()["data"]]
+
+        # Best match first, one per page
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/search",
+            params={"q": "MILK", "page_size": 1},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.json()
+        self.assertEqual([todo["id"] for todo in first_page["todos"]], [ids[1]])
+        self.assertTrue(first_page["has_more"])
+        self.assertIsNone(first_page["next_cursor"])
+
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/search",
+            params={"q": "MILK", "page_size": 1, "page": 2},
+            headers=headers,
+        )
+        self.assertEqual([todo["id"] for todo in response.json()["todos"]], [ids[0]])
+
+        # The index follows updates and deletes
+        self.client.put(
+            f"{API_PREFIX_TODOS}/{ids[2]}",
+            json={"title": "Walk the cat"},
+            headers=headers,
+        )
+        self.client.delete(f"{API_PREFIX_TODOS}/{ids[0]}", headers=headers)
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/search", params={"q": "cat"}, headers=headers
+        )
+        self.assertEqual([todo["id"] for todo in response.json()["todos"]], [ids[2]])
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/search", params={"q": "buy milk"}, headers=headers
+        )
+        self.assertEqual([todo["id"] for todo in response.json()["todos"]], [ids[1]])
+
+        # Another user finds none of these todos
+        username = generate_random_username()
+        user_data = {
+            "email": f"{username}@example.com",
+            "password": self.password,
+            "username": username,
+        }
+        self.client.post(f"{API_PREFIX_USERS}/register", json=user_data)
+        other_token = self.client.post(
+            f"{API_PREFIX_USERS}/login",
+            json={"email": user_data["email"], "password": self.password},
+        ).json()["access_token"]
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/search",
+            params={"q": "milk"},
+            headers={"Authorization": f"Bearer {other_token}"},
+        )
+        self.assertEqual(response.json()["todos"], [])
+
+        # Searching requires a query and a user
+        response = self.client.get(f"{API_PREFIX_TODOS}/search", headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        response = self.client.get(f"{API_PREFIX_TODOS}/search", params={"q": "milk"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_todos(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/bulk",
+            json={"todos": [{"title": "Export me"}, {"title": "Me, too"}]},
+            headers=headers,
+        )
+        todos = {item["id"]: item["todo"] for item in response.json()["data"]}
+
+        # NDJSON, the default: one TodoOutput per line
+        response = self.client.get(f"{API_PREFIX_TODOS}/export")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        self.assertEqual(
+            response.headers["content-disposition"],
+            'attachment; filename="todos.ndjson"',
+        )
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(
+            [todo for todo in exported if todo["id"] in todos], list(todos.values())
+        )
+
+        # CSV with a header row
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/export", params={"format": "csv"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.headers["content-type"].startswith("text/csv"))
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        self.assertEqual(len(rows), len(exported))
+        row = next(row for row in rows if row["id"] in todos)
+        self.assertEqual(row["title"], "Export me")
+        self.assertEqual(row["user_id"], todos[row["id"]]["user_id"])
+
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/export", params={"format": "xml"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_import_todos(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+
+        # NDJSON, the default
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/import",
+            content=b'{"title": "Imported"}\n{"title": "Done", "completed": true}\n{}\n',
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["data"],
+            {
+                "imported": 2,
+                "failed": 1,
+                "errors": [{"line": 3, "detail": "title: Field required"}],
+            },
+        )
+
+        # CSV with a header row
+        response = self.client.post(
+            f"{API_PREFIX_TODOS}/import",
+            params={"format": "csv"},
+            content=b"completed,title\r\nfalse,From a spreadsheet\r\n",
+            headers=headers,
+        )
+        self.assertEqual(response.json()["data"]["imported"], 1)
+
+        response = self.client.get(f"{API_PREFIX_USERS}/me/todos", headers=headers)
+        self.assertEqual(
+            [(todo["title"], todo["completed"]) for todo in response.json()["todos"]],
+            [("Imported", False), ("Done", True), ("From a spreadsheet", False)],
+        )
+        response = self.client.get(
+            f"{API_PREFIX_USERS}/me/todos/stats", headers=headers
+        )
+        self.assertEqual(response.json(), {"total": 3, "completed": 1})
+
+        response = self.client.post(f"{API_PREFIX_TODOS}/import", content=b"")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_archived_todo_details(self):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        todo_id = self.client.post(
+            f"{API_PREFIX_TODOS}",
+            json={"title": "Done and dusted", "completed": True},
+            headers=headers,
+        ).json()["data"]["id"]
+
+        # Archive everything completed so far
+        with SessionLocal() as session:
+            archived = TodoService(session).archive_completed(older_than_days=0)
+        self.assertGreaterEqual(archived, 1)
+
+        # The todo left the hot table but is still served by id
+        response = self.client.get(f"{API_PREFIX_TODOS}/{todo_id}", headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Done and dusted")
+        self.assertTrue(response.json()["completed"])
+
+        # Unknown ids are a 404
+        response = self.client.get(
+            f"{API_PREFIX_TODOS}/{uuid.uuid4()}", headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
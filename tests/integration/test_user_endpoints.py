@@ -57,14 +57,27 @@ class TestUserEndpoints(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
         # Register user again with same email
-        response = self.client.post(f"{API_PREFIX}/register", json=user_data)
+        response = self.client.post(
+            f"{API_PREFIX}/register",
+            json={**user_data, "username": f"{self.random_username}x"},
+        )
         # Assert the response
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["detail"], f"Email {self.email} already registered"
+        )
 
         # Register user again with same username
-        response = self.client.post(f"{API_PREFIX}/register", json=user_data)
+        response = self.client.post(
+            f"{API_PREFIX}/register",
+            json={**user_data, "email": f"x{self.email}"},
+        )
         # Assert the response
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["detail"],
+            f"Username {self.random_username} already registered",
+        )
 
     def test_register_user_with_invalid_password(self):
         # Test data
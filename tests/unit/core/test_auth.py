@@ -1,97 +1,78 @@
+import asyncio
+import os
+import tempfile
+import time
 import unittest
+import uuid
 from unittest.mock import patch, MagicMock, AsyncMock
-from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy.sql.elements import BinaryExpression
+from fastapi import HTTPException, Response, status
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from jose import JWTError
 from app.core import security
-from app.core.auth import get_user, get_current_user, User
-
-
-class TestGetUser(unittest.TestCase):
+from app.core.auth import (
+    get_user,
+    get_current_user,
+    get_current_writer,
+    get_current_reader,
+    get_read_session,
+    get_read_session_opener,
+    get_token_subject,
+    User,
+)
+
+
+class TestGetUser(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        # Mock the dependencies for both functions
-        self.mock_session_patcher = patch("app.core.auth.Session", autospec=True)
-        self.mock_session = self.mock_session_patcher.start()
-        self.mock_db_session = MagicMock(spec=Session)
-        self.mock_session.return_value = self.mock_db_session
-
-        self.mock_oauth2_scheme = patch(
-            "app.core.auth.oauth2_scheme", new_callable=AsyncMock
-        ).start()
-        self.mock_get_session = patch(
-            "app.core.auth.get_session", new_callable=AsyncMock
-        ).start()
-        self.mock_get_session.return_value = self.mock_db_session
-
-    def tearDown(self):
-        patch.stopall()
-
-    def test_get_user_found(self):
+        # Mock the async database session
+        self.mock_db_session = AsyncMock(spec=AsyncSession)
+        self.mock_result = MagicMock()
+        self.mock_db_session.execute.return_value = self.mock_result
+
+    async def test_get_user_found(self):
         # Arrange
         mock_user = User(email="test@example.com")
-        self.mock_db_session.query.return_value.filter.return_value.first.return_value = (
-            mock_user
-        )
+        self.mock_result.scalars.return_value.first.return_value = mock_user
 
         # Act
-        result = get_user(self.mock_db_session, "test@example.com")
+        result = await get_user(self.mock_db_session, "test@example.com")
 
         # Assert
         self.assertEqual(result, mock_user)
-        self.mock_db_session.query.assert_called_once_with(User)
+        self.mock_db_session.execute.assert_awaited_once()
 
-        # Check that filter was called with the correct condition
-        filter_call_args = self.mock_db_session.query.return_value.filter.call_args[0][
-            0
-        ]
-        self.assertIsInstance(filter_call_args, BinaryExpression)
-        self.assertEqual(str(filter_call_args), str(User.email == "test@example.com"))
-
-        # Check that first was called
-        self.mock_db_session.query.return_value.filter.return_value.first.assert_called_once()
+        # Check that the statement filters on the email
+        statement = self.mock_db_session.execute.call_args[0][0]
+        self.assertEqual(
+            str(statement), str(select(User).where(User.email == "test@example.com"))
+        )
 
-    def test_get_user_not_found(self):
+    async def test_get_user_not_found(self):
         # Arrange
-        self.mock_db_session.query.return_value.filter.return_value.first.return_value = (
-            None
-        )
+        self.mock_result.scalars.return_value.first.return_value = None
 
         # Act
-        result = get_user(self.mock_db_session, "nonexistent@example.com")
+        result = await get_user(self.mock_db_session, "nonexistent@example.com")
 
         # Assert
         self.assertIsNone(result)
-        self.mock_db_session.query.assert_called_once_with(User)
-
-        # Check that filter was called with the correct condition
-        filter_call_args = self.mock_db_session.query.return_value.filter.call_args[0][
-            0
-        ]
-        self.assertIsInstance(filter_call_args, BinaryExpression)
-        self.assertEqual(
-            str(filter_call_args), str(User.email == "nonexistent@example.com")
-        )
-
-        # Check that first was called
-        self.mock_db_session.query.return_value.filter.return_value.first.assert_called_once()
+        self.mock_db_session.execute.assert_awaited_once()
 
-    def test_get_user_exception_handling(self):
+    async def test_get_user_exception_handling(self):
         # Arrange
-        self.mock_db_session.query.side_effect = Exception("Database error")
+        self.mock_db_session.execute.side_effect = Exception("Database error")
 
         # Act & Assert
         with self.assertRaises(Exception) as context:
-            get_user(self.mock_db_session, "error@example.com")
+            await get_user(self.mock_db_session, "error@example.com")
 
         self.assertEqual(str(context.exception), "Database error")
-        self.mock_db_session.query.assert_called_once_with(User)
 
 
 @patch("app.core.auth.oauth2_scheme")  # Mock the OAuth2PasswordBearer dependency
-@patch("app.core.auth.get_session")  # Mock the database session
+@patch("app.core.auth.get_async_session")  # Mock the database session
 @patch("app.core.auth.jwt.decode")  # Mock jwt.decode
-@patch("app.core.auth.get_user")  # Mock the get_user function
+@patch("app.core.auth.get_user", new_callable=AsyncMock)  # Mock the get_user function
 class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
@@ -99,7 +80,7 @@ class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
         self.mock_token = "test_token"
         self.mock_email = "test@example.com"
         self.mock_user = MagicMock(spec=User)
-        self.mock_get_session = MagicMock(spec=Session)
+        self.mock_get_session = AsyncMock(spec=AsyncSession)
 
     async def test_get_current_user_valid_token(
         self, mock_get_user, mock_jwt_decode, mock_get_session, mock_oauth2_scheme
@@ -120,7 +101,7 @@ class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
         mock_jwt_decode.assert_called_once_with(
             self.mock_token, security.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        mock_get_user.assert_called_once_with(
+        mock_get_user.assert_awaited_once_with(
             mock_get_session.return_value, email=self.mock_email
         )
         self.assertEqual(result, self.mock_user)
@@ -137,7 +118,9 @@ class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
-            await get_current_user(token=self.mock_token, db=MagicMock(spec=Session))
+            await get_current_user(
+                token=self.mock_token, db=AsyncMock(spec=AsyncSession)
+            )
 
         self.assertEqual(context.exception.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertEqual(context.exception.detail, "Could not validate credentials")
@@ -155,7 +138,9 @@ class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
-            await get_current_user(token=self.mock_token, db=MagicMock(spec=Session))
+            await get_current_user(
+                token=self.mock_token, db=AsyncMock(spec=AsyncSession)
+            )
 
         self.assertEqual(context.exception.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertEqual(context.exception.detail, "Could not validate credentials")
@@ -174,8 +159,186 @@ class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
-            await get_current_user(token=self.mock_token, db=MagicMock(spec=Session))
+            await get_current_user(
+                token=self.mock_token, db=AsyncMock(spec=AsyncSession)
+            )
 
         self.assertEqual(context.exception.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertEqual(context.exception.detail, "Could not validate credentials")
         self.assertEqual(context.exception.headers, {"WWW-Authenticate": "Bearer"})
+
+
+@patch("app.core.auth.jwt.decode")  # Mock jwt.decode
+class TestGetCurrentUserConcurrency(unittest.IsolatedAsyncioTestCase):
+    """
+    Look users up through aiosqlite in a SQLite file whose users are read
+    through a view that sleeps in the driver's thread for every row, like a
+    slow database would.
+    """
+
+    lookup_latency = 0.1
+
+    async def asyncSetUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tempdir.name, "auth.db")
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        event.listen(self.engine.sync_engine, "connect", self._add_slow_function)
+
+        async with self.engine.begin() as connection:
+            await connection.exec_driver_sql(
+                "CREATE TABLE user_rows (id CHAR(32) PRIMARY KEY, username TEXT, "
+                "email TEXT, hashed_password TEXT, is_superuser BOOLEAN, "
+                "is_active BOOLEAN, created_at DATETIME, updated_at DATETIME)"
+            )
+            await connection.exec_driver_sql(
+                "CREATE VIEW users AS SELECT id, username, slow(email) AS email, "
+                "hashed_password, is_superuser, is_active, created_at, updated_at "
+                "FROM user_rows"
+            )
+            await connection.exec_driver_sql(
+                "INSERT INTO user_rows (id, username, email, is_active) "
+                "VALUES (?, 'test', 'test@example.com', 1)",
+                (uuid.uuid4().bytes,),
+            )
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.tempdir.cleanup()
+
+    def _add_slow_function(self, dbapi_connection, connection_record):
+        def slow(value):
+            time.sleep(self.lookup_latency)
+            return value
+
+        dbapi_connection.create_function("slow", 1, slow)
+
+    async def _get_current_user(self):
+        async with AsyncSession(self.engine) as session:
+            return await get_current_user(token="test_token", db=session)
+
+    async def test_concurrent_lookups_overlap(self, mock_jwt_decode):
+        """
+        Test that concurrent get_current_user calls overlap on the event loop
+        instead of running one after another while the user lookup waits on
+        the database. A lookup that blocked the loop would take
+        concurrency * lookup_latency in total.
+        """
+        # Arrange
+        concurrency = 10
+        mock_jwt_decode.return_value = {"sub": "test@example.com"}
+        # Open the pool's connections up front
+        await asyncio.gather(*(self._get_current_user() for _ in range(concurrency)))
+
+        # Act
+        started_at = time.perf_counter()
+        users = await asyncio.gather(
+            *(self._get_current_user() for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started_at
+
+        # Assert
+        self.assertEqual([user.email for user in users], ["test@example.com"] * 10)
+        self.assertGreaterEqual(elapsed, self.lookup_latency)
+        self.assertLess(elapsed, concurrency * self.lookup_latency / 2)
+
+
+@patch("app.core.auth.jwt.decode")  # Mock jwt.decode
+class TestGetTokenSubject(unittest.TestCase):
+
+    def test_valid_token(self, mock_jwt_decode):
+        mock_jwt_decode.return_value = {"sub": "test@example.com"}
+        self.assertEqual(get_token_subject("test_token"), "test@example.com")
+
+    def test_missing_token(self, mock_jwt_decode):
+        self.assertIsNone(get_token_subject(None))
+        mock_jwt_decode.assert_not_called()
+
+    def test_invalid_token(self, mock_jwt_decode):
+        mock_jwt_decode.side_effect = JWTError("Invalid token")
+        self.assertIsNone(get_token_subject("test_token"))
+
+
+@patch("app.core.auth.replica_router")
+class TestReplicaDependencies(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_current_writer_marks_write(self, mock_replica_router):
+        # Arrange
+        mock_user = MagicMock(spec=User)
+        mock_user.email = "test@example.com"
+        mock_replica_router.read_your_writes_window = 2.5
+        response = Response()
+
+        # Act
+        dependency = get_current_writer(response, mock_user)
+        user = await anext(dependency)
+        mock_replica_router.mark_write.assert_called_once_with("test@example.com")
+        with self.assertRaises(StopAsyncIteration):
+            await anext(dependency)
+
+        # Assert: the cookie outlives the window rather than falling short
+        self.assertEqual(user, mock_user)
+        self.assertEqual(mock_replica_router.mark_write.call_count, 2)
+        self.assertIn(
+            "read_primary=1; HttpOnly; Max-Age=3;",
+            response.headers["set-cookie"],
+        )
+
+    @patch("app.core.auth.get_token_subject")
+    async def test_get_read_session(self, mock_get_token_subject, mock_replica_router):
+        # Arrange
+        mock_session = AsyncMock(spec=AsyncSession)
+        mock_get_token_subject.return_value = "test@example.com"
+        mock_replica_router.open_session = AsyncMock(return_value=mock_session)
+
+        for read_primary, primary in [(None, False), ("1", True)]:
+            with self.subTest(read_primary=read_primary):
+                mock_replica_router.open_session.reset_mock()
+                mock_session.close.reset_mock()
+
+                # Act
+                dependency = get_read_session("test_token", read_primary)
+                session = await anext(dependency)
+                with self.assertRaises(StopAsyncIteration):
+                    await anext(dependency)
+
+                # Assert
+                mock_replica_router.open_session.assert_awaited_once_with(
+                    "test@example.com", primary=primary
+                )
+                self.assertEqual(session, mock_session)
+                mock_session.close.assert_awaited_once()
+
+    @patch("app.core.auth.get_token_subject")
+    async def test_get_read_session_opener(
+        self, mock_get_token_subject, mock_replica_router
+    ):
+        # Arrange
+        mock_session = AsyncMock(spec=AsyncSession)
+        mock_get_token_subject.return_value = "test@example.com"
+        mock_replica_router.open_session = AsyncMock(return_value=mock_session)
+
+        # Act
+        open_session = await get_read_session_opener("test_token", "1")
+
+        # Assert: nothing is opened until the stream asks for the session
+        mock_replica_router.open_session.assert_not_called()
+        self.assertEqual(await open_session(), mock_session)
+        mock_replica_router.open_session.assert_awaited_once_with(
+            "test@example.com", primary=True
+        )
+
+    @patch("app.core.auth.get_user", new_callable=AsyncMock)
+    @patch("app.core.auth.jwt.decode")
+    async def test_get_current_reader(
+        self, mock_jwt_decode, mock_get_user, mock_replica_router
+    ):
+        # Arrange
+        mock_session = AsyncMock(spec=AsyncSession)
+        mock_jwt_decode.return_value = {"sub": "test@example.com"}
+
+        # Act
+        result = await get_current_reader(token="test_token", db=mock_session)
+
+        # Assert
+        mock_get_user.assert_awaited_once_with(mock_session, email="test@example.com")
+        self.assertEqual(result, mock_get_user.return_value)
@@ -0,0 +1,86 @@
+import unittest
+import uuid
+from unittest.mock import MagicMock
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.copy import copy_rows
+
+metadata = MetaData()
+items = Table(
+    "items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String),
+)
+
+ROWS = [{"id": 1, "title": "First"}, {"id": 2, "title": 'Say "hi", bye'}]
+
+
+class TestCopyRows(unittest.TestCase):
+
+    def _postgresql_session(self, driver):
+        session = MagicMock(spec=Session)
+        connection = session.connection.return_value
+        connection.dialect.name = "postgresql"
+        connection.dialect.driver = driver
+        return session, connection, connection.connection.dbapi_connection
+
+    def test_insert_elsewhere(self):
+        # Arrange
+        engine = create_engine("sqlite://")
+        metadata.create_all(engine)
+
+        # Act
+        with Session(engine) as session:
+            copy_rows(session, items, ROWS)
+            session.commit()
+
+        # Assert
+        with engine.connect() as connection:
+            rows = connection.execute(select(items).order_by(items.c.id)).all()
+        self.assertEqual(
+            [tuple(row) for row in rows], [(1, "First"), (2, ROWS[1]["title"])]
+        )
+        engine.dispose()
+
+    def test_asyncpg_copy(self):
+        # Arrange
+        session, connection, dbapi_connection = self._postgresql_session("asyncpg")
+        driver_connection = MagicMock()
+
+        # Act
+        copy_rows(session, items, ROWS)
+
+        # Assert: the lock opens the transaction before COPY joins it
+        statement = connection.execute.call_args[0][0]
+        self.assertEqual(str(statement), "LOCK TABLE items IN ROW EXCLUSIVE MODE")
+        copy = dbapi_connection.run_async.call_args[0][0]
+        copy(driver_connection)
+        driver_connection.copy_records_to_table.assert_called_once_with(
+            "items",
+            records=[(1, "First"), (2, ROWS[1]["title"])],
+            columns=["id", "title"],
+        )
+
+    def test_psycopg2_copy(self):
+        # Arrange
+        session, _, dbapi_connection = self._postgresql_session("psycopg2")
+        cursor = dbapi_connection.cursor.return_value
+
+        # Act
+        copy_rows(session, items, ROWS)
+
+        # Assert
+        sql, buffer = cursor.copy_expert.call_args[0]
+        self.assertEqual(sql, "COPY items (id, title) FROM STDIN WITH (FORMAT csv)")
+        self.assertEqual(buffer.getvalue(), '1,First\r\n2,"Say ""hi"", bye"\r\n')
+        cursor.close.assert_called_once()
+
+    def test_no_rows(self):
+        session = MagicMock(spec=Session)
+
+        copy_rows(session, items, [])
+
+        session.connection.assert_not_called()
@@ -0,0 +1,34 @@
+import unittest
+
+from sqlalchemy.exc import IntegrityError
+
+from app.db.errors import unique_violation_column
+from app.db.models import User
+
+
+def integrity_error(message: str) -> IntegrityError:
+    return IntegrityError("INSERT INTO users ...", {}, Exception(message))
+
+
+class TestUniqueViolationColumn(unittest.TestCase):
+
+    def test_sqlite_message(self):
+        exc = integrity_error("UNIQUE constraint failed: users.email")
+        self.assertEqual(unique_violation_column(exc, User.__table__), "email")
+
+    def test_postgres_index_name(self):
+        exc = integrity_error(
+            'duplicate key value violates unique constraint "ix_users_username"\n'
+            "DETAIL:  Key (username)=(testuser) already exists."
+        )
+        self.assertEqual(unique_violation_column(exc, User.__table__), "username")
+
+    def test_postgres_constraint_name(self):
+        exc = integrity_error(
+            'duplicate key value violates unique constraint "users_email_key"'
+        )
+        self.assertEqual(unique_violation_column(exc, User.__table__), "email")
+
+    def test_not_a_unique_violation(self):
+        exc = integrity_error("NOT NULL constraint failed: users.hashed_password")
+        self.assertIsNone(unique_violation_column(exc, User.__table__))
@@ -0,0 +1,446 @@
+import ast
+import importlib
+import inspect as inspect_module
+import io
+import os
+import tempfile
+import threading
+import unittest
+import uuid
+from contextlib import redirect_stdout
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.db.migrations import (
+    Migration,
+    current_version,
+    head_version,
+    load_migrations,
+    schema_version,
+    upgrade,
+)
+from app.db.migrations.__main__ import main
+from app.db.models import Base, Todo, TodoArchive, User, UserTodoStats
+from app.repositories.todo_repository import TodoRepository
+from app.services.todo_service import TodoService
+from app.db.utils import check_schema
+
+# Top-level packages of the app, as migrations would import them
+APP_PACKAGES = {
+    "app",
+    "core",
+    "db",
+    "logger",
+    "middlewares",
+    "repositories",
+    "routers",
+    "schemas",
+    "services",
+    "settings",
+    "utils",
+}
+
+
+class MigrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(self.tempdir.name, 'migrations.db')}"
+        )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tempdir.cleanup()
+
+    def _indexes(self, table):
+        return {index["name"] for index in inspect(self.engine).get_indexes(table)}
+
+
+class TestMigrations(MigrationTestCase):
+
+    def test_load_migrations(self):
+        migrations = load_migrations()
+
+        self.assertEqual(
+            [(migration.version, migration.name) for migration in migrations],
+            [
+                (1, "initial"),
+                (2, "per_user_indexes"),
+                (3, "binary_uuids"),
+                (4, "todo_search"),
+                (5, "todos_archive"),
+                (6, "user_todo_stats"),
+                (7, "drop_users_active_email"),
+            ],
+        )
+        self.assertEqual(head_version(), 7)
+
+    def test_head_version_does_not_import_scripts(self):
+        # Act
+        with patch(
+            "app.db.migrations.importlib.import_module",
+            wraps=importlib.import_module,
+        ) as mock_import_module:
+            version = head_version()
+
+        # Assert: only the versions package is imported, to list the scripts
+        self.assertEqual(version, 7)
+        mock_import_module.assert_called_once_with("app.db.migrations.versions")
+
+    def test_migrations_do_not_import_the_app(self):
+        # Each migration is a frozen snapshot: later changes to the models or
+        # column types must not change what an old migration does
+        for migration in load_migrations():
+            with self.subTest(migration=migration.name):
+                tree = ast.parse(inspect_module.getsource(migration.module))
+                imported = [
+                    node.module
+                    for node in ast.walk(tree)
+                    if isinstance(node, ast.ImportFrom)
+                ] + [
+                    alias.name
+                    for node in ast.walk(tree)
+                    if isinstance(node, ast.Import)
+                    for alias in node.names
+                ]
+                self.assertFalse(
+                    [name for name in imported if name.split(".")[0] in APP_PACKAGES]
+                )
+
+    def test_upgrade_empty_database(self):
+        # Act
+        applied = upgrade(self.engine)
+
+        # Assert
+        self.assertEqual(
+            [migration.version for migration in applied], [1, 2, 3, 4, 5, 6, 7]
+        )
+        self.assertEqual(current_version(self.engine), 7)
+        self.assertTrue(inspect(self.engine).has_table("users"))
+        self.assertEqual(
+            self._indexes("users"), {"ix_users_email", "ix_users_username"}
+        )
+        self.assertIn(
+            "ix_todos_user_id_completed_created_at_id", self._indexes("todos")
+        )
+
+        # Nothing is left to apply
+        self.assertEqual(upgrade(self.engine), [])
+
+    def test_upgrade_to_target(self):
+        upgrade(self.engine, target=1)
+        self.assertEqual(current_version(self.engine), 1)
+        self.assertNotIn("ix_todos_user_id_created_at_id", self._indexes("todos"))
+
+        upgrade(self.engine, target=2)
+        self.assertEqual(current_version(self.engine), 2)
+        self.assertIn("ix_todos_user_id_created_at_id", self._indexes("todos"))
+
+    def test_upgrade_adopts_create_all_database(self):
+        # Arrange: a database set up before migrations existed
+        Base.metadata.create_all(self.engine)
+
+        # Act
+        applied = upgrade(self.engine)
+
+        # Assert
+        self.assertEqual(len(applied), 7)
+        self.assertEqual(current_version(self.engine), 7)
+
+    def test_binary_uuids_converts_existing_rows(self):
+        # Arrange: a database with keys stored as 32-character hex text
+        upgrade(self.engine, target=2)
+        user_id, todo_id = uuid.uuid4(), uuid.uuid4()
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+            # Timestamps as the func.now() defaults of the time wrote them
+            connection.exec_driver_sql(
+                "INSERT INTO users "
+                "(id, username, email, is_active, created_at, updated_at) "
+                "VALUES (?, 'john', 'john@example.com', 1, "
+                "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+                (user_id.hex,),
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO todos "
+                "(id, user_id, title, completed, created_at, updated_at) "
+                "VALUES (?, ?, 'Watch a movie', 0, "
+                "'2025-01-01 10:00:00', '2025-01-02 11:30:00')",
+                (todo_id.hex, user_id.hex),
+            )
+
+        # Act
+        upgrade(self.engine)
+
+        # Assert
+        with Session(self.engine) as session:
+            todo = session.get(Todo, todo_id)
+            self.assertEqual(todo.user_id, user_id)
+            self.assertEqual(todo.title, "Watch a movie")
+            self.assertFalse(todo.completed)
+            self.assertEqual(todo.created_at, datetime(2025, 1, 1, 10))
+            self.assertEqual(todo.updated_at, datetime(2025, 1, 2, 11, 30))
+            user = session.get(User, user_id)
+            self.assertEqual(user.email, "john@example.com")
+            self.assertTrue(user.is_active)
+            self.assertIsInstance(user.created_at, datetime)
+        with self.engine.connect() as connection:
+            self.assertEqual(
+                connection.exec_driver_sql(
+                    "SELECT typeof(id), length(id), typeof(user_id) FROM todos"
+                ).one(),
+                ("blob", 16, "blob"),
+            )
+            self.assertEqual(
+                connection.exec_driver_sql("PRAGMA foreign_key_list(todos)").one()[2],
+                "users",
+            )
+            self.assertFalse(
+                connection.exec_driver_sql(
+                    "SELECT name FROM sqlite_master WHERE name LIKE '%__old'"
+                ).all()
+            )
+        self.assertEqual(
+            self._indexes("users"), {"ix_users_email", "ix_users_username"}
+        )
+        self.assertEqual(
+            self._indexes("todos"),
+            {
+                "ix_todos_title",
+                "ix_todos_created_at_id",
+                "ix_todos_user_id_created_at_id",
+                "ix_todos_user_id_completed_created_at_id",
+                "ix_todos_completed_updated_at",
+            },
+        )
+
+    def test_binary_uuids_rewrites_legacy_timestamps(self):
+        # Arrange: todos created within one second, stored with the second
+        # precision text of CURRENT_TIMESTAMP
+        upgrade(self.engine, target=2)
+        user_id = uuid.uuid4()
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO users (id, email) VALUES (?, 'john@example.com')",
+                (user_id.hex,),
+            )
+            for i in range(4):
+                connection.exec_driver_sql(
+                    "INSERT INTO todos "
+                    "(id, user_id, title, completed, created_at, updated_at) "
+                    "VALUES (?, ?, ?, 0, '2025-01-01 10:00:00', "
+                    "'2025-01-01 10:00:00')",
+                    (uuid.uuid4().hex, user_id.hex, f"Todo {i}"),
+                )
+
+        # Act
+        upgrade(self.engine)
+
+        # Assert: the text compares equal to the bound cursor values again,
+        # so keyset pages do not skip rows from the same second
+        with self.engine.connect() as connection:
+            self.assertEqual(
+                connection.exec_driver_sql(
+                    "SELECT DISTINCT created_at FROM todos"
+                ).scalar_one(),
+                "2025-01-01 10:00:00.000000",
+            )
+        titles, cursor = [], None
+        with Session(self.engine) as session:
+            service = TodoService(session)
+            page = service.get_all(page_size=1, count_strategy="none")
+            titles += [todo.title for todo in page.todos]
+            while page.next_cursor is not None:
+                page = service.get_all(
+                    page_size=1, cursor=page.next_cursor, count_strategy="none"
+                )
+                titles += [todo.title for todo in page.todos]
+        self.assertEqual(sorted(titles), [f"Todo {i}" for i in range(4)])
+
+    def test_todo_search_indexes_existing_rows(self):
+        # Arrange
+        upgrade(self.engine, target=3)
+        with Session(self.engine) as session:
+            session.add(User(id=uuid.uuid4(), email="john@example.com"))
+            session.flush()
+            user_id = session.query(User.id).scalar()
+            session.add(Todo(user_id=user_id, title="Watch a movie"))
+            session.commit()
+
+        # Act
+        upgrade(self.engine)
+
+        # Assert
+        with Session(self.engine) as session:
+            todos = TodoRepository(session).search(user_id, ["movie"])
+            self.assertEqual([todo.title for todo in todos], ["Watch a movie"])
+
+    def test_user_todo_stats_counts_existing_todos(self):
+        # Arrange
+        upgrade(self.engine, target=5)
+        user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+        with Session(self.engine) as session:
+            session.add_all(
+                [
+                    User(id=user_id, email="john@example.com"),
+                    User(id=other_user_id, email="jane@example.com"),
+                ]
+            )
+            session.add_all(
+                [
+                    Todo(user_id=user_id, title="Watch a movie", completed=True),
+                    Todo(user_id=user_id, title="Read a book"),
+                    TodoArchive(
+                        id=uuid.uuid4(), user_id=user_id, title="Cook", completed=True
+                    ),
+                ]
+            )
+            session.commit()
+
+        # Act
+        upgrade(self.engine)
+
+        # Assert
+        with Session(self.engine) as session:
+            stats = session.get(UserTodoStats, user_id)
+            self.assertEqual((stats.total, stats.completed), (3, 2))
+            self.assertIsNone(session.get(UserTodoStats, other_user_id))
+
+    def test_drop_users_active_email(self):
+        # Arrange
+        upgrade(self.engine, target=6)
+        self.assertIn("ix_users_active_email", self._indexes("users"))
+
+        # Act
+        upgrade(self.engine)
+
+        # Assert
+        self.assertNotIn("ix_users_active_email", self._indexes("users"))
+        self.assertIn("ix_users_email", self._indexes("users"))
+
+    def test_failed_migration_rolls_back(self):
+        # Arrange
+        def failing_upgrade(connection):
+            connection.exec_driver_sql("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("migration failed")
+
+        migrations = load_migrations() + [
+            Migration(99, "failing", SimpleNamespace(upgrade=failing_upgrade))
+        ]
+
+        # Act
+        with patch("app.db.migrations.load_migrations", return_value=migrations):
+            with self.assertRaises(RuntimeError):
+                upgrade(self.engine)
+
+        # Assert: the whole run is undone, including earlier migrations
+        self.assertEqual(current_version(self.engine), 0)
+        self.assertFalse(inspect(self.engine).has_table("half_done"))
+        self.assertFalse(inspect(self.engine).has_table("users"))
+
+    def test_concurrent_upgrades_apply_each_migration_once(self):
+        # Arrange
+        engine = create_engine(
+            self.engine.url, connect_args={"timeout": 30, "check_same_thread": False}
+        )
+        errors = []
+
+        def run():
+            try:
+                upgrade(engine)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        # Act
+        workers = [threading.Thread(target=run) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # Assert
+        self.assertEqual(errors, [])
+        with engine.connect() as connection:
+            versions = connection.execute(select(schema_version.c.version)).scalars()
+            self.assertEqual(sorted(versions), [1, 2, 3, 4, 5, 6, 7])
+        engine.dispose()
+
+
+class TestCheckSchema(MigrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patch("app.db.utils.engine", self.engine).start()
+
+        # Count every statement sent to the database
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def tearDown(self):
+        patch.stopall()
+        super().tearDown()
+
+    @patch("app.db.utils.settings.DB_AUTO_MIGRATE", True)
+    def test_migrates_when_behind(self):
+        check_schema()
+
+        self.assertEqual(current_version(self.engine), head_version())
+
+    @patch("app.db.utils.settings.DB_AUTO_MIGRATE", False)
+    def test_refuses_when_behind_without_auto_migrate(self):
+        with self.assertRaises(RuntimeError) as context:
+            check_schema()
+
+        self.assertIn("expected 7", str(context.exception))
+        self.assertFalse(inspect(self.engine).has_table("users"))
+
+    @patch("app.db.utils.settings.DB_AUTO_MIGRATE", False)
+    def test_up_to_date_costs_one_query(self):
+        # Arrange
+        upgrade(self.engine)
+        self.statements.clear()
+
+        # Act
+        check_schema()
+        check_statements = len(self.statements)
+
+        self.statements.clear()
+        Base.metadata.create_all(self.engine)
+        create_all_statements = len(self.statements)
+
+        # Assert: the version check replaces reflecting every table
+        self.assertEqual(check_statements, 1)
+        self.assertGreater(create_all_statements, check_statements)
+
+
+class TestMigrationsCli(MigrationTestCase):
+
+    def _run(self, *argv):
+        output = io.StringIO()
+        with patch("app.db.migrations.__main__.engine", self.engine):
+            with redirect_stdout(output):
+                main(list(argv))
+        return output.getvalue()
+
+    def test_cli(self):
+        self.assertIn("0001_initial pending", self._run("history"))
+        self.assertEqual(self._run("current"), "0 (head 7)\n")
+
+        output = self._run("upgrade", "--to", "1")
+        self.assertIn("Applied 0001_initial", output)
+        self.assertIn("Database is at version 1", output)
+
+        self.assertIn("0002_per_user_indexes pending", self._run("history"))
+        output = self._run("upgrade")
+        self.assertIn("Applied 0002_per_user_indexes", output)
+        self.assertIn("Applied 0003_binary_uuids", output)
+        self.assertIn("0002_per_user_indexes applied", self._run("history"))
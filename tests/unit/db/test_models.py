@@ -1,6 +1,10 @@
+import time
 import unittest
+import uuid
+from unittest.mock import patch
+
 from sqlalchemy import Column, Integer, String
-from app.db.models import BaseModel
+from app.db.models import BaseModel, Todo, User, uuid7
 
 
 # Create a concrete model for testing
@@ -21,3 +25,55 @@ class TestBaseModel(unittest.TestCase):
         empty_model = ConcreteModel()
         expected_dict = {"id": None, "name": None, "age": None}
         self.assertEqual(empty_model.as_dict(), expected_dict)
+
+
+class TestUuid7(unittest.TestCase):
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_timestamp_prefix(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        # The leading 48 bits hold the Unix time in milliseconds
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_ids_are_strictly_increasing(self):
+        ids = [uuid7() for _ in range(10000)]
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    # Pin the clock; patching the last timestamp too keeps the generator's
+    # state from leaking into other tests
+    @patch("app.db.models._uuid7_last_timestamp", 0)
+    def test_ids_increase_within_one_millisecond(self):
+        with patch(
+            "app.db.models.time.time_ns", return_value=1_700_000_000_000_000_000
+        ):
+            ids = [uuid7() for _ in range(100)]
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(value.int >> 80 == 1_700_000_000_000 for value in ids))
+
+    @patch("app.db.models._uuid7_last_timestamp", 0)
+    def test_counter_overflow_moves_to_next_millisecond(self):
+        with patch(
+            "app.db.models.time.time_ns", return_value=1_800_000_000_000_000_000
+        ):
+            first = uuid7()
+            with patch("app.db.models._uuid7_counter", (1 << 42) - 1):
+                second = uuid7()
+
+        self.assertEqual(first.int >> 80, 1_800_000_000_000)
+        self.assertEqual(second.int >> 80, 1_800_000_000_001)
+        self.assertGreater(second, first)
+
+    def test_models_default_to_uuid7(self):
+        self.assertIs(User.__table__.c.id.default.arg.__wrapped__, uuid7)
+        self.assertIs(Todo.__table__.c.id.default.arg.__wrapped__, uuid7)
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.replicas import ReplicaRouter
+
+
+class TestReplicaRouter(unittest.IsolatedAsyncioTestCase):
+    """
+    Routes reads between SQLite files that each hold a row naming themselves.
+    """
+
+    async def asyncSetUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.engines = {}
+        self.sessions = {}
+        for name in ["primary", "replica_a", "replica_b"]:
+            path = os.path.join(self.tempdir.name, f"{name}.db")
+            engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            async with engine.begin() as connection:
+                await connection.exec_driver_sql("CREATE TABLE source (name TEXT)")
+                await connection.exec_driver_sql(
+                    f"INSERT INTO source VALUES ('{name}')"
+                )
+            self.engines[name] = engine
+            self.sessions[name] = async_sessionmaker(bind=engine)
+
+        # A replica in a directory that does not exist can never be opened
+        self.engines["broken"] = create_async_engine(
+            f"sqlite+aiosqlite:///{self.tempdir.name}/missing/broken.db"
+        )
+        self.sessions["broken"] = async_sessionmaker(bind=self.engines["broken"])
+
+    async def asyncTearDown(self):
+        for engine in self.engines.values():
+            await engine.dispose()
+        self.tempdir.cleanup()
+
+    def _router(self, *replicas, window=5.0):
+        return ReplicaRouter(
+            primary=self.sessions["primary"],
+            replicas=[self.sessions[name] for name in replicas],
+            retry_after=30,
+            read_your_writes_window=window,
+        )
+
+    async def _source(self, router, key=None):
+        session = await router.open_session(key)
+        try:
+            return (await session.execute(text("SELECT name FROM source"))).scalar()
+        finally:
+            await session.close()
+
+    async def test_round_robin(self):
+        router = self._router("replica_a", "replica_b")
+
+        sources = [await self._source(router) for _ in range(4)]
+
+        self.assertEqual(sources, ["replica_a", "replica_b"] * 2)
+
+    async def test_no_replicas_uses_primary(self):
+        router = self._router()
+
+        self.assertEqual(await self._source(router), "primary")
+
+    @patch("app.db.replicas.logger.warning")
+    async def test_failover_skips_broken_replica(self, mock_warning):
+        router = self._router("broken", "replica_a")
+
+        sources = [await self._source(router) for _ in range(3)]
+
+        # The broken replica is tried once, then skipped until retry_after
+        self.assertEqual(sources, ["replica_a"] * 3)
+        mock_warning.assert_called_once()
+
+    @patch("app.db.replicas.logger.warning")
+    async def test_failover_to_primary(self, mock_warning):
+        router = self._router("broken")
+
+        self.assertEqual(await self._source(router), "primary")
+
+    async def test_read_your_writes(self):
+        router = self._router("replica_a")
+
+        router.mark_write("writer@example.com")
+
+        self.assertEqual(await self._source(router, "writer@example.com"), "primary")
+        self.assertEqual(await self._source(router, "other@example.com"), "replica_a")
+        self.assertEqual(await self._source(router), "replica_a")
+
+    async def test_primary_requested(self):
+        router = self._router("replica_a")
+
+        session = await router.open_session(primary=True)
+        try:
+            source = (await session.execute(text("SELECT name FROM source"))).scalar()
+        finally:
+            await session.close()
+
+        self.assertEqual(source, "primary")
+
+    async def test_read_your_writes_window_expires(self):
+        router = self._router("replica_a", window=0)
+
+        router.mark_write("writer@example.com")
+
+        self.assertFalse(router.wrote_recently("writer@example.com"))
+        self.assertEqual(await self._source(router, "writer@example.com"), "replica_a")
@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.returning import update_returning, delete_returning, delete_returning_all
+
+metadata = MetaData()
+items = Table(
+    "items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String),
+)
+
+
+class TestReturning(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        metadata.create_all(self.engine)
+        with self.engine.begin() as connection:
+            connection.execute(
+                items.insert(), [{"id": 1, "name": "one"}, {"id": 3, "name": "three"}]
+            )
+
+        # Count every statement sent to the database
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+        self.session = Session(self.engine)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_update_returning_single_statement(self):
+        row = update_returning(self.session, items, items.c.id == 1, {"name": "uno"})
+
+        self.assertEqual(row._mapping, {"id": 1, "name": "uno"})
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn("RETURNING", self.statements[0])
+
+    def test_update_returning_no_match(self):
+        row = update_returning(self.session, items, items.c.id == 2, {"name": "dos"})
+
+        self.assertIsNone(row)
+        self.assertEqual(len(self.statements), 1)
+
+    def test_delete_returning_single_statement(self):
+        row = delete_returning(self.session, items, items.c.id == 1)
+
+        self.assertEqual(row._mapping, {"id": 1, "name": "one"})
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn("RETURNING", self.statements[0])
+
+    def test_delete_returning_no_match(self):
+        self.assertIsNone(delete_returning(self.session, items, items.c.id == 2))
+
+    def test_update_emulated_without_returning(self):
+        with patch.object(self.engine.dialect, "update_returning", False):
+            row = update_returning(
+                self.session, items, items.c.id == 1, {"name": "uno"}
+            )
+            missing = update_returning(
+                self.session, items, items.c.id == 2, {"name": "dos"}
+            )
+
+        self.assertEqual(row._mapping, {"id": 1, "name": "uno"})
+        self.assertIsNone(missing)
+        self.assertNotIn("RETURNING", " ".join(self.statements))
+
+    def test_delete_emulated_without_returning(self):
+        with patch.object(self.engine.dialect, "delete_returning", False):
+            row = delete_returning(self.session, items, items.c.id == 1)
+            missing = delete_returning(self.session, items, items.c.id == 1)
+
+        self.assertEqual(row._mapping, {"id": 1, "name": "one"})
+        self.assertIsNone(missing)
+        self.assertNotIn("RETURNING", " ".join(self.statements))
+
+    def test_delete_returning_all(self):
+        rows = delete_returning_all(self.session, items, items.c.id.in_([1, 2, 3]))
+
+        self.assertEqual(sorted(row.id for row in rows), [1, 3])
+        self.assertEqual(len(self.statements), 1)
+
+    def test_delete_all_emulated_without_returning(self):
+        with patch.object(self.engine.dialect, "delete_returning", False):
+            rows = delete_returning_all(self.session, items, items.c.id.in_([1, 3]))
+
+        self.assertEqual(sorted(row.id for row in rows), [1, 3])
+        self.assertEqual(len(self.statements), 2)
@@ -0,0 +1,176 @@
+import io
+import unittest
+import uuid
+from contextlib import redirect_stdout
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db.models import Todo, UserTodoStats
+from app.db.stats import add_todo_stats, rebuild_todo_stats, todo_stats_deltas
+from app.db.stats.__main__ import main
+from app.schemas.todo import TodoBulkUpdateItem, TodoInput
+from tests.unit.repositories.base import MigratedDatabaseTestCase
+
+
+class TestTodoStatsDeltas(unittest.TestCase):
+
+    def test_deltas(self):
+        # Arrange
+        user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+
+        # Act
+        deltas = todo_stats_deltas(
+            added=[(user_id, True), (user_id, False), (other_user_id, True)],
+            removed=[(user_id, False), (other_user_id, None)],
+        )
+
+        # Assert: an update nets out to the change of completed
+        self.assertEqual(deltas, {user_id: (1, 1), other_user_id: (0, 1)})
+
+    def test_postgresql_upsert(self):
+        # Arrange
+        session = MagicMock(spec=Session)
+        session.get_bind.return_value.dialect.name = "postgresql"
+
+        # Act
+        add_todo_stats(session, {uuid.uuid4(): (1, 0), uuid.uuid4(): (0, 0)})
+
+        # Assert: users whose counters do not change are skipped
+        statement, params = session.execute.call_args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (user_id) DO UPDATE", sql)
+        self.assertIn("user_todo_stats.total + excluded.total", sql)
+        self.assertEqual(len(params), 1)
+
+    def test_no_changes_skip_the_upsert(self):
+        session = MagicMock(spec=Session)
+
+        add_todo_stats(session, {uuid.uuid4(): (0, 0)})
+
+        session.execute.assert_not_called()
+
+
+class TestTodoStats(MigratedDatabaseTestCase):
+    """
+    Maintain the per-user todo counters on SQLite with the schema of the
+    migrations.
+    """
+
+    def _stats(self, user_id=None):
+        self.session.expire_all()
+        stats = self.session.get(UserTodoStats, user_id or self.user_id)
+        return (stats.total, stats.completed) if stats else None
+
+    def _input(self, title, completed=False):
+        return TodoInput(title=title, completed=completed, user_id=self.user_id)
+
+    def test_single_writes(self):
+        # Act / Assert
+        todo = self.repository.create(self._input("Watch a movie"))
+        self.repository.create(self._input("Read a book", completed=True))
+        self.assertEqual(self._stats(), (2, 1))
+
+        self.repository.update(todo.id, self._input("Watch a movie", True))
+        self.assertEqual(self._stats(), (2, 2))
+
+        # Renaming without changing completed leaves the counters alone
+        self.repository.update(todo.id, self._input("Watch two movies", True))
+        self.assertEqual(self._stats(), (2, 2))
+
+        self.repository.delete(todo.id)
+        self.assertEqual(self._stats(), (1, 1))
+
+    def test_missing_todos_leave_counters_alone(self):
+        # Arrange
+        self.repository.create(self._input("Watch a movie"))
+
+        # Act
+        self.assertIsNone(self.repository.update(uuid.uuid4(), self._input("New")))
+        self.assertIsNone(self.repository.delete(uuid.uuid4()))
+
+        # Assert
+        self.assertEqual(self._stats(), (1, 0))
+
+    def test_bulk_writes(self):
+        # Arrange
+        other_user_id = uuid.uuid4()
+        todos = self.repository.create_many(
+            [
+                self._input("Watch a movie"),
+                self._input("Read a book", completed=True),
+                TodoInput(title="Cook", user_id=other_user_id),
+            ]
+        )
+        self.assertEqual(self._stats(), (2, 1))
+        self.assertEqual(self._stats(other_user_id), (1, 0))
+
+        # Act / Assert
+        self.repository.update_many(
+            [
+                TodoBulkUpdateItem(id=todos[0].id, completed=True),
+                TodoBulkUpdateItem(id=todos[1].id, completed=False),
+                TodoBulkUpdateItem(id=todos[2].id, completed=True),
+                TodoBulkUpdateItem(id=uuid.uuid4(), completed=True),
+            ]
+        )
+        self.assertEqual(self._stats(), (2, 1))
+        self.assertEqual(self._stats(other_user_id), (1, 1))
+
+        self.repository.delete_many([todos[0].id, todos[2].id, uuid.uuid4()])
+        self.assertEqual(self._stats(), (1, 0))
+        self.assertEqual(self._stats(other_user_id), (0, 0))
+
+    def test_archived_todos_still_count(self):
+        # Arrange
+        todo = self.repository.create(self._input("Watch a movie", completed=True))
+        self.session.execute(
+            update(Todo)
+            .where(Todo.id == todo.id)
+            .values(updated_at=datetime(2025, 1, 1))
+        )
+        self.session.commit()
+
+        # Act
+        moved = self.repository.archive_completed(datetime(2025, 5, 1), 10)
+
+        # Assert
+        self.assertEqual(moved, 1)
+        self.assertEqual(self._stats(), (1, 1))
+
+    def test_rebuild(self):
+        # Arrange: counters that drifted from the todos
+        todo = self.repository.create(self._input("Watch a movie", completed=True))
+        self.repository.create(self._input("Read a book"))
+        self.repository.archive_completed(todo.updated_at.replace(year=3000), 10)
+        stale_user_id = uuid.uuid4()
+        add_todo_stats(self.session, {self.user_id: (5, -3), stale_user_id: (2, 0)})
+        self.session.commit()
+
+        # Act
+        with self.engine.begin() as connection:
+            users = rebuild_todo_stats(connection)
+
+        # Assert
+        self.assertEqual(users, 1)
+        self.assertEqual(self._stats(), (2, 1))
+        self.assertIsNone(self._stats(stale_user_id))
+
+    def test_cli(self):
+        # Arrange
+        self.repository.create(self._input("Watch a movie"))
+        add_todo_stats(self.session, {self.user_id: (1, 1)})
+        self.session.commit()
+        output = io.StringIO()
+
+        # Act
+        with patch("app.db.stats.__main__.engine", self.engine):
+            with redirect_stdout(output):
+                main(["rebuild"])
+
+        # Assert
+        self.assertEqual(output.getvalue(), "Rebuilt todo counters of 1 users\n")
+        self.assertEqual(self._stats(), (1, 0))
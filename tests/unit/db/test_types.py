@@ -0,0 +1,68 @@
+import unittest
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+
+from app.db.types import GUID
+
+
+class TestGUID(unittest.TestCase):
+
+    def setUp(self):
+        self.table = Table("items", MetaData(), Column("id", GUID(), primary_key=True))
+
+    def test_sqlite_stores_16_byte_blob(self):
+        # Arrange
+        engine = create_engine("sqlite://")
+        self.table.create(engine)
+        value = uuid.uuid4()
+
+        with engine.begin() as connection:
+            # Act
+            connection.execute(self.table.insert(), [{"id": value}])
+            stored = connection.exec_driver_sql(
+                "SELECT typeof(id), length(id) FROM items"
+            ).one()
+            # Strings are accepted when binding
+            loaded = connection.execute(
+                select(self.table.c.id).where(self.table.c.id == str(value))
+            ).scalar_one()
+
+        # Assert
+        self.assertEqual(stored, ("blob", 16))
+        self.assertEqual(loaded, value)
+        self.assertIsInstance(loaded, uuid.UUID)
+        engine.dispose()
+
+    def test_ddl(self):
+        self.assertIn(
+            "id BLOB", str(CreateTable(self.table).compile(dialect=sqlite.dialect()))
+        )
+        self.assertIn(
+            "id UUID",
+            str(CreateTable(self.table).compile(dialect=postgresql.dialect())),
+        )
+
+    def test_postgresql_passes_uuids_through(self):
+        guid = GUID()
+        dialect = postgresql.dialect()
+        value = uuid.uuid4()
+
+        self.assertIs(guid.process_bind_param(value, dialect), value)
+        self.assertIs(guid.process_result_value(value, dialect), value)
+        self.assertEqual(guid.process_literal_param(value, dialect), f"'{value}'")
+
+    def test_none_and_literals(self):
+        guid = GUID()
+        dialect = sqlite.dialect()
+        value = uuid.UUID("0190f0ad-8e5e-7c3a-8b1e-0123456789ab")
+
+        self.assertIsNone(guid.process_bind_param(None, dialect))
+        self.assertIsNone(guid.process_result_value(None, dialect))
+        self.assertEqual(
+            guid.process_literal_param(value, dialect),
+            "X'0190f0ad8e5e7c3a8b1e0123456789ab'",
+        )
+        self.assertIs(guid.python_type, uuid.UUID)
@@ -14,8 +14,8 @@ class TestDatabaseOperations(unittest.TestCase):
 
     def test_create_tables(self):
         """Test that tables are created successfully."""
-        # Drop all tables first to ensure a clean state
-        Base.metadata.drop_all(bind=self.engine)
+        # Drop all tables and the schema version first to ensure a clean state
+        drop_tables()
 
         # Call the function to create tables
         create_tables()
@@ -46,4 +46,4 @@ class TestDatabaseOperations(unittest.TestCase):
 
     def tearDown(self):
         """Clean up the test environment."""
-        Base.metadata.drop_all(bind=self.engine)
+        drop_tables()
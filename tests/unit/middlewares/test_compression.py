@@ -0,0 +1,180 @@
+import gzip
+import zlib
+import unittest
+from unittest.mock import patch, MagicMock
+
+from fastapi import FastAPI, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middlewares.compression import (
+    CompressionMiddleware,
+    add_compression_middleware,
+    select_encoding,
+)
+
+BODY = "todo " * 400
+
+
+def build_app(**options):
+    app = FastAPI()
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("todo")
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(
+            gzip.compress(BODY.encode()), headers={"Content-Encoding": "gzip"}
+        )
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100, **options)
+    return app
+
+
+class TestSelectEncoding(unittest.TestCase):
+
+    def test_select_encoding(self):
+        cases = {
+            "": None,
+            "identity": None,
+            "gzip": "gzip",
+            "deflate": "deflate",
+            "deflate, gzip": "gzip",
+            "gzip;q=0.5, deflate": "deflate",
+            "gzip;q=0, *": "deflate",
+            "GZIP; q=1.0": "gzip",
+            "gzip;q=x, deflate;q=0.1": "deflate",
+        }
+        for accept_encoding, encoding in cases.items():
+            with self.subTest(accept_encoding=accept_encoding):
+                self.assertEqual(select_encoding(accept_encoding), encoding)
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(build_app())
+
+    def _get(self, path, accept_encoding="gzip", client=None):
+        # Read the raw body, the way it went over the wire
+        with (client or self.client).stream(
+            "GET", path, headers={"Accept-Encoding": accept_encoding}
+        ) as response:
+            return response, b"".join(response.iter_raw())
+
+    def test_gzip(self):
+        # Act
+        response, body = self._get("/text")
+
+        # Assert
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["content-length"], str(len(body)))
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body).decode(), BODY)
+
+    def test_deflate(self):
+        # Act
+        response, body = self._get("/text", "deflate")
+
+        # Assert
+        self.assertEqual(response.headers["content-encoding"], "deflate")
+        self.assertEqual(zlib.decompress(body).decode(), BODY)
+
+    def test_not_accepted(self):
+        # Act
+        response, body = self._get("/text", "identity")
+
+        # Assert: still varies with the header
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(body.decode(), BODY)
+
+    def test_skipped_bodies(self):
+        for path in ("/small", "/encoded", "/image", "/stream"):
+            with self.subTest(path=path):
+                # Arrange
+                expected, expected_body = self._get(path, "")
+
+                # Act
+                response, body = self._get(path)
+
+                # Assert
+                self.assertNotIn("vary", response.headers)
+                self.assertEqual(
+                    response.headers.get("content-encoding"),
+                    expected.headers.get("content-encoding"),
+                )
+                self.assertEqual(body, expected_body)
+
+    def test_cached_paths(self):
+        # Arrange
+        client = TestClient(build_app(level=9, cached_paths=["/text"]))
+
+        with patch(
+            "app.middlewares.compression.COMPRESSORS",
+            {"gzip": MagicMock(return_value=b"compressed")},
+        ) as compressors:
+            # Act
+            bodies = [self._get("/text", client=client)[1] for _ in range(3)]
+
+        # Assert: compressed once
+        self.assertEqual(bodies, [b"compressed"] * 3)
+        compressors["gzip"].assert_called_once_with(BODY.encode(), 9)
+
+    def test_cache_follows_body(self):
+        # Arrange
+        middleware = CompressionMiddleware(MagicMock(), cached_paths=["/openapi.json"])
+
+        # Act
+        first = middleware.compress("/openapi.json", b"first", "gzip")
+        second = middleware.compress("/openapi.json", b"second", "gzip")
+
+        # Assert
+        self.assertEqual(gzip.decompress(first), b"first")
+        self.assertEqual(gzip.decompress(second), b"second")
+
+
+class TestAddCompressionMiddleware(unittest.TestCase):
+
+    @patch("app.middlewares.compression.settings.COMPRESSION_LEVEL", 5)
+    @patch("app.middlewares.compression.settings.COMPRESSION_MINIMUM_SIZE", 2048)
+    def test_add_compression_middleware(self):
+        # Arrange
+        mock_app = MagicMock(spec=FastAPI)
+        mock_app.openapi_url = "/openapi.json"
+
+        # Act
+        add_compression_middleware(mock_app)
+
+        # Assert
+        mock_app.add_middleware.assert_called_once_with(
+            CompressionMiddleware,
+            level=5,
+            minimum_size=2048,
+            cached_paths=["/openapi.json"],
+        )
+
+    @patch("app.middlewares.compression.settings.COMPRESSION_LEVEL", 0)
+    def test_disabled(self):
+        # Arrange
+        mock_app = MagicMock(spec=FastAPI)
+
+        # Act
+        add_compression_middleware(mock_app)
+
+        # Assert
+        mock_app.add_middleware.assert_not_called()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import uuid
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+
+from app.db.migrations import upgrade
+from app.repositories.todo_repository import TodoRepository
+
+
+class MigratedDatabaseTestCase(unittest.TestCase):
+    """
+    Test case on an in-memory SQLite database with the schema of the
+    migrations, with a session and a TodoRepository on it.
+
+    Every query sent to the database, EXPLAINs aside, is captured with its
+    parameters in self.statements, for _plan to explain.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        # Build the schema as deployed, indexes in migration order
+        upgrade(self.engine)
+        self.session = Session(self.engine, expire_on_commit=False)
+        self.repository = TodoRepository(self.session)
+        self.user_id = uuid.uuid4()
+
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._capture)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _capture(self, conn, cursor, statement, parameters, *args):
+        if not statement.startswith("EXPLAIN"):
+            self.statements.append((statement, parameters))
+
+    def _plan(self, statement=None, parameters=None):
+        """
+        EXPLAIN QUERY PLAN of a statement, by default the last one captured.
+        """
+        if statement is None:
+            statement, parameters = self.statements[-1]
+        with self.engine.connect() as connection:
+            rows = connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).all()
+        return " | ".join(row[-1] for row in rows)
+
+
+class MigratedDatabaseFileTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Test case on a temporary SQLite file with the schema of the migrations,
+    opened by both the sync and the async driver.
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tempdir.name, "test.db")
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        upgrade(self.engine)
+
+    async def asyncTearDown(self):
+        await self.async_engine.dispose()
+        self.engine.dispose()
+        self.tempdir.cleanup()
@@ -0,0 +1,119 @@
+from datetime import datetime
+
+from app.db.models import Todo, TodoArchive, UserTodoStats
+from app.schemas.todo import TodoBulkUpdateItem, TodoInput
+from app.services.todo_service import TodoService
+from tests.unit.repositories.base import MigratedDatabaseTestCase
+
+
+class TestArchive(MigratedDatabaseTestCase):
+    """
+    Archive completed todos on SQLite with the schema of the migrations.
+    """
+
+    def _add(self, title, completed, updated_at):
+        todo = Todo(
+            user_id=self.user_id,
+            title=title,
+            completed=completed,
+            updated_at=updated_at,
+        )
+        self.session.add(todo)
+        self.session.commit()
+        return todo
+
+    def test_moves_old_completed_todos_in_batches(self):
+        # Arrange
+        old = [self._add(f"Old {i}", True, datetime(2025, 1, 1 + i)) for i in range(3)]
+        recent = self._add("Recent", True, datetime(2025, 6, 1))
+        still_open = self._add("Open", False, datetime(2025, 1, 1))
+
+        # Act: two todos per transaction, the oldest first
+        moved = [self.repository.archive_completed(datetime(2025, 5, 1), 2)]
+        first_batch = {todo.id for todo in self.session.query(TodoArchive.id)}
+        moved.append(self.repository.archive_completed(datetime(2025, 5, 1), 2))
+        moved.append(self.repository.archive_completed(datetime(2025, 5, 1), 2))
+
+        # Assert
+        self.assertEqual(moved, [2, 1, 0])
+        self.assertEqual(first_batch, {old[0].id, old[1].id})
+        self.session.expunge_all()
+        self.assertEqual(
+            {todo.id for todo in self.session.query(Todo)},
+            {recent.id, still_open.id},
+        )
+        archived = {todo.id: todo for todo in self.session.query(TodoArchive)}
+        self.assertEqual(set(archived), {todo.id for todo in old})
+        self.assertEqual(archived[old[0].id].title, "Old 0")
+        self.assertEqual(archived[old[0].id].updated_at, datetime(2025, 1, 1))
+        self.assertIsNotNone(archived[old[0].id].archived_at)
+
+    def test_finds_candidates_through_partial_index(self):
+        # Act
+        self.repository.archive_completed(datetime(2025, 5, 1), 100)
+
+        # Assert
+        statement, parameters = next(
+            (statement, parameters)
+            for statement, parameters in self.statements
+            if statement.startswith("DELETE")
+        )
+        with self.engine.connect() as connection:
+            plan = " | ".join(
+                row[-1]
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            )
+        self.assertIn("USING INDEX ix_todos_completed_updated_at", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_archived_todos_are_still_readable(self):
+        # Arrange
+        todo = self._add("Done long ago", True, datetime(2025, 1, 1))
+        service = TodoService(self.session)
+
+        # Act
+        archived = service.archive_completed(older_than_days=30, batch_size=10)
+
+        # Assert
+        self.assertEqual(archived, 1)
+        self.session.expunge_all()
+        self.assertIsNone(self.repository.get_by_id(todo.id))
+        self.assertEqual(service.get_by_id(todo.id).title, "Done long ago")
+        # Archived todos leave the search index with the hot table
+        self.assertEqual(self.repository.search(self.user_id, ["done"]), [])
+
+    def test_writes_restore_archived_todos(self):
+        # Arrange
+        todos = [self._add(f"Done {i}", True, datetime(2025, 1, 1)) for i in range(4)]
+        self.session.add(UserTodoStats(user_id=self.user_id, total=4, completed=4))
+        self.session.commit()
+        service = TodoService(self.session)
+        service.archive_completed(older_than_days=30, batch_size=10)
+        self.session.expunge_all()
+
+        # Act
+        updated = service.update(
+            todos[0].id,
+            TodoInput(title="Not done", completed=False, user_id=self.user_id),
+        )
+        deleted = service.delete(todos[1].id)
+        bulk_updated = service.update_many(
+            [TodoBulkUpdateItem(id=todos[2].id, completed=False)]
+        )
+        bulk_deleted = service.delete_many([todos[3].id])
+
+        # Assert
+        self.assertFalse(updated.completed)
+        self.assertEqual(deleted.title, "Done 1")
+        self.assertEqual(bulk_updated[0].status_code, 200)
+        self.assertEqual(bulk_deleted[0].status_code, 200)
+        self.session.expunge_all()
+        self.assertEqual(self.session.query(TodoArchive).count(), 0)
+        self.assertEqual(
+            {(todo.title, todo.completed) for todo in self.session.query(Todo)},
+            {("Not done", False), ("Done 2", False)},
+        )
+        stats = self.session.get(UserTodoStats, self.user_id)
+        self.assertEqual((stats.total, stats.completed), (2, 0))
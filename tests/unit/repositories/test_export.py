@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import Todo
+from app.repositories.todo_repository import TodoRepository, AsyncTodoRepository
+from app.schemas.todo import TodoFileFormat
+from app.services.todo_service import TodoService, AsyncTodoService
+from tests.unit.repositories.base import MigratedDatabaseFileTestCase
+
+
+class TestExport(MigratedDatabaseFileTestCase):
+    """
+    Stream todos off a cursor on SQLite with the schema of the migrations,
+    through both the sync and the async driver.
+    """
+
+    def setUp(self):
+        super().setUp()
+        user_id = uuid.uuid4()
+        with Session(self.engine) as session:
+            session.add_all(
+                Todo(user_id=user_id, title=f"Todo, {i}", completed=bool(i % 2))
+                for i in range(5)
+            )
+            session.commit()
+        with Session(self.engine) as session:
+            self.todos = TodoService(session).get_all(page_size=10).todos
+
+    def test_stream_all_in_batches(self):
+        with Session(self.engine) as session:
+            batches = list(TodoRepository(session).stream_all(batch_size=2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            [row.id for batch in batches for row in batch],
+            [todo.id for todo in self.todos],
+        )
+
+    async def test_async_stream_all_in_batches(self):
+        async with AsyncSession(self.async_engine) as session:
+            batches = [
+                batch
+                async for batch in AsyncTodoRepository(session).stream_all(batch_size=2)
+            ]
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            [row.id for batch in batches for row in batch],
+            [todo.id for todo in self.todos],
+        )
+
+    def test_export_ndjson(self):
+        with Session(self.engine) as session:
+            chunks = list(TodoService(session).export(TodoFileFormat.NDJSON, 2))
+
+        # An empty header, then one chunk per batch
+        self.assertEqual(len(chunks), 4)
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [todo.model_dump(mode="json") for todo in self.todos],
+        )
+
+    async def test_async_export_csv(self):
+        async with AsyncSession(self.async_engine) as session:
+            chunks = [
+                chunk
+                async for chunk in AsyncTodoService(session).export(
+                    TodoFileFormat.CSV, 2
+                )
+            ]
+
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(
+            chunks[0], b"id,user_id,title,completed,created_at,updated_at\r\n"
+        )
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(
+            rows,
+            [
+                {key: str(value) for key, value in todo.model_dump(mode="json").items()}
+                for todo in self.todos
+            ],
+        )
@@ -0,0 +1,126 @@
+import uuid
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import User, UserTodoStats
+from app.schemas.todo import TodoFileFormat
+from app.services.todo_service import TodoService, AsyncTodoService
+from tests.unit.repositories.base import MigratedDatabaseFileTestCase
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestImport(MigratedDatabaseFileTestCase):
+    """
+    Import uploads through the async driver on SQLite with the schema of the
+    migrations.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_id = uuid.uuid4()
+        with Session(self.engine) as session:
+            session.add(
+                User(
+                    id=self.user_id,
+                    email="importer@example.com",
+                    username="importer",
+                    hashed_password="hashed",
+                )
+            )
+            session.commit()
+
+    async def _import(self, import_format, *chunks, batch_size=2):
+        async with AsyncSession(self.async_engine) as session:
+            return await AsyncTodoService(session).import_todos(
+                self.user_id, stream(*chunks), import_format, batch_size=batch_size
+            )
+
+    def _todos(self):
+        with Session(self.engine) as session:
+            stats = session.get(UserTodoStats, self.user_id)
+            todos = TodoService(session).get_all_for_user(self.user_id, 100).todos
+        todos = [(todo.title, todo.completed) for todo in todos]
+        return todos, (stats.total, stats.completed)
+
+    async def test_import_ndjson(self):
+        # Act: records split across chunks, in batches of two
+        result = await self._import(
+            TodoFileFormat.NDJSON,
+            b'{"title": "Watch a movie"}\n{"title": "Read',
+            b' a book", "completed": true}\n\n{"completed": true}\nnot json\n',
+            b'{"title": "Cook", "id": "ignored"}',
+        )
+
+        # Assert
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(result.failed, 2)
+        self.assertEqual([error.line for error in result.errors], [4, 5])
+        self.assertEqual(result.errors[0].detail, "title: Field required")
+        self.assertTrue(result.errors[1].detail.startswith("Invalid JSON"))
+        self.assertEqual(
+            self._todos(),
+            (
+                [("Watch a movie", False), ("Read a book", True), ("Cook", False)],
+                (3, 1),
+            ),
+        )
+
+    async def test_import_csv(self):
+        # Act
+        result = await self._import(
+            TodoFileFormat.CSV,
+            b'title,completed\r\n"Buy milk, eggs",True\r\nCook\r\n',
+            b'"Two\nlines",false\r\nCall mum,maybe\r\n',
+        )
+
+        # Assert
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(result.failed, 2)
+        self.assertEqual(result.errors[0].line, 3)
+        self.assertEqual(result.errors[0].detail, "Expected 2 fields, got 1")
+        self.assertEqual(result.errors[1].line, 6)
+        self.assertTrue(result.errors[1].detail.startswith("completed: Input should"))
+        self.assertEqual(
+            self._todos(),
+            ([("Buy milk, eggs", True), ("Two\nlines", False)], (2, 1)),
+        )
+
+    async def test_export_round_trip(self):
+        # Arrange
+        await self._import(
+            TodoFileFormat.NDJSON,
+            b'{"title": "Watch a movie"}\n{"title": "Read", "completed": true}\n',
+        )
+        exports = {}
+        async with AsyncSession(self.async_engine) as session:
+            for export_format in TodoFileFormat:
+                exports[export_format] = [
+                    chunk
+                    async for chunk in AsyncTodoService(session).export(export_format)
+                ]
+
+        for export_format, chunks in exports.items():
+            with self.subTest(export_format=export_format):
+                # Act
+                result = await self._import(export_format, *chunks)
+
+                # Assert
+                self.assertEqual((result.imported, result.failed), (2, 0))
+        todos, stats = self._todos()
+        self.assertEqual(todos, [("Watch a movie", False), ("Read", True)] * 3)
+        self.assertEqual(stats, (6, 3))
+
+    @patch("app.services.todo_service.settings.TODO_IMPORT_MAX_ERRORS", 3)
+    async def test_errors_are_capped(self):
+        # Act
+        result = await self._import(TodoFileFormat.NDJSON, b"{}\n" * 5)
+
+        # Assert
+        self.assertEqual((result.imported, result.failed), (0, 5))
+        self.assertEqual([error.line for error in result.errors], [1, 2, 3])
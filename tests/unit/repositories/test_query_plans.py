@@ -0,0 +1,56 @@
+import uuid
+from datetime import datetime
+
+from app.repositories.todo_repository import TodoRepository
+from app.repositories.user_repository import UserRepository
+from tests.unit.repositories.base import MigratedDatabaseTestCase
+
+
+class TestQueryPlans(MigratedDatabaseTestCase):
+    """
+    Run the repository queries against SQLite and check with EXPLAIN QUERY
+    PLAN that they are served by an index instead of a table scan.
+    """
+
+    def test_todos_by_user(self):
+        TodoRepository(self.session).get_all_by_user(self.user_id)
+
+        plan = self._plan()
+        self.assertIn("USING INDEX ix_todos_user_id_created_at_id", plan)
+        self.assertNotIn("SCAN", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_todos_by_user_and_completed_in_range(self):
+        TodoRepository(self.session).get_all_by_user(
+            self.user_id,
+            completed=False,
+            created_from=datetime(2025, 1, 1),
+            created_to=datetime(2026, 1, 1),
+            after=(datetime(2025, 6, 1), uuid.uuid4()),
+        )
+
+        plan = self._plan()
+        self.assertIn("USING INDEX ix_todos_user_id_completed_created_at_id", plan)
+        self.assertIn("created_at>? AND created_at<?", plan)
+        self.assertNotIn("SCAN", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_todos_keyset_page(self):
+        TodoRepository(self.session).get_all(
+            after=(datetime(2025, 6, 1), uuid.uuid4()), limit=16
+        )
+
+        plan = self._plan()
+        self.assertIn("USING INDEX ix_todos_created_at_id", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_active_user_by_email(self):
+        UserRepository(self.session).get_user_by_email("test@example.com")
+
+        statement, _ = self.statements[-1]
+        self.assertIn("users.is_active = 1", statement)
+
+        # The unique email index finds the one row, is_active is checked on it
+        plan = self._plan()
+        self.assertIn("USING INDEX ix_users_email (email=?)", plan)
+        self.assertNotIn("SCAN", plan)
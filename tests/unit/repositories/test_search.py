@@ -0,0 +1,107 @@
+import unittest
+import uuid
+
+from app.db.search import search_terms, fts5_query, tsquery
+from app.schemas.todo import TodoBulkUpdateItem, TodoInput
+from tests.unit.repositories.base import MigratedDatabaseTestCase
+
+
+class TestSearchTerms(unittest.TestCase):
+
+    def test_search_terms(self):
+        self.assertEqual(search_terms("Buy MILK"), ["buy", "milk"])
+        # Query syntax is dropped rather than interpreted
+        self.assertEqual(
+            search_terms('"milk" OR title:eggs* -(bread)_'),
+            ["milk", "or", "title", "eggs", "bread"],
+        )
+        self.assertEqual(search_terms("Café 2025"), ["café", "2025"])
+        self.assertEqual(search_terms("?!"), [])
+
+    def test_queries(self):
+        self.assertEqual(fts5_query(["buy", "milk"]), '"buy" "milk"')
+        self.assertEqual(tsquery(["buy", "milk"]), "buy & milk")
+
+
+class TestSqliteSearch(MigratedDatabaseTestCase):
+    """
+    Search against SQLite with the FTS5 index and triggers of the migrations.
+    """
+
+    def _create(self, title, user_id=None):
+        return self.repository.create(
+            TodoInput(title=title, user_id=user_id or self.user_id)
+        )
+
+    def _titles(self, q, **kwargs):
+        # Updates go through Core, so don't read titles from the identity map
+        self.session.expunge_all()
+        todos = self.repository.search(self.user_id, search_terms(q), **kwargs)
+        return [todo.title for todo in todos]
+
+    def test_matches_every_word_ranked(self):
+        # Arrange
+        self._create("Buy milk")
+        self._create("Buy milk, milk and more milk")
+        self._create("Buy bread")
+        self._create("Call mom")
+
+        # Act & Assert
+        self.assertEqual(
+            self._titles("milk"), ["Buy milk, milk and more milk", "Buy milk"]
+        )
+        self.assertEqual(self._titles("buy BREAD"), ["Buy bread"])
+        self.assertEqual(self._titles("mom milk"), [])
+
+    def test_scoped_to_user(self):
+        self._create("Buy milk", user_id=uuid.uuid4())
+
+        self.assertEqual(self._titles("milk"), [])
+
+    def test_paginated(self):
+        for i in range(5):
+            self._create(f"Report {i}")
+
+        first = self._titles("report", offset=0, limit=3)
+        second = self._titles("report", offset=3, limit=3)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(sorted(first + second), [f"Report {i}" for i in range(5)])
+
+    def test_index_follows_writes(self):
+        # Arrange
+        todo = self._create("Buy milk")
+        others = self.repository.create_many(
+            [
+                TodoInput(title="Walk the dog", user_id=self.user_id),
+                TodoInput(title="Feed the dog", user_id=self.user_id),
+            ]
+        )
+
+        # Act & Assert: update
+        self.repository.update(todo.id, TodoInput(title="Buy eggs"))
+        self.assertEqual(self._titles("milk"), [])
+        self.assertEqual(self._titles("eggs"), ["Buy eggs"])
+
+        # Bulk update and delete
+        self.repository.update_many(
+            [TodoBulkUpdateItem(id=others[0].id, title="Walk the cat")]
+        )
+        self.repository.delete_many([others[1].id])
+        self.assertEqual(self._titles("dog"), [])
+        self.assertEqual(self._titles("cat"), ["Walk the cat"])
+
+        # Delete
+        self.repository.delete(todo.id)
+        self.assertEqual(self._titles("eggs"), [])
+
+    def test_uses_fts_index(self):
+        # Act
+        self._titles("milk")
+
+        # Assert
+        plan = self._plan()
+        # Matches come off the FTS5 index and are joined to todos by rowid
+        self.assertIn("todos_fts VIRTUAL TABLE INDEX", plan)
+        self.assertIn("SEARCH todos USING INTEGER PRIMARY KEY (rowid=?)", plan)
@@ -1,15 +1,18 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from uuid import UUID
 from datetime import datetime
 from typing import List
 
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models import Todo
 from app.schemas.todo import TodoInput
 from app.repositories.todo_repository import (
     TodoRepository,
+    AsyncTodoRepository,
 )
 
 
@@ -46,7 +49,6 @@ class TestTodoRepository(unittest.TestCase):
         mock_todo_model.return_value = self.mock_db_item
         self.mock_session.add.return_value = None
         self.mock_session.commit.return_value = None
-        self.mock_session.refresh.return_value = None
 
         # Act
         result = self.todo_repository.create(todo_input)
@@ -55,7 +57,7 @@ class TestTodoRepository(unittest.TestCase):
         mock_todo_model.assert_called_once_with(**todo_input.model_dump())
         self.mock_session.add.assert_called_once_with(self.mock_db_item)
         self.mock_session.commit.assert_called_once()
-        self.mock_session.refresh.assert_called_once_with(self.mock_db_item)
+        self.mock_session.refresh.assert_not_called()
         self.assertIsInstance(result, Todo)
         self.assertEqual(result.id, self.mock_db_item.id)
         self.assertEqual(result.title, self.mock_db_item.title)
@@ -64,73 +66,143 @@ class TestTodoRepository(unittest.TestCase):
         self.assertEqual(result.updated_at, self.mock_db_item.updated_at)
         self.assertEqual(result.user_id, self.mock_db_item.user_id)
 
+    def _statement(self):
+        # The statement of the last query, compiled for SQLite
+        return self.mock_session.execute.call_args[0][0].compile(
+            dialect=sqlite.dialect()
+        )
+
     def test_get_all(self):
         # Arrange
-        page = 1
+        page = 2
         page_size = 15
-        mock_db_items = [
-            MagicMock(
-                spec=Todo,
-                id=self.todo_id,
-                title="Todo 1",
-                completed=False,
-                created_at=self.created_at,
-                updated_at=self.updated_at,
-                user_id=self.user_id,
-            ),
-            MagicMock(
-                spec=Todo,
-                id=UUID("123e4567-e89b-42d3-a456-556642440000"),
-                title="Todo 2",
-                completed=True,
-                created_at=self.created_at,
-                updated_at=self.updated_at,
-                user_id=self.user_id,
-            ),
-        ]
-
-        # Mock the counting query
-        mock_count_query = MagicMock()
-        mock_count_query.count.return_value = 2
-
-        # Mock the fetching query
-        mock_fetch_query = MagicMock()
-        mock_offset = MagicMock()
-        mock_limit = MagicMock()
-
-        # Set up the mock chain for offset, limit, and all
-        mock_fetch_query.offset.return_value = mock_offset
-        mock_offset.limit.return_value = mock_limit
-        mock_limit.all.return_value = mock_db_items
-
-        # Use side_effect to return different mocks for the two calls to query
-        self.mock_session.query.side_effect = [mock_count_query, mock_fetch_query]
-
-        # Act
-        total_count, result = self.todo_repository.get_all(
-            page=page, page_size=page_size
-        )
-
-        # Assert
-        # Verify the counting query
-        self.assertEqual(self.mock_session.query.call_count, 2)
-        mock_count_query.count.assert_called_once()
-
-        # Verify the fetching query
-        mock_fetch_query.offset.assert_called_once_with((page - 1) * page_size)
-        mock_offset.limit.assert_called_once_with(page_size)
-        mock_limit.all.assert_called_once()
-
-        self.assertEqual(total_count, 2)
-        self.assertIsInstance(result, List)
-        self.assertEqual(len(result), 2)
-        self.assertIsInstance(result[0], Todo)
-        self.assertEqual(result[0].id, mock_db_items[0].id)
-        self.assertEqual(result[0].title, mock_db_items[0].title)
-        self.assertEqual(result[0].completed, mock_db_items[0].completed)
-        self.assertEqual(result[0].created_at, mock_db_items[0].created_at)
-        self.assertEqual(result[0].updated_at, mock_db_items[0].updated_at)
-        self.assertEqual(result[0].user_id, mock_db_items[0].user_id)
+        mock_rows = [MagicMock(), MagicMock()]
+        self.mock_session.execute.return_value.all.return_value = mock_rows
+
+        # Act
+        result = self.todo_repository.get_all(page=page, page_size=page_size)
+
+        # Assert: plain column rows, no ORM entities
+        statement = self._statement()
+        self.assertTrue(
+            str(statement).startswith(
+                "SELECT todos.id, todos.user_id, todos.title, todos.completed, "
+                "todos.created_at, todos.updated_at \nFROM todos"
+            )
+        )
+        self.assertIn("ORDER BY todos.created_at, todos.id", str(statement))
+        self.assertEqual(list(statement.params.values()), [15, 15])
+        self.mock_session.query.assert_not_called()
+        self.assertEqual(result, mock_rows)
+
+    def test_get_all_after_cursor(self):
+        # Arrange
+        after = (self.created_at, self.todo_id)
+        self.mock_session.execute.return_value.all.return_value = [self.mock_db_item]
+
+        # Act
+        result = self.todo_repository.get_all(page_size=10, after=after, limit=11)
+
+        # Assert
+        # Keyset pages seek past the cursor instead of skipping rows
+        statement = self._statement()
+        self.assertIn("WHERE (todos.created_at, todos.id) > (?, ?)", str(statement))
+        self.assertIsNone(statement.statement._offset)
+        self.assertEqual(statement.statement._limit, 11)
+        self.assertEqual(result, [self.mock_db_item])
+
+    def test_get_all_columns(self):
+        # Act
+        self.todo_repository.get_all(page_size=10, columns=("id", "title"))
+
+        # Assert: only the requested columns are read
+        self.assertTrue(
+            str(self._statement()).startswith(
+                "SELECT todos.id, todos.title \nFROM todos"
+            )
+        )
+        self.assertIn("ORDER BY todos.created_at, todos.id", str(self._statement()))
+
+    def test_get_columns_by_id(self):
+        # Arrange
+        self.mock_session.execute.return_value.first.return_value = self.mock_db_item
+
+        # Act / Assert
+        for archived, table in [(False, "todos"), (True, "todos_archive")]:
+            with self.subTest(archived=archived):
+                result = self.todo_repository.get_columns_by_id(
+                    self.todo_id, ("title", "completed"), archived=archived
+                )
+
+                self.assertEqual(
+                    str(self._statement()),
+                    f"SELECT {table}.title, {table}.completed \nFROM {table} "
+                    f"\nWHERE {table}.id = ?",
+                )
+                self.assertEqual(result, self.mock_db_item)
+
+    def test_count(self):
+        # Arrange
+        self.mock_session.query.return_value.count.return_value = 42
+
+        # Act
+        result = self.todo_repository.count()
+
+        # Assert
+        self.mock_session.query.assert_called_once()
+        self.assertEqual(result, 42)
+
+    def test_estimate_count_postgresql(self):
+        # Arrange
+        self.mock_session.get_bind.return_value.dialect.name = "postgresql"
+        self.mock_session.execute.return_value.scalar.return_value = 1000
+
+        # Act
+        result = self.todo_repository.estimate_count()
+
+        # Assert
+        statement = self.mock_session.execute.call_args[0][0]
+        self.assertIn("pg_class", str(statement))
+        self.assertEqual(
+            self.mock_session.execute.call_args[0][1], {"table_name": "todos"}
+        )
+        self.assertEqual(result, 1000)
+
+    def test_estimate_count_not_analyzed(self):
+        # Arrange
+        self.mock_session.get_bind.return_value.dialect.name = "postgresql"
+        self.mock_session.execute.return_value.scalar.return_value = -1
+
+        # Act & Assert
+        self.assertIsNone(self.todo_repository.estimate_count())
+
+    def test_estimate_count_other_dialect(self):
+        # Arrange
+        self.mock_session.get_bind.return_value.dialect.name = "sqlite"
+
+        # Act & Assert
+        self.assertIsNone(self.todo_repository.estimate_count())
+        self.mock_session.execute.assert_not_called()
+
+    def test_search_postgresql(self):
+        # Arrange
+        self.mock_session.get_bind.return_value.dialect.name = "postgresql"
+        self.mock_session.execute.return_value.all.return_value = [self.mock_db_item]
+
+        # Act
+        result = self.todo_repository.search(
+            self.user_id, ["buy", "milk"], offset=30, limit=16
+        )
+
+        # Assert
+        statement = self.mock_session.execute.call_args[0][0]
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.assertIn("todos.search_vector @@ to_tsquery(", str(compiled))
+        self.assertIn("ORDER BY ts_rank(todos.search_vector", str(compiled))
+        self.assertIn("buy & milk", compiled.params.values())
+        self.assertEqual(compiled.params["param_1"], 16)
+        self.assertEqual(compiled.params["param_2"], 30)
+        self.assertEqual(result, [self.mock_db_item])
 
     def test_get_by_id(self):
         # Arrange
@@ -153,18 +225,21 @@ class TestTodoRepository(unittest.TestCase):
         self.assertEqual(result.updated_at, self.mock_db_item.updated_at)
         self.assertEqual(result.user_id, self.mock_db_item.user_id)
 
-    def test_delete(self):
+    @patch("app.repositories.todo_repository.delete_returning")
+    def test_delete(self, mock_delete_returning):
         # Arrange
-        self.mock_session.delete.return_value = None
-        self.mock_session.commit.return_value = None
+        mock_row = MagicMock()
+        mock_delete_returning.return_value = mock_row
 
         # Act
-        result = self.todo_repository.delete(self.mock_db_item)
+        result = self.todo_repository.delete(self.todo_id)
 
         # Assert
-        self.mock_session.delete.assert_called_once_with(self.mock_db_item)
+        mock_delete_returning.assert_called_once()
+        self.assertEqual(mock_delete_returning.call_args[0][0], self.mock_session)
+        self.assertEqual(mock_delete_returning.call_args[0][1].name, "todos")
         self.mock_session.commit.assert_called_once()
-        self.assertTrue(result)
+        self.assertEqual(result, mock_row)
 
     def test_exists_by_id(self):
         # Arrange
@@ -181,27 +256,211 @@ class TestTodoRepository(unittest.TestCase):
         )
         self.assertTrue(result)
 
-    def test_update(self):
+    @patch("app.repositories.todo_repository.add_todo_stats")
+    @patch("app.repositories.todo_repository.update_returning")
+    def test_update(self, mock_update_returning, mock_add_todo_stats):
         # Arrange
         updated_input = TodoInput(
             title="New Title", completed=True, user_id=self.user_id
         )
+        mock_row = MagicMock(user_id=self.user_id, completed=True)
+        mock_update_returning.return_value = mock_row
+
+        # Act
+        result = self.todo_repository.update(self.todo_id, updated_input)
+
+        # Assert
+        mock_update_returning.assert_called_once()
+        self.assertEqual(mock_update_returning.call_args[0][1].name, "todos")
+        self.assertEqual(
+            mock_update_returning.call_args[0][3],
+            {"title": "New Title", "completed": True},
+        )
+        mock_add_todo_stats.assert_not_called()
+        self.mock_session.execute.assert_not_called()
+        self.mock_session.commit.assert_called_once()
+        self.mock_session.refresh.assert_not_called()
+        self.assertEqual(result, mock_row)
+
+    @patch("app.repositories.todo_repository.add_todo_stats")
+    @patch("app.repositories.todo_repository.update_returning")
+    def test_update_completed_changed(self, mock_update_returning, mock_add_todo_stats):
+        # Arrange
+        mock_row = MagicMock(user_id=self.user_id, completed=True)
+        mock_update_returning.side_effect = [None, mock_row]
+
+        # Act
+        result = self.todo_repository.update(
+            self.todo_id,
+            TodoInput(title="New Title", completed=True, user_id=self.user_id),
+        )
+
+        # Assert
+        self.assertEqual(mock_update_returning.call_count, 2)
+        mock_add_todo_stats.assert_called_once_with(
+            self.mock_session, {self.user_id: (0, 1)}
+        )
+        self.mock_session.commit.assert_called_once()
+        self.assertEqual(result, mock_row)
+
+    @patch("app.repositories.todo_repository.add_todo_stats")
+    @patch("app.repositories.todo_repository.update_returning")
+    def test_update_not_found(self, mock_update_returning, mock_add_todo_stats):
+        # Arrange
+        mock_update_returning.return_value = None
+
+        # Act
+        result = self.todo_repository.update(
+            self.todo_id, TodoInput(title="New Title", user_id=self.user_id)
+        )
+
+        # Assert
+        self.assertIsNone(result)
+        self.assertEqual(mock_update_returning.call_count, 2)
+        mock_add_todo_stats.assert_not_called()
+
+    def test_get_stats(self):
+        # Act
+        result = self.todo_repository.get_stats(self.user_id)
+
+        # Assert
+        self.mock_session.get.assert_called_once()
+        self.assertEqual(self.mock_session.get.call_args[0][1], self.user_id)
+        self.assertEqual(result, self.mock_session.get.return_value)
+
+
+class TestAsyncTodoRepository(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        # Mock the AsyncSession and run sync callables on a mocked Session
+        self.mock_session = MagicMock(spec=Session)
+        self.mock_async_session = MagicMock(spec=AsyncSession)
+        self.mock_async_session.run_sync = AsyncMock(
+            side_effect=lambda fn: fn(self.mock_session)
+        )
+        self.todo_repository = AsyncTodoRepository(self.mock_async_session)
+
+        self.todo_id = UUID("c9bf9e57-1685-4c89-bafb-ff5af830be8a")
+        self.user_id = UUID("f47ac10b-58cc-4372-a567-0e02b2c3d479")
+        self.mock_db_item = MagicMock(spec=Todo)
+        self.mock_db_item.id = self.todo_id
+
+    @patch("app.repositories.todo_repository.Todo")
+    async def test_create(self, mock_todo_model):
+        # Arrange
+        todo_input = TodoInput(title="Test Todo", completed=False, user_id=self.user_id)
+        mock_todo_model.return_value = self.mock_db_item
+
+        # Act
+        result = await self.todo_repository.create(todo_input)
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        self.mock_session.add.assert_called_once_with(self.mock_db_item)
+        self.mock_session.commit.assert_called_once()
+        self.assertEqual(result, self.mock_db_item)
+
+    async def test_get_by_id(self):
+        # Arrange
         self.mock_session.query.return_value.filter_by.return_value.first.return_value = (
             self.mock_db_item
         )
-        self.mock_session.commit.return_value = None
-        self.mock_session.refresh.return_value = None
 
         # Act
-        result = self.todo_repository.update(self.mock_db_item, updated_input)
+        result = await self.todo_repository.get_by_id(self.todo_id)
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        self.mock_session.query.return_value.filter_by.assert_called_once_with(
+            id=self.todo_id
+        )
+        self.assertEqual(result, self.mock_db_item)
+
+    async def test_exists_by_id(self):
+        # Arrange
+        self.mock_session.query.return_value.filter_by.return_value.first.return_value = (
+            None
+        )
+
+        # Act
+        result = await self.todo_repository.exists_by_id(self.todo_id)
+
+        # Assert
+        self.assertFalse(result)
+
+    @patch("app.repositories.todo_repository.delete_returning")
+    async def test_delete(self, mock_delete_returning):
+        # Act
+        result = await self.todo_repository.delete(self.todo_id)
 
         # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
         self.mock_session.commit.assert_called_once()
-        self.mock_session.refresh.assert_called_once_with(self.mock_db_item)
-        self.assertIsInstance(result, Todo)
-        self.assertEqual(result.id, self.mock_db_item.id)
-        self.assertEqual(result.title, updated_input.title)
-        self.assertEqual(result.completed, updated_input.completed)
-        self.assertEqual(result.created_at, self.mock_db_item.created_at)
-        self.assertEqual(result.updated_at, self.mock_db_item.updated_at)
-        self.assertEqual(result.user_id, self.mock_db_item.user_id)
+        self.assertEqual(result, mock_delete_returning.return_value)
+
+    @patch("app.repositories.todo_repository.update_returning")
+    async def test_update(self, mock_update_returning):
+        # Act
+        result = await self.todo_repository.update(
+            self.todo_id, TodoInput(title="New Title", user_id=self.user_id)
+        )
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        self.assertEqual(result, mock_update_returning.return_value)
+
+    async def test_bulk(self):
+        # Arrange
+        self.mock_session.execute.return_value = []
+
+        # Act
+        await self.todo_repository.create_many(
+            [TodoInput(title="Test Todo", user_id=self.user_id)]
+        )
+        with patch(
+            "app.repositories.todo_repository.delete_returning_all",
+            return_value=[],
+        ) as mock_delete_returning_all:
+            updated = await self.todo_repository.update_many([])
+            deleted = await self.todo_repository.delete_many([self.todo_id])
+
+        # Assert
+        self.assertEqual(self.mock_async_session.run_sync.await_count, 3)
+        self.mock_session.add_all.assert_called_once()
+        self.assertEqual(updated, [])
+        self.assertEqual(deleted, mock_delete_returning_all.return_value)
+
+    async def test_get_stats(self):
+        # Act
+        result = await self.todo_repository.get_stats(self.user_id)
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        self.assertEqual(result, self.mock_session.get.return_value)
+
+    async def test_get_all_by_user(self):
+        # Arrange
+        self.mock_session.execute.return_value.all.return_value = [self.mock_db_item]
+
+        # Act
+        result = await self.todo_repository.get_all_by_user(self.user_id)
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        statement = self.mock_session.execute.call_args[0][0]
+        self.assertEqual(statement._limit, 15)
+        self.assertEqual(result, [self.mock_db_item])
+
+    async def test_search(self):
+        # Arrange
+        self.mock_session.get_bind.return_value.dialect.name = "postgresql"
+        self.mock_session.execute.return_value.all.return_value = [self.mock_db_item]
+
+        # Act
+        result = await self.todo_repository.search(self.user_id, ["milk"])
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        statement = self.mock_session.execute.call_args[0][0]
+        self.assertEqual((statement._offset, statement._limit), (0, 15))
+        self.assertEqual(result, [self.mock_db_item])
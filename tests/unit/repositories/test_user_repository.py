@@ -1,13 +1,16 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from uuid import UUID
 
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models import User
 from app.schemas.user import UserRegister, UserInDBBase
 from app.repositories.user_repository import (
     UserRepository,
+    AsyncUserRepository,
 )
 
 
@@ -45,7 +48,6 @@ class TestUserRepository(unittest.TestCase):
         mock_user_model.return_value = self.mock_db_user
         self.mock_session.add.return_value = None
         self.mock_session.commit.return_value = None
-        self.mock_session.refresh.return_value = None
 
         # Act
         result = self.user_repository.create(user_register, self.hashed_password)
@@ -58,13 +60,29 @@ class TestUserRepository(unittest.TestCase):
         )
         self.mock_session.add.assert_called_once_with(self.mock_db_user)
         self.mock_session.commit.assert_called_once()
-        self.mock_session.refresh.assert_called_once_with(self.mock_db_user)
+        self.mock_session.refresh.assert_not_called()
         self.assertIsInstance(result, User)
         self.assertEqual(result.id, self.mock_db_user.id)
         self.assertEqual(result.email, self.mock_db_user.email)
         self.assertEqual(result.username, self.mock_db_user.username)
         self.assertEqual(result.hashed_password, self.mock_db_user.hashed_password)
 
+    @patch("app.repositories.user_repository.User")  # Patch the User model
+    def test_create_conflict_rolls_back(self, mock_user_model):
+        # Arrange
+        user_register = UserRegister(
+            email=self.email, username=self.username, password="password123"
+        )
+        mock_user_model.return_value = self.mock_db_user
+        self.mock_session.commit.side_effect = IntegrityError(
+            "INSERT INTO users ...", {}, Exception("UNIQUE constraint failed")
+        )
+
+        # Act & Assert
+        with self.assertRaises(IntegrityError):
+            self.user_repository.create(user_register, self.hashed_password)
+        self.mock_session.rollback.assert_called_once()
+
     def test_user_exists_by_email(self):
         # Arrange
         self.mock_session.query.return_value.filter.return_value.first.return_value = (
@@ -158,7 +176,6 @@ class TestUserRepository(unittest.TestCase):
     def test_inactive_user(self):
         # Arrange
         self.mock_session.commit.return_value = None
-        self.mock_session.refresh.return_value = None
 
         # Act
         result = self.user_repository.inactive_user(self.mock_db_user)
@@ -166,18 +183,128 @@ class TestUserRepository(unittest.TestCase):
         # Assert
         self.assertEqual(self.mock_db_user.is_active, False)
         self.mock_session.commit.assert_called_once()
-        self.mock_session.refresh.assert_called_once_with(self.mock_db_user)
+        self.mock_session.refresh.assert_not_called()
         self.assertTrue(result)
 
-    def test_delete_user(self):
+    @patch("app.repositories.user_repository.delete_returning")
+    def test_delete_user(self, mock_delete_returning):
         # Arrange
-        self.mock_session.delete.return_value = None
-        self.mock_session.commit.return_value = None
+        mock_delete_returning.return_value = MagicMock()
 
         # Act
-        result = self.user_repository.delete_user(self.mock_db_user)
+        result = self.user_repository.delete_user(self.user_id)
 
         # Assert
-        self.mock_session.delete.assert_called_once_with(self.mock_db_user)
+        mock_delete_returning.assert_called_once()
+        self.assertEqual(mock_delete_returning.call_args[0][1].name, "users")
         self.mock_session.commit.assert_called_once()
         self.assertTrue(result)
+
+    @patch("app.repositories.user_repository.delete_returning")
+    def test_delete_user_not_found(self, mock_delete_returning):
+        # Arrange
+        mock_delete_returning.return_value = None
+
+        # Act
+        result = self.user_repository.delete_user(self.user_id)
+
+        # Assert
+        self.assertFalse(result)
+
+    def test_get_superuser_flag(self):
+        # Arrange
+        self.mock_session.execute.return_value.scalar_one_or_none.return_value = True
+
+        # Act
+        result = self.user_repository.get_superuser_flag(self.user_id)
+
+        # Assert
+        self.mock_session.execute.assert_called_once()
+        self.assertTrue(result)
+
+
+class TestAsyncUserRepository(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        # Mock the AsyncSession and run sync callables on a mocked Session
+        self.mock_session = MagicMock(spec=Session)
+        self.mock_async_session = MagicMock(spec=AsyncSession)
+        self.mock_async_session.run_sync = AsyncMock(
+            side_effect=lambda fn: fn(self.mock_session)
+        )
+        self.user_repository = AsyncUserRepository(self.mock_async_session)
+
+        self.user_id = UUID("f47ac10b-58cc-4372-a567-0e02b2c3d479")
+        self.email = "test@example.com"
+        self.username = "testuser"
+        self.mock_db_user = MagicMock(spec=User)
+        self.mock_db_user.id = self.user_id
+
+    @patch("app.repositories.user_repository.User")
+    async def test_create(self, mock_user_model):
+        # Arrange
+        user_register = UserRegister(
+            email=self.email, username=self.username, password="password123"
+        )
+        mock_user_model.return_value = self.mock_db_user
+
+        # Act
+        result = await self.user_repository.create(user_register, "hashed_password")
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        self.mock_session.add.assert_called_once_with(self.mock_db_user)
+        self.mock_session.commit.assert_called_once()
+        self.assertEqual(result, self.mock_db_user)
+
+    async def test_exists_checks(self):
+        # Arrange
+        self.mock_session.query.return_value.filter.return_value.first.return_value = (
+            self.mock_db_user
+        )
+
+        # Act & Assert
+        self.assertTrue(await self.user_repository.user_exists_by_email(self.email))
+        self.assertTrue(
+            await self.user_repository.user_exists_by_username(self.username)
+        )
+        self.assertTrue(await self.user_repository.user_exists_by_id(self.user_id))
+        self.assertEqual(self.mock_async_session.run_sync.await_count, 3)
+
+    async def test_getters(self):
+        # Arrange
+        self.mock_session.query.return_value.filter.return_value.first.return_value = (
+            self.mock_db_user
+        )
+
+        # Act & Assert
+        self.assertEqual(
+            await self.user_repository.get_user_by_email(self.email), self.mock_db_user
+        )
+        self.assertEqual(
+            await self.user_repository.get_user_by_username(self.username),
+            self.mock_db_user,
+        )
+        self.assertEqual(
+            await self.user_repository.get_user_object_by_id(self.user_id),
+            self.mock_db_user,
+        )
+
+    @patch("app.repositories.user_repository.delete_returning")
+    async def test_inactive_and_delete_user(self, mock_delete_returning):
+        # Act
+        inactive_result = await self.user_repository.inactive_user(self.mock_db_user)
+        delete_result = await self.user_repository.delete_user(self.user_id)
+
+        # Assert
+        self.assertTrue(inactive_result)
+        self.assertFalse(self.mock_db_user.is_active)
+        self.assertTrue(delete_result)
+        mock_delete_returning.assert_called_once()
+
+    async def test_get_superuser_flag(self):
+        # Arrange
+        self.mock_session.execute.return_value.scalar_one_or_none.return_value = None
+
+        # Act & Assert
+        self.assertIsNone(await self.user_repository.get_superuser_flag(self.user_id))
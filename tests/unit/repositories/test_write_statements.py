@@ -0,0 +1,215 @@
+import unittest
+import uuid
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, Todo
+from app.repositories.todo_repository import TodoRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.todo import TodoInput, TodoBulkUpdateItem
+from app.schemas.user import UserRegister
+
+
+class TestWriteStatements(unittest.TestCase):
+    """
+    Repository writes send one statement per table they change, plus the
+    upsert of the user's todo counters when those change, and no SELECT to
+    read back generated values after the commit. update_many alone reads its
+    rows first, with one locking SELECT for the whole batch.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(
+            bind=self.engine, autoflush=False, expire_on_commit=False
+        )()
+
+        # Count every statement sent to the database
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _create_user(self):
+        return UserRepository(self.session).create(
+            UserRegister(
+                email="test@example.com", username="testuser", password="Password@123"
+            ),
+            hashed_password="hashed",
+        )
+
+    def test_create_user_single_insert(self):
+        # Act
+        user = self._create_user()
+
+        # Assert
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].startswith("INSERT INTO users"))
+        self.assertIsNotNone(user.id)
+        self.assertIsNotNone(user.created_at)
+        self.assertIsNotNone(user.updated_at)
+        self.assertTrue(user.is_active)
+        self.assertFalse(user.is_superuser)
+
+    def test_create_todo_single_insert(self):
+        # Arrange
+        user = self._create_user()
+        self.statements.clear()
+
+        # Act
+        todo = TodoRepository(self.session).create(
+            TodoInput(title="Test Todo", completed=False, user_id=user.id)
+        )
+
+        # Assert
+        self.assertEqual(len(self.statements), 2)
+        self.assertTrue(self.statements[0].startswith("INSERT INTO todos"))
+        self.assertTrue(self.statements[1].startswith("INSERT INTO user_todo_stats"))
+        self.assertIsNotNone(todo.id)
+        self.assertIsNotNone(todo.created_at)
+        self.assertIsNotNone(todo.updated_at)
+        self.assertEqual(todo.as_dict()["title"], "Test Todo")
+
+    def test_inactive_user_single_update(self):
+        # Arrange
+        user = self._create_user()
+        created_updated_at = user.updated_at
+        self.statements.clear()
+
+        # Act
+        result = UserRepository(self.session).inactive_user(user)
+
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].startswith("UPDATE users"))
+        self.assertFalse(user.is_active)
+        self.assertGreaterEqual(user.updated_at, created_updated_at)
+
+    def _create_todos(self, count):
+        user = self._create_user()
+        return TodoRepository(self.session).create_many(
+            [TodoInput(title=f"Todo {i}", user_id=user.id) for i in range(count)]
+        )
+
+    def test_create_many_single_insert(self):
+        # Act
+        todos = self._create_todos(5)
+
+        # Assert
+        self.assertEqual(len(self.statements), 3)
+        self.assertTrue(self.statements[1].startswith("INSERT INTO todos"))
+        self.assertTrue(self.statements[2].startswith("INSERT INTO user_todo_stats"))
+        self.assertEqual(
+            [todo.title for todo in todos], [f"Todo {i}" for i in range(5)]
+        )
+        self.assertEqual(len({todo.id for todo in todos}), 5)
+
+    def test_update_single_update(self):
+        # Arrange
+        todo = self._create_todos(1)[0]
+        self.statements.clear()
+
+        # Act
+        row = TodoRepository(self.session).update(
+            todo.id, TodoInput(title="Renamed", user_id=todo.user_id)
+        )
+
+        # Assert
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].startswith("UPDATE todos"))
+        self.assertEqual((row.title, row.completed), ("Renamed", False))
+
+    def test_update_completed_counted_in_stats(self):
+        # Arrange
+        todo = self._create_todos(1)[0]
+        repository = TodoRepository(self.session)
+        self.statements.clear()
+
+        # Act
+        row = repository.update(
+            todo.id, TodoInput(title="Done", completed=True, user_id=todo.user_id)
+        )
+
+        # Assert
+        self.assertEqual(len(self.statements), 3)
+        self.assertTrue(self.statements[0].startswith("UPDATE todos"))
+        self.assertTrue(self.statements[1].startswith("UPDATE todos"))
+        self.assertTrue(self.statements[2].startswith("INSERT INTO user_todo_stats"))
+        self.assertEqual((row.title, row.completed), ("Done", True))
+        stats = repository.get_stats(todo.user_id)
+        self.assertEqual((stats.total, stats.completed), (1, 1))
+
+    def test_update_missing_todo(self):
+        # Arrange
+        self._create_todos(1)
+        self.statements.clear()
+
+        # Act
+        row = TodoRepository(self.session).update(
+            uuid.uuid4(), TodoInput(title="Renamed", user_id=uuid.uuid4())
+        )
+
+        # Assert
+        self.assertIsNone(row)
+        self.assertEqual(len(self.statements), 2)
+
+    def test_update_many_one_statement_per_field_set(self):
+        # Arrange
+        todos = self._create_todos(3)
+        missing_id = uuid.uuid4()
+        self.statements.clear()
+
+        # Act
+        result = TodoRepository(self.session).update_many(
+            [
+                TodoBulkUpdateItem(id=todos[0].id, completed=True),
+                TodoBulkUpdateItem(id=missing_id, completed=True),
+                TodoBulkUpdateItem(id=todos[1].id, completed=True),
+                TodoBulkUpdateItem(id=todos[2].id, title="Renamed"),
+            ]
+        )
+
+        # Assert
+        self.assertEqual(len(self.statements), 4)
+        self.assertTrue(self.statements[0].startswith("SELECT"))
+        self.assertIn("SET completed=?", self.statements[1])
+        self.assertIn("SET title=?", self.statements[2])
+        self.assertTrue(self.statements[3].startswith("INSERT INTO user_todo_stats"))
+        self.assertEqual(
+            [todo["id"] for todo in result], [todos[0].id, todos[1].id, todos[2].id]
+        )
+        self.assertEqual(
+            [(todo["title"], todo["completed"]) for todo in result],
+            [("Todo 0", True), ("Todo 1", True), ("Renamed", False)],
+        )
+        self.assertEqual(
+            self.session.execute(
+                select(Todo.title, Todo.completed).order_by(Todo.title)
+            ).all(),
+            [("Renamed", False), ("Todo 0", True), ("Todo 1", True)],
+        )
+
+    def test_delete_many_single_delete(self):
+        # Arrange
+        todos = self._create_todos(3)
+        self.statements.clear()
+
+        # Act
+        result = TodoRepository(self.session).delete_many(
+            [todos[0].id, todos[2].id, uuid.uuid4()]
+        )
+
+        # Assert
+        self.assertEqual(len(self.statements), 2)
+        self.assertTrue(self.statements[0].startswith("DELETE FROM todos"))
+        self.assertTrue(self.statements[1].startswith("INSERT INTO user_todo_stats"))
+        self.assertEqual({row.id for row in result}, {todos[0].id, todos[2].id})
@@ -47,3 +47,18 @@ class TestSystemRouter(unittest.TestCase):
                 "iso_time": "2025-02-19T12:00:00Z",
             },
         )
+
+    def test_pool_endpoint(self):
+        """
+        Test that the /system/pool endpoint reports both engines' pools.
+        """
+        response = self.client.get(f"{API_PREFIX}/system/pool")
+        self.assertEqual(response.status_code, 200)
+        response_data = response.json()
+        for engine_name in ("engine", "async_engine"):
+            self.assertIn("checked_out", response_data[engine_name])
+            self.assertIn("overflow", response_data[engine_name])
+            self.assertIn("wait_count", response_data[engine_name])
+            self.assertIn("wait_time_total", response_data[engine_name])
+        # No replicas are configured in the test environment
+        self.assertEqual(response_data["replicas"], [])
@@ -1,30 +1,45 @@
+import json
 import uuid
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
-from sqlalchemy.orm import Session
-
-from app.schemas.todo import TodoInput, TodoOutput
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.todo import (
+    TodoInput,
+    TodoOutput,
+    TodoList,
+    CountStrategy,
+    TodoFileFormat,
+    TodoBulkCreate,
+    TodoBulkUpdate,
+    TodoBulkUpdateItem,
+    TodoBulkDelete,
+    TodoBulkResult,
+    TodoImportResult,
+    sparse_todo_output,
+    sparse_todo_list,
+)
 from app.schemas.user import UserInDBBase
 
 # Import the router or the function directly
 from app.routers.v1 import todos
 
 
-class TestCreateNewTodo(unittest.TestCase):
+class TestCreateNewTodo(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
         # Common mock objects
-        self.mock_session = MagicMock(spec=Session)
+        self.mock_session = MagicMock(spec=AsyncSession)
         self.mock_current_user = MagicMock(spec=UserInDBBase)
         self.mock_current_user.id = uuid.uuid4()
 
-        # Patch get_session and get_current_user
-        self.mock_get_session = patch("app.routers.v1.todos.get_session").start()
+        # Patch get_async_session and get_current_user
+        self.mock_get_session = patch("app.routers.v1.todos.get_async_session").start()
         self.mock_get_session.return_value = self.mock_session
 
         self.mock_get_current_user = patch(
-            "app.routers.v1.todos.get_current_user"
+            "app.routers.v1.todos.get_current_writer"
         ).start()
         self.mock_get_current_user.return_value = self.mock_current_user
 
@@ -55,22 +70,23 @@ class TestCreateNewTodo(unittest.TestCase):
         self.todo_id = self.mock_todo_output.id
         self.update_todo_id = self.mock_another_todo_output.id
 
-        # Patch TodoService
-        self.mock_todo_service = patch("app.routers.v1.todos.TodoService").start()
-        self.mock_todo_service_instance = self.mock_todo_service.return_value
+        # Patch AsyncTodoService
+        self.mock_todo_service = patch("app.routers.v1.todos.AsyncTodoService").start()
+        self.mock_todo_service_instance = AsyncMock()
+        self.mock_todo_service.return_value = self.mock_todo_service_instance
 
     def tearDown(self):
         # Stop all patches
         patch.stopall()
 
-    def test_create_new_todo(self):
+    async def test_create_new_todo(self):
         # Arrange
         self.mock_todo_service_instance.create.return_value = (
             self.mock_todo_output.model_dump()
         )
 
         # Act
-        response = todos.create_new_todo(
+        response = await todos.create_new_todo(
             data=self.todo_input,
             session=self.mock_get_session,
             current_user=self.mock_get_current_user,
@@ -78,7 +94,7 @@ class TestCreateNewTodo(unittest.TestCase):
 
         # Assert
         self.mock_todo_service.assert_called_once_with(self.mock_get_session)
-        self.mock_todo_service_instance.create.assert_called_once_with(self.todo_input)
+        self.mock_todo_service_instance.create.assert_awaited_once_with(self.todo_input)
 
         # Validate the response
         self.assertEqual(response.message, "Todo is created successfully.")
@@ -87,80 +103,211 @@ class TestCreateNewTodo(unittest.TestCase):
         self.assertEqual(response.data.completed, self.mock_todo_output.completed)
         self.assertEqual(response.data.user_id, self.mock_todo_output.user_id)
 
-    def test_get_all_todos(self):
+    async def test_get_all_todos(self):
         # Arrange
-        self.mock_todo_service_instance.get_all.return_value = (
-            10,
-            [
-                self.mock_todo_output.model_dump(),
-                self.mock_another_todo_output.model_dump(),
-            ],
+        self.mock_todo_service_instance.get_all.return_value = TodoList(
+            todos=[self.mock_todo_output, self.mock_another_todo_output],
+            page=1,
+            page_size=2,
+            total_count=10,
+            has_more=True,
+            next_cursor="next-cursor",
         )
 
         page = 1
         page_size = 15
 
         # Act
-        response = todos.get_all_todos(
-            session=self.mock_session, page=page, page_size=page_size
+        response = await todos.get_all_todos(
+            session=self.mock_session,
+            page=page,
+            page_size=page_size,
+            cursor=None,
+            count=CountStrategy.CACHED,
+            fields=None,
         )
 
         # Assert
         self.mock_todo_service.assert_called_once_with(self.mock_session)
-        self.mock_todo_service_instance.get_all.assert_called_once_with(
-            page=page, page_size=page_size
+        self.mock_todo_service_instance.get_all.assert_awaited_once_with(
+            page=page,
+            page_size=page_size,
+            cursor=None,
+            count_strategy=CountStrategy.CACHED,
+            fields=None,
         )
-
+        self.assertEqual(response.next_cursor, "next-cursor")
         self.assertEqual(response.page, page)
         self.assertEqual(response.page_size, 2)  # Number of todos returned
         self.assertEqual(response.total_count, 10)
         self.assertEqual(len(response.todos), 2)
 
-    def test_get_todo_details(self):
+    async def test_get_todos_with_fields(self):
+        # Arrange
+        sparse_todo = sparse_todo_output(("id", "title"))(
+            id=self.todo_id, title="Test Todo"
+        )
+        sparse_page = sparse_todo_list(("id", "title"))(
+            todos=[sparse_todo], page=1, page_size=1
+        )
+        self.mock_todo_service_instance.get_all.return_value = sparse_page
+        self.mock_todo_service_instance.get_by_id.return_value = sparse_todo
+
+        # Act
+        page_response = await todos.get_all_todos(
+            session=self.mock_session,
+            page=1,
+            page_size=15,
+            cursor=None,
+            count=None,
+            fields="title,id",
+        )
+        todo_response = await todos.get_todo_details(
+            _id=self.todo_id, session=self.mock_session, fields="title,id"
+        )
+
+        # Assert: sparse models are rendered as they are
+        self.assertEqual(
+            self.mock_todo_service_instance.get_all.await_args.kwargs["fields"],
+            "title,id",
+        )
+        self.mock_todo_service_instance.get_by_id.assert_awaited_once_with(
+            self.todo_id, fields="title,id"
+        )
+        self.assertEqual(
+            json.loads(page_response.body)["todos"],
+            [{"id": str(self.todo_id), "title": "Test Todo"}],
+        )
+        self.assertEqual(
+            json.loads(todo_response.body),
+            {"id": str(self.todo_id), "title": "Test Todo"},
+        )
+
+    async def test_export_todos(self):
+        # Arrange
+        mock_open_session = AsyncMock(return_value=self.mock_session)
+
+        async def export(export_format):
+            yield b"id,title\r\n"
+            yield b"1,Test Todo\r\n"
+
+        self.mock_todo_service_instance.export = MagicMock(side_effect=export)
+
+        # Act
+        response = await todos.export_todos(
+            format=TodoFileFormat.CSV, open_session=mock_open_session
+        )
+
+        # Assert: the session is opened by the stream, and closed after it
+        mock_open_session.assert_not_called()
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        self.assertEqual(body, b"id,title\r\n1,Test Todo\r\n")
+        self.assertEqual(response.media_type, "text/csv")
+        self.assertEqual(
+            response.headers["content-disposition"], 'attachment; filename="todos.csv"'
+        )
+        self.mock_todo_service.assert_called_once_with(self.mock_session)
+        self.mock_todo_service_instance.export.assert_called_once_with(
+            TodoFileFormat.CSV
+        )
+        self.mock_session.close.assert_awaited_once()
+
+    async def test_import_todos(self):
+        # Arrange
+        mock_request = MagicMock()
+        self.mock_todo_service_instance.import_todos.return_value = TodoImportResult(
+            imported=2
+        ).model_dump()
+
+        # Act
+        response = await todos.import_todos(
+            request=mock_request,
+            format=TodoFileFormat.CSV,
+            session=self.mock_session,
+            current_user=self.mock_current_user,
+        )
+
+        # Assert: the service reads the body as a stream
+        self.mock_todo_service.assert_called_once_with(self.mock_session)
+        self.mock_todo_service_instance.import_todos.assert_awaited_once_with(
+            self.mock_current_user.id,
+            mock_request.stream.return_value,
+            TodoFileFormat.CSV,
+        )
+        self.assertEqual(response.message, "Todos are imported successfully.")
+        self.assertEqual(response.data.imported, 2)
+
+    async def test_search_todos(self):
+        # Arrange
+        self.mock_todo_service_instance.search.return_value = TodoList(
+            todos=[self.mock_todo_output], page=2, page_size=1, has_more=False
+        )
+
+        # Act
+        response = await todos.search_todos(
+            q="test",
+            page=2,
+            page_size=10,
+            session=self.mock_session,
+            current_user=self.mock_current_user,
+        )
+
+        # Assert
+        self.mock_todo_service.assert_called_once_with(self.mock_session)
+        self.mock_todo_service_instance.search.assert_awaited_once_with(
+            self.mock_current_user.id, "test", page=2, page_size=10
+        )
+        self.assertEqual(response.todos, [self.mock_todo_output])
+
+    async def test_get_todo_details(self):
         # Arrange
         self.mock_todo_service_instance.get_by_id.return_value = self.mock_todo_output
 
         # Act
-        response = todos.get_todo_details(_id=self.todo_id, session=self.mock_session)
+        response = await todos.get_todo_details(
+            _id=self.todo_id, session=self.mock_session, fields=None
+        )
 
         # Assert
         self.mock_todo_service.assert_called_once_with(self.mock_session)
-        self.mock_todo_service_instance.get_by_id.assert_called_once_with(self.todo_id)
+        self.mock_todo_service_instance.get_by_id.assert_awaited_once_with(
+            self.todo_id, fields=None
+        )
 
         self.assertEqual(response.id, self.todo_id)
         self.assertEqual(response.title, "Test Todo")
         self.assertEqual(response.completed, False)
 
-    def test_delete_todo(self):
+    async def test_delete_todo(self):
         # Arrange
         self.mock_todo_service_instance.delete.return_value = (
             self.mock_todo_output.model_dump()
         )
 
         # Act
-        response = todos.delete_todo(_id=self.todo_id, session=self.mock_session)
+        response = await todos.delete_todo(_id=self.todo_id, session=self.mock_session)
 
         # Assert
         self.mock_todo_service.assert_called_once_with(self.mock_session)
-        self.mock_todo_service_instance.delete.assert_called_once_with(self.todo_id)
+        self.mock_todo_service_instance.delete.assert_awaited_once_with(self.todo_id)
 
         self.assertEqual(response.message, "Todo is deleted successfully.")
         self.assertEqual(response.data.id, self.todo_id)
 
-    def test_update_todo(self):
+    async def test_update_todo(self):
         # Arrange
         self.mock_todo_service_instance.update.return_value = (
             self.mock_another_todo_output.model_dump()
         )
 
         # Act
-        response = todos.update_todo(
+        response = await todos.update_todo(
             _id=self.update_todo_id, data=self.todo_input, session=self.mock_session
         )
 
         # Assert
         self.mock_todo_service.assert_called_once_with(self.mock_session)
-        self.mock_todo_service_instance.update.assert_called_once_with(
+        self.mock_todo_service_instance.update.assert_awaited_once_with(
             self.update_todo_id, self.todo_input
         )
 
@@ -168,3 +315,61 @@ class TestCreateNewTodo(unittest.TestCase):
         self.assertEqual(response.data.id, self.update_todo_id)
         self.assertEqual(response.data.title, "Updated Todo")
         self.assertEqual(response.data.completed, False)
+
+    async def test_create_todos_bulk(self):
+        # Arrange
+        data = TodoBulkCreate(todos=[{"title": "Test Todo"}])
+        self.mock_todo_service_instance.create_many.return_value = [
+            TodoBulkResult(
+                id=self.todo_id, status_code=201, todo=self.mock_todo_output
+            ).model_dump()
+        ]
+
+        # Act
+        response = await todos.create_todos_bulk(
+            data=data,
+            session=self.mock_session,
+            current_user=self.mock_current_user,
+        )
+
+        # Assert
+        self.mock_todo_service_instance.create_many.assert_awaited_once_with(data.todos)
+        self.assertEqual(data.todos[0].user_id, self.mock_current_user.id)
+        self.assertEqual(response.message, "Todos are created successfully.")
+        self.assertEqual(response.data[0].todo.id, self.todo_id)
+
+    async def test_update_todos_bulk(self):
+        # Arrange
+        data = TodoBulkUpdate(
+            todos=[TodoBulkUpdateItem(id=self.update_todo_id, completed=True)]
+        )
+        self.mock_todo_service_instance.update_many.return_value = [
+            TodoBulkResult(id=self.update_todo_id, status_code=404).model_dump()
+        ]
+
+        # Act
+        response = await todos.update_todos_bulk(data=data, session=self.mock_session)
+
+        # Assert
+        self.mock_todo_service_instance.update_many.assert_awaited_once_with(data.todos)
+        self.assertEqual(response.message, "Todos are updated successfully.")
+        self.assertEqual(response.data[0].status_code, 404)
+
+    async def test_delete_todos_bulk(self):
+        # Arrange
+        data = TodoBulkDelete(ids=[self.todo_id])
+        self.mock_todo_service_instance.delete_many.return_value = [
+            TodoBulkResult(
+                id=self.todo_id, status_code=200, todo=self.mock_todo_output
+            ).model_dump()
+        ]
+
+        # Act
+        response = await todos.delete_todos_bulk(data=data, session=self.mock_session)
+
+        # Assert
+        self.mock_todo_service_instance.delete_many.assert_awaited_once_with(
+            [self.todo_id]
+        )
+        self.assertEqual(response.message, "Todos are deleted successfully.")
+        self.assertEqual(response.data[0].id, self.todo_id)
@@ -1,7 +1,8 @@
 import uuid
 import unittest
-from unittest.mock import patch, MagicMock
-from sqlalchemy.orm import Session
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.user import (
     UserRegister,
@@ -12,30 +13,33 @@ from app.schemas.user import (
     UserIn,
 )
 
+from app.schemas.todo import TodoList, TodoStats
+
 # Import the functions directly
 from app.routers.v1 import users
 
 
-class TestUserRouter(unittest.TestCase):
+class TestUserRouter(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
         # Common mock objects
-        self.mock_session = MagicMock(spec=Session)
+        self.mock_session = MagicMock(spec=AsyncSession)
         self.mock_current_user = MagicMock(spec=UserIn)
         self.mock_current_user.id = uuid.uuid4()
 
-        # Patch get_session and get_current_user
-        self.mock_get_session = patch("app.routers.v1.users.get_session").start()
+        # Patch get_async_session and get_current_reader
+        self.mock_get_session = patch("app.routers.v1.users.get_async_session").start()
         self.mock_get_session.return_value = self.mock_session
 
         self.mock_get_current_user = patch(
-            "app.routers.v1.users.get_current_user"
+            "app.routers.v1.users.get_current_reader"
         ).start()
         self.mock_get_current_user.return_value = self.mock_current_user
 
-        # Patch UserService
-        self.mock_user_service = patch("app.routers.v1.users.UserService").start()
-        self.mock_user_service_instance = self.mock_user_service.return_value
+        # Patch AsyncUserService
+        self.mock_user_service = patch("app.routers.v1.users.AsyncUserService").start()
+        self.mock_user_service_instance = AsyncMock()
+        self.mock_user_service.return_value = self.mock_user_service_instance
 
         self.mock_created_user = UserInDBBase(
             id=uuid.uuid4(),
@@ -58,7 +62,7 @@ class TestUserRouter(unittest.TestCase):
         # Stop all patches
         patch.stopall()
 
-    def test_register(self):
+    async def test_register(self):
         # Arrange
         user_register_data = UserRegister(
             email="test@example.com", password="password123", username="Test User"
@@ -68,20 +72,28 @@ class TestUserRouter(unittest.TestCase):
             self.mock_created_user.model_dump()
         )
 
+        mock_response = MagicMock(spec=Response)
+
         # Act
-        response = users.register(data=user_register_data, session=self.mock_session)
+        with patch("app.routers.v1.users.mark_write") as mock_mark_write:
+            response = await users.register(
+                data=user_register_data,
+                response=mock_response,
+                session=self.mock_session,
+            )
 
         # Assert
         self.mock_user_service.assert_called_once_with(self.mock_session)
-        self.mock_user_service_instance.create.assert_called_once_with(
+        self.mock_user_service_instance.create.assert_awaited_once_with(
             user_register_data
         )
+        mock_mark_write.assert_called_once_with(mock_response, "test@example.com")
         self.assertEqual(response.message, "User is registered successfully.")
         self.assertEqual(response.data.id, self.mock_created_user.id)
         self.assertEqual(response.data.email, self.mock_created_user.email)
         self.assertEqual(response.data.username, self.mock_created_user.username)
 
-    def test_login(self):
+    async def test_login(self):
         # Arrange
         user_login_data = UserLogin(email="test@example.com", password="password123")
         mock_token = Token(
@@ -92,25 +104,74 @@ class TestUserRouter(unittest.TestCase):
         self.mock_user_service_instance.login.return_value = mock_token
 
         # Act
-        response = users.login(data=user_login_data, session=self.mock_session)
+        response = await users.login(data=user_login_data, session=self.mock_session)
 
         # Assert
         self.mock_user_service.assert_called_once_with(self.mock_session)
-        self.mock_user_service_instance.login.assert_called_once_with(user_login_data)
+        self.mock_user_service_instance.login.assert_awaited_once_with(user_login_data)
 
         self.assertIsInstance(response, Token)
         self.assertEqual(response.access_token, "mock_access_token")
         self.assertEqual(response.token_type, "bearer")
         self.assertEqual(response.expired_at, "1970-01-01 00:00:00 UTC+0000")
 
-    def test_get_me(self):
+    async def test_get_me(self):
         # Arrange
         self.mock_get_current_user.return_value = self.mock_user
 
         # Act
-        response = users.get_me(user=self.mock_user)
+        response = await users.get_me(user=self.mock_user)
 
         # Assert
         self.assertIsInstance(response, UserBase)
         self.assertEqual(response.email, self.mock_user.email)
         self.assertEqual(response.username, self.mock_user.username)
+
+    @patch("app.routers.v1.users.AsyncTodoService")
+    async def test_get_my_todos(self, mock_todo_service):
+        # Arrange
+        mock_todo_service.return_value.get_all_for_user = AsyncMock(
+            return_value=TodoList(todos=[], page_size=0)
+        )
+
+        # Act
+        response = await users.get_my_todos(
+            session=self.mock_session,
+            user=self.mock_current_user,
+            page_size=10,
+            cursor=None,
+            completed=True,
+            created_from=None,
+            created_to=None,
+        )
+
+        # Assert
+        mock_todo_service.assert_called_once_with(self.mock_session)
+        mock_todo_service.return_value.get_all_for_user.assert_awaited_once_with(
+            self.mock_current_user.id,
+            page_size=10,
+            cursor=None,
+            completed=True,
+            created_from=None,
+            created_to=None,
+        )
+        self.assertEqual(response.todos, [])
+
+    @patch("app.routers.v1.users.AsyncTodoService")
+    async def test_get_my_todo_stats(self, mock_todo_service):
+        # Arrange
+        mock_todo_service.return_value.get_stats = AsyncMock(
+            return_value=TodoStats(total=3, completed=1)
+        )
+
+        # Act
+        response = await users.get_my_todo_stats(
+            session=self.mock_session, user=self.mock_current_user
+        )
+
+        # Assert
+        mock_todo_service.assert_called_once_with(self.mock_session)
+        mock_todo_service.return_value.get_stats.assert_awaited_once_with(
+            self.mock_current_user.id
+        )
+        self.assertEqual(response, TodoStats(total=3, completed=1))
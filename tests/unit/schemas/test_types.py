@@ -0,0 +1,28 @@
+import unittest
+import uuid
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.db.models import uuid7
+from app.schemas.types import UUID4or7
+
+
+class TestUUID4or7(unittest.TestCase):
+
+    def setUp(self):
+        self.adapter = TypeAdapter(UUID4or7)
+
+    def test_accepts_uuid4_and_uuid7(self):
+        for value in (uuid.uuid4(), uuid7()):
+            self.assertEqual(self.adapter.validate_python(str(value)), value)
+
+    def test_rejects_other_versions(self):
+        for value in (uuid.uuid1(), uuid.uuid5(uuid.NAMESPACE_DNS, "example.com")):
+            with self.assertRaises(ValidationError) as context:
+                self.adapter.validate_python(str(value))
+            self.assertIn("expected one of 4, 7", str(context.exception))
+
+    def test_json_schema_is_uuid(self):
+        self.assertEqual(
+            self.adapter.json_schema(), {"format": "uuid", "type": "string"}
+        )
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from app.services.todo_archiver import todo_archive_loop
+
+
+class TestTodoArchiveLoop(unittest.IsolatedAsyncioTestCase):
+
+    @patch("app.services.todo_archiver.logger")
+    @patch("app.services.todo_archiver.asyncio.sleep", new_callable=AsyncMock)
+    @patch("app.services.todo_archiver.AsyncTodoService")
+    async def test_loop_archives_and_survives_failures(
+        self, mock_todo_service, mock_sleep, mock_logger
+    ):
+        # Arrange: archive some, fail once, archive none, then stop the loop
+        mock_sleep.side_effect = [None, None, None, RuntimeError("stop")]
+        mock_todo_service.return_value.archive_completed = AsyncMock(
+            side_effect=[5, Exception("database is locked"), 0]
+        )
+        session = MagicMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            await todo_archive_loop(session_factory, 60)
+
+        # Assert
+        mock_sleep.assert_awaited_with(60)
+        mock_todo_service.assert_called_with(session)
+        self.assertEqual(session_factory.call_count, 3)
+        mock_logger.info.assert_called_once_with("Archived 5 completed todos")
+        mock_logger.warning.assert_called_once_with(
+            "Todo archiving failed: database is locked"
+        )
@@ -1,16 +1,26 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import call, patch, MagicMock, AsyncMock
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import List, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.schemas.todo import TodoInput, TodoOutput
+from app.schemas.todo import TodoInput, TodoOutput, CountStrategy, TodoBulkUpdateItem
 from app.services.user_service import UserService
 from app.repositories.todo_repository import TodoRepository
-from app.services.todo_service import TodoService
+from app.services.todo_service import (
+    TodoService,
+    AsyncTodoService,
+    to_utc_naive,
+    TODO_COUNT_CACHE_KEY,
+    todo_count_cache,
+    RecordError,
+)
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, decode_cursor
 
 
 class TestTodoService(unittest.TestCase):
@@ -21,6 +31,8 @@ class TestTodoService(unittest.TestCase):
 
         # Mock the TodoRepository and UserService
         self.mock_todo_repository = MagicMock(spec=TodoRepository)
+        # No todo is archived unless a test says so
+        self.mock_todo_repository.restore_archived.return_value = 0
         self.mock_user_service = MagicMock(spec=UserService)
 
         # Initialize the TodoService with mocked dependencies
@@ -50,6 +62,8 @@ class TestTodoService(unittest.TestCase):
             "updated_at": self.updated_at,
             "user_id": self.user_id,
         }
+        # List reads return column rows, read through their mapping
+        self.mock_db_todo._mapping = self.mock_db_todo.as_dict.return_value
 
     def tearDown(self):
         # Stop all patches
@@ -87,22 +101,201 @@ class TestTodoService(unittest.TestCase):
         page = 1
         page_size = 15
         mock_db_todos = [self.mock_db_todo]
-        self.mock_todo_repository.get_all.return_value = (1, mock_db_todos)
+        self.mock_todo_repository.get_all.return_value = mock_db_todos
+        self.mock_todo_repository.count.return_value = 1
 
         # Act
-        total_count, result = self.todo_service.get_all(page=page, page_size=page_size)
+        result = self.todo_service.get_all(
+            page=page, page_size=page_size, count_strategy=CountStrategy.EXACT
+        )
 
         # Assert
         self.mock_todo_repository.get_all.assert_called_once_with(
-            page=page, page_size=page_size
+            page=page,
+            page_size=page_size,
+            after=None,
+            limit=page_size + 1,
+            columns=None,
         )
-        self.assertEqual(total_count, 1)
-        self.assertIsInstance(result, List)
-        self.assertEqual(len(result), 1)
-        self.assertEqual(result[0].id, self.todo_id)
-        self.assertEqual(result[0].title, "Test Todo")
-        self.assertEqual(result[0].completed, False)
-        self.assertEqual(result[0].user_id, self.user_id)
+        self.mock_todo_repository.count.assert_called_once()
+        self.assertEqual(result.page, page)
+        self.assertEqual(result.total_count, 1)
+        self.assertFalse(result.has_more)
+        self.assertIsNone(result.next_cursor)  # Fewer rows than page_size
+        self.assertEqual(len(result.todos), 1)
+        self.assertEqual(result.todos[0].id, self.todo_id)
+        self.assertEqual(result.todos[0].title, "Test Todo")
+        self.assertEqual(result.todos[0].completed, False)
+        self.assertEqual(result.todos[0].user_id, self.user_id)
+
+    def test_get_all_with_cursor(self):
+        # Arrange
+        cursor = encode_cursor(self.created_at, self.todo_id)
+        # Two rows come back for a page of one, so another page follows
+        self.mock_todo_repository.get_all.return_value = [
+            self.mock_db_todo,
+            self.mock_db_todo,
+        ]
+
+        # Act
+        result = self.todo_service.get_all(
+            page_size=1, cursor=cursor, count_strategy=CountStrategy.NONE
+        )
+
+        # Assert
+        self.mock_todo_repository.get_all.assert_called_once_with(
+            page=1,
+            page_size=1,
+            after=(self.created_at, self.todo_id),
+            limit=2,
+            columns=None,
+        )
+        self.assertIsNone(result.page)
+        self.assertEqual(len(result.todos), 1)
+        self.assertTrue(result.has_more)
+        # A page followed by more rows hands out a cursor after its last row
+        self.assertEqual(
+            decode_cursor(result.next_cursor), (self.created_at, self.todo_id)
+        )
+
+    def test_get_all_for_user(self):
+        # Arrange
+        cursor = encode_cursor(self.created_at, self.todo_id)
+        created_from = datetime(2025, 1, 1, 8, tzinfo=timezone(timedelta(hours=8)))
+        self.mock_todo_repository.get_all_by_user.return_value = [self.mock_db_todo]
+
+        # Act
+        result = self.todo_service.get_all_for_user(
+            self.user_id,
+            page_size=1,
+            cursor=cursor,
+            completed=False,
+            created_from=created_from,
+        )
+
+        # Assert
+        self.mock_todo_repository.get_all_by_user.assert_called_once_with(
+            self.user_id,
+            completed=False,
+            created_from=datetime(2025, 1, 1),
+            created_to=None,
+            after=(self.created_at, self.todo_id),
+            limit=2,
+        )
+        self.assertIsNone(result.page)
+        self.assertIsNone(result.total_count)
+        self.assertEqual(len(result.todos), 1)
+        self.assertFalse(result.has_more)
+        self.assertIsNone(result.next_cursor)
+
+    def test_search(self):
+        # Arrange
+        self.mock_todo_repository.search.return_value = [self.mock_db_todo] * 3
+
+        # Act
+        result = self.todo_service.search(
+            self.user_id, "Buy 'milk'!", page=2, page_size=2
+        )
+
+        # Assert
+        self.mock_todo_repository.search.assert_called_once_with(
+            self.user_id, ["buy", "milk"], offset=2, limit=3
+        )
+        self.assertEqual(result.page, 2)
+        self.assertEqual(len(result.todos), 2)
+        self.assertTrue(result.has_more)
+        # Ranked pages are not in keyset order, so there is no cursor
+        self.assertIsNone(result.next_cursor)
+
+    def test_search_without_words(self):
+        # Act
+        result = self.todo_service.search(self.user_id, "?!")
+
+        # Assert
+        self.mock_todo_repository.search.assert_not_called()
+        self.assertEqual(result.todos, [])
+        self.assertFalse(result.has_more)
+
+    def test_get_stats(self):
+        # Arrange
+        self.mock_todo_repository.get_stats.return_value = MagicMock(
+            total=3, completed=1
+        )
+
+        # Act
+        result = self.todo_service.get_stats(self.user_id)
+
+        # Assert
+        self.mock_todo_repository.get_stats.assert_called_once_with(self.user_id)
+        self.assertEqual((result.total, result.completed), (3, 1))
+
+    def test_get_stats_without_todos(self):
+        # Arrange
+        self.mock_todo_repository.get_stats.return_value = None
+
+        # Act
+        result = self.todo_service.get_stats(self.user_id)
+
+        # Assert
+        self.assertEqual((result.total, result.completed), (0, 0))
+
+    def test_to_utc_naive(self):
+        self.assertIsNone(to_utc_naive(None))
+        self.assertEqual(to_utc_naive(self.created_at), self.created_at)
+        self.assertEqual(
+            to_utc_naive(datetime(2025, 1, 1, tzinfo=timezone.utc)),
+            datetime(2025, 1, 1),
+        )
+
+    def test_get_all_invalid_cursor(self):
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            self.todo_service.get_all(cursor="not-a-cursor")
+        self.assertEqual(context.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.mock_todo_repository.get_all.assert_not_called()
+
+    def test_count_none(self):
+        # Act & Assert
+        self.assertIsNone(self.todo_service.count(CountStrategy.NONE))
+        self.mock_todo_repository.count.assert_not_called()
+
+    def test_count_estimate(self):
+        # Arrange
+        self.mock_todo_repository.estimate_count.return_value = 1000
+
+        # Act & Assert
+        self.assertEqual(self.todo_service.count(CountStrategy.ESTIMATE), 1000)
+        self.mock_todo_repository.count.assert_not_called()
+
+    def test_count_estimate_falls_back_to_exact(self):
+        # Arrange
+        self.mock_todo_repository.estimate_count.return_value = None
+        self.mock_todo_repository.count.return_value = 7
+
+        # Act & Assert
+        self.assertEqual(self.todo_service.count(CountStrategy.ESTIMATE), 7)
+
+    @patch("app.services.todo_service.todo_count_cache", TTLCache(ttl=60))
+    def test_count_cached_until_write(self):
+        # Arrange
+        self.mock_todo_repository.count.return_value = 3
+        self.mock_todo_repository.create.return_value = self.mock_db_todo
+
+        # Act
+        first = self.todo_service.count(CountStrategy.CACHED)
+        second = self.todo_service.count(CountStrategy.CACHED)
+        self.todo_service.create(TodoInput(title="Test Todo", user_id=self.user_id))
+        third = self.todo_service.count(CountStrategy.CACHED)
+
+        # Assert
+        self.assertEqual((first, second, third), (3, 3, 3))
+        # Counted once, then again after the create dropped the cached value
+        self.assertEqual(self.mock_todo_repository.count.call_count, 2)
+
+    @patch("app.services.todo_service.settings.TODO_COUNT_STRATEGY", "none")
+    def test_count_defaults_to_settings(self):
+        # Act & Assert
+        self.assertIsNone(self.todo_service.count())
 
     def test_get_by_id(self):
         # Arrange
@@ -118,18 +311,129 @@ class TestTodoService(unittest.TestCase):
         self.assertEqual(result.completed, False)
         self.assertEqual(result.user_id, self.user_id)
 
+    def test_get_by_id_archived(self):
+        # Arrange
+        self.mock_todo_repository.get_by_id.return_value = None
+        self.mock_todo_repository.get_archived_by_id.return_value = self.mock_db_todo
+
+        # Act
+        result = self.todo_service.get_by_id(self.todo_id)
+
+        # Assert
+        self.mock_todo_repository.get_archived_by_id.assert_called_once_with(
+            self.todo_id
+        )
+        self.assertEqual(result.id, self.todo_id)
+
+    def test_get_all_with_fields(self):
+        # Arrange
+        self.mock_todo_repository.get_all.return_value = [
+            self.mock_db_todo,
+            self.mock_db_todo,
+        ]
+
+        # Act
+        result = self.todo_service.get_all(
+            page_size=1, count_strategy=CountStrategy.NONE, fields=" title, id,title"
+        )
+
+        # Assert: the cursor columns are read too, but only the fields returned
+        self.assertEqual(
+            self.mock_todo_repository.get_all.call_args.kwargs["columns"],
+            ("id", "title", "created_at"),
+        )
+        self.assertEqual(
+            result.model_dump(mode="json")["todos"],
+            [{"id": str(self.todo_id), "title": "Test Todo"}],
+        )
+        self.assertEqual(
+            decode_cursor(result.next_cursor), (self.created_at, self.todo_id)
+        )
+
+    def test_get_all_with_invalid_fields(self):
+        for fields in ["", " , ", "title,secret"]:
+            with self.subTest(fields=fields):
+                with self.assertRaises(HTTPException) as context:
+                    self.todo_service.get_all(fields=fields)
+
+                self.assertEqual(context.exception.status_code, 400)
+                self.assertIn("id, user_id, title", context.exception.detail)
+        self.mock_todo_repository.get_all.assert_not_called()
+
+    def test_get_by_id_with_fields(self):
+        # Arrange: the todo was archived
+        self.mock_todo_repository.get_columns_by_id.side_effect = [
+            None,
+            self.mock_db_todo,
+        ]
+
+        # Act
+        result = self.todo_service.get_by_id(self.todo_id, fields="completed")
+
+        # Assert
+        self.assertEqual(
+            self.mock_todo_repository.get_columns_by_id.call_args_list,
+            [
+                call(self.todo_id, ("completed",)),
+                call(self.todo_id, ("completed",), archived=True),
+            ],
+        )
+        self.mock_todo_repository.get_by_id.assert_not_called()
+        self.assertEqual(result.model_dump(), {"completed": False})
+
+    def test_get_by_id_with_fields_not_found(self):
+        self.mock_todo_repository.get_columns_by_id.return_value = None
+
+        with self.assertRaises(HTTPException) as context:
+            self.todo_service.get_by_id(self.todo_id, fields="title")
+
+        self.assertEqual(context.exception.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_by_id_not_found(self):
+        # Arrange
+        self.mock_todo_repository.get_by_id.return_value = None
+        self.mock_todo_repository.get_archived_by_id.return_value = None
+
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            self.todo_service.get_by_id(self.todo_id)
+        self.assertEqual(context.exception.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch("app.services.todo_service.utc_now")
+    def test_archive_completed(self, mock_utc_now):
+        # Arrange: two full batches and a partial one
+        mock_utc_now.return_value = datetime(2025, 3, 31)
+        self.mock_todo_repository.archive_completed.side_effect = [2, 2, 1]
+        cache = TTLCache(ttl=60)
+        cache.set("todos", 10)
+
+        # Act
+        with patch("app.services.todo_service.todo_count_cache", cache):
+            archived = self.todo_service.archive_completed(
+                older_than_days=30, batch_size=2
+            )
+
+        # Assert
+        self.assertEqual(archived, 5)
+        self.mock_todo_repository.archive_completed.assert_called_with(
+            datetime(2025, 3, 1), 2
+        )
+        self.assertEqual(self.mock_todo_repository.archive_completed.call_count, 3)
+        self.assertIsNone(cache.get("todos"))
+
     def test_delete(self):
         # Arrange
-        self.mock_todo_repository.exists_by_id.return_value = True
-        self.mock_todo_repository.get_by_id.return_value = self.mock_db_todo
+        mock_row = MagicMock()
+        mock_row._mapping = self.mock_db_todo.as_dict.return_value
+        self.mock_todo_repository.delete.return_value = mock_row
 
         # Act
         result = self.todo_service.delete(self.todo_id)
 
         # Assert
-        self.mock_todo_repository.exists_by_id.assert_called_once_with(self.todo_id)
-        self.mock_todo_repository.get_by_id.assert_called_once_with(self.todo_id)
-        self.mock_todo_repository.delete.assert_called_once_with(self.mock_db_todo)
+        self.mock_todo_repository.delete.assert_called_once_with(self.todo_id)
+        self.mock_todo_repository.exists_by_id.assert_not_called()
+        self.mock_todo_repository.get_by_id.assert_not_called()
         self.assertEqual(result.id, self.todo_id)
         self.assertEqual(result.title, "Test Todo")
         self.assertEqual(result.completed, False)
@@ -137,7 +441,7 @@ class TestTodoService(unittest.TestCase):
 
     def test_delete_not_found(self):
         # Arrange
-        self.mock_todo_repository.exists_by_id.return_value = False
+        self.mock_todo_repository.delete.return_value = None
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
@@ -152,22 +456,26 @@ class TestTodoService(unittest.TestCase):
         updated_input = TodoInput(
             title="Updated Todo", completed=True, user_id=self.user_id
         )
-        self.mock_todo_repository.exists_by_id.return_value = True
-        self.mock_todo_repository.get_by_id.return_value = self.mock_db_todo
-        self.mock_todo_repository.update.return_value = self.mock_db_todo
+        mock_row = MagicMock()
+        mock_row._mapping = {
+            **self.mock_db_todo.as_dict.return_value,
+            "title": "Updated Todo",
+            "completed": True,
+        }
+        self.mock_todo_repository.update.return_value = mock_row
 
         # Act
         result = self.todo_service.update(self.todo_id, updated_input)
 
         # Assert
-        self.mock_todo_repository.exists_by_id.assert_called_once_with(self.todo_id)
-        self.mock_todo_repository.get_by_id.assert_called_once_with(self.todo_id)
         self.mock_todo_repository.update.assert_called_once_with(
-            self.mock_db_todo, updated_input
+            self.todo_id, updated_input
         )
+        self.mock_todo_repository.exists_by_id.assert_not_called()
+        self.mock_todo_repository.get_by_id.assert_not_called()
         self.assertEqual(result.id, self.todo_id)
-        self.assertEqual(result.title, "Test Todo")
-        self.assertEqual(result.completed, False)
+        self.assertEqual(result.title, "Updated Todo")
+        self.assertEqual(result.completed, True)
         self.assertEqual(result.user_id, self.user_id)
 
     def test_update_not_found(self):
@@ -175,7 +483,7 @@ class TestTodoService(unittest.TestCase):
         updated_input = TodoInput(
             title="Updated Todo", completed=True, user_id=self.user_id
         )
-        self.mock_todo_repository.exists_by_id.return_value = False
+        self.mock_todo_repository.update.return_value = None
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
@@ -184,3 +492,262 @@ class TestTodoService(unittest.TestCase):
         self.assertEqual(
             context.exception.detail, f"Todo with ID {self.todo_id} not found"
         )
+        # Looked for in the archive, then given up on without a retry
+        self.mock_todo_repository.restore_archived.assert_called_once_with(
+            [self.todo_id]
+        )
+        self.mock_todo_repository.update.assert_called_once()
+
+    def test_update_restores_archived(self):
+        # Arrange
+        updated_input = TodoInput(
+            title="Updated Todo", completed=False, user_id=self.user_id
+        )
+        mock_row = MagicMock()
+        mock_row._mapping = self.mock_db_todo.as_dict.return_value
+        self.mock_todo_repository.update.side_effect = [None, mock_row]
+        self.mock_todo_repository.restore_archived.return_value = 1
+        cache = TTLCache(ttl=60)
+        cache.set(TODO_COUNT_CACHE_KEY, 10)
+
+        # Act
+        with patch("app.services.todo_service.todo_count_cache", cache):
+            result = self.todo_service.update(self.todo_id, updated_input)
+
+        # Assert: retried once restored, and the hot table count changed
+        self.assertEqual(result.id, self.todo_id)
+        self.assertEqual(self.mock_todo_repository.update.call_count, 2)
+        self.assertIsNone(cache.get(TODO_COUNT_CACHE_KEY))
+
+    def test_create_many(self):
+        # Arrange
+        todo_input = TodoInput(title="Test Todo", user_id=self.user_id)
+        self.mock_todo_repository.create_many.return_value = [self.mock_db_todo]
+
+        # Act
+        result = self.todo_service.create_many([todo_input])
+
+        # Assert
+        self.mock_todo_repository.create_many.assert_called_once_with([todo_input])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].id, self.todo_id)
+        self.assertEqual(result[0].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(result[0].todo.title, "Test Todo")
+
+    def test_update_many(self):
+        # Arrange
+        missing_id = UUID("1b4e28ba-2fa1-41d2-883f-0016d3cca427")
+        items = [
+            TodoBulkUpdateItem(id=missing_id, completed=True),
+            TodoBulkUpdateItem(id=self.todo_id, completed=True),
+        ]
+        self.mock_todo_repository.update_many.return_value = [
+            {**self.mock_db_todo.as_dict.return_value, "completed": True}
+        ]
+
+        # Act
+        result = self.todo_service.update_many(items)
+
+        # Assert
+        self.mock_todo_repository.update_many.assert_called_once_with(items)
+        self.assertEqual([item.id for item in result], [missing_id, self.todo_id])
+        self.assertEqual(result[0].status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(result[0].detail, f"Todo with ID {missing_id} not found")
+        self.assertIsNone(result[0].todo)
+        self.assertEqual(result[1].status_code, status.HTTP_200_OK)
+        self.assertTrue(result[1].todo.completed)
+
+    def test_delete_many(self):
+        # Arrange
+        missing_id = UUID("1b4e28ba-2fa1-41d2-883f-0016d3cca427")
+        mock_row = MagicMock()
+        mock_row.id = self.todo_id
+        mock_row._mapping = self.mock_db_todo.as_dict.return_value
+        self.mock_todo_repository.delete_many.return_value = [mock_row]
+
+        # Act
+        result = self.todo_service.delete_many([self.todo_id, missing_id, self.todo_id])
+
+        # Assert: the repeated id is deleted once and reported once
+        self.mock_todo_repository.delete_many.assert_called_once_with(
+            [self.todo_id, missing_id]
+        )
+        self.assertEqual(
+            [item.status_code for item in result],
+            [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND, status.HTTP_404_NOT_FOUND],
+        )
+        self.assertEqual(result[0].todo.id, self.todo_id)
+
+    def test_import_batch(self):
+        # Arrange
+        todo_count_cache.set(TODO_COUNT_CACHE_KEY, 10)
+        records = [
+            (1, b'{"title": "From JSON", "completed": true}'),
+            (2, {"title": "From CSV", "completed": "false"}),
+            (3, {"title": ""}),
+            (4, RecordError("Record is too long")),
+        ]
+
+        # Act
+        imported, errors = self.todo_service.import_batch(self.user_id, records)
+
+        # Assert: only the valid records are inserted
+        self.assertEqual(imported, 2)
+        user_id, items = self.mock_todo_repository.import_many.call_args[0]
+        self.assertEqual(user_id, self.user_id)
+        self.assertEqual(
+            [(item.title, item.completed) for item in items],
+            [("From JSON", True), ("From CSV", False)],
+        )
+        self.assertEqual(
+            [(error.line, error.detail) for error in errors],
+            [
+                (3, "title: String should have at least 1 character"),
+                (4, "Record is too long"),
+            ],
+        )
+        self.assertIsNone(todo_count_cache.get(TODO_COUNT_CACHE_KEY))
+
+    def test_import_batch_without_valid_records(self):
+        imported, errors = self.todo_service.import_batch(self.user_id, [(1, b"{}")])
+
+        self.assertEqual((imported, len(errors)), (0, 1))
+        self.mock_todo_repository.import_many.assert_not_called()
+
+
+class TestAsyncTodoService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        # Mock the AsyncSession and run sync callables on a mocked Session
+        self.mock_session = MagicMock(spec=Session)
+        self.mock_async_session = MagicMock(spec=AsyncSession)
+        self.mock_async_session.run_sync = AsyncMock(
+            side_effect=lambda fn: fn(self.mock_session)
+        )
+        self.todo_service = AsyncTodoService(self.mock_async_session)
+
+        # Patch the sync TodoService the async service delegates to
+        self.mock_todo_service = patch("app.services.todo_service.TodoService").start()
+        self.mock_todo_service_instance = self.mock_todo_service.return_value
+
+        self.todo_id = UUID("c9bf9e57-1685-4c89-bafb-ff5af830be8a")
+        self.user_id = UUID("f47ac10b-58cc-4372-a567-0e02b2c3d479")
+        self.todo_input = TodoInput(
+            title="Test Todo", completed=False, user_id=self.user_id
+        )
+
+    def tearDown(self):
+        # Stop all patches
+        patch.stopall()
+
+    async def test_create(self):
+        # Act
+        result = await self.todo_service.create(self.todo_input)
+
+        # Assert
+        self.mock_async_session.run_sync.assert_awaited_once()
+        self.mock_todo_service.assert_called_once_with(self.mock_session)
+        self.mock_todo_service_instance.create.assert_called_once_with(self.todo_input)
+        self.assertEqual(result, self.mock_todo_service_instance.create.return_value)
+
+    async def test_get_all(self):
+        # Act
+        result = await self.todo_service.get_all(
+            page=2, page_size=10, count_strategy=CountStrategy.NONE
+        )
+
+        # Assert
+        self.mock_todo_service_instance.get_all.assert_called_once_with(
+            page=2,
+            page_size=10,
+            cursor=None,
+            count_strategy=CountStrategy.NONE,
+            fields=None,
+        )
+        self.assertEqual(result, self.mock_todo_service_instance.get_all.return_value)
+
+    async def test_get_all_for_user(self):
+        # Act
+        result = await self.todo_service.get_all_for_user(self.user_id, completed=True)
+
+        # Assert
+        self.mock_todo_service_instance.get_all_for_user.assert_called_once_with(
+            self.user_id,
+            page_size=15,
+            cursor=None,
+            completed=True,
+            created_from=None,
+            created_to=None,
+        )
+        self.assertEqual(
+            result, self.mock_todo_service_instance.get_all_for_user.return_value
+        )
+
+    async def test_search(self):
+        # Act
+        result = await self.todo_service.search(self.user_id, "milk", page=3)
+
+        # Assert
+        self.mock_todo_service_instance.search.assert_called_once_with(
+            self.user_id, "milk", page=3, page_size=15
+        )
+        self.assertEqual(result, self.mock_todo_service_instance.search.return_value)
+
+    async def test_get_stats(self):
+        # Act
+        result = await self.todo_service.get_stats(self.user_id)
+
+        # Assert
+        self.mock_todo_service_instance.get_stats.assert_called_once_with(self.user_id)
+        self.assertEqual(result, self.mock_todo_service_instance.get_stats.return_value)
+
+    async def test_get_by_id(self):
+        # Act
+        await self.todo_service.get_by_id(self.todo_id)
+
+        # Assert
+        self.mock_todo_service_instance.get_by_id.assert_called_once_with(
+            self.todo_id, fields=None
+        )
+
+    async def test_archive_completed(self):
+        # Act
+        await self.todo_service.archive_completed(older_than_days=7, batch_size=50)
+
+        # Assert
+        self.mock_todo_service_instance.archive_completed.assert_called_once_with(7, 50)
+
+    async def test_delete(self):
+        # Act
+        await self.todo_service.delete(self.todo_id)
+
+        # Assert
+        self.mock_todo_service_instance.delete.assert_called_once_with(self.todo_id)
+
+    async def test_update(self):
+        # Act
+        await self.todo_service.update(self.todo_id, self.todo_input)
+
+        # Assert
+        self.mock_todo_service_instance.update.assert_called_once_with(
+            self.todo_id, self.todo_input
+        )
+
+    async def test_bulk(self):
+        # Arrange
+        items = [TodoBulkUpdateItem(id=self.todo_id, completed=True)]
+
+        # Act
+        await self.todo_service.create_many([self.todo_input])
+        await self.todo_service.update_many(items)
+        await self.todo_service.delete_many([self.todo_id])
+
+        # Assert
+        self.assertEqual(self.mock_async_session.run_sync.await_count, 3)
+        self.mock_todo_service_instance.create_many.assert_called_once_with(
+            [self.todo_input]
+        )
+        self.mock_todo_service_instance.update_many.assert_called_once_with(items)
+        self.mock_todo_service_instance.delete_many.assert_called_once_with(
+            [self.todo_id]
+        )
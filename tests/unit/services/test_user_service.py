@@ -1,15 +1,23 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from uuid import UUID
 from datetime import datetime
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.security import get_password_hash
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import UserRepository, AsyncUserRepository
 from app.schemas.user import UserRegister, UserLogin, UserInDBBase
-from app.services.user_service import UserService
+from app.services.user_service import UserService, AsyncUserService
+
+
+def unique_violation(name: str) -> IntegrityError:
+    return IntegrityError(
+        "INSERT INTO users ...", {}, Exception(f"UNIQUE constraint failed: {name}")
+    )
 
 
 class TestUserService(unittest.TestCase):
@@ -61,8 +69,6 @@ class TestUserService(unittest.TestCase):
         user_register = UserRegister(
             email=self.email, username=self.username, password=self.password
         )
-        self.mock_user_repository.user_exists_by_email.return_value = False
-        self.mock_user_repository.user_exists_by_username.return_value = False
         self.mock_user_repository.create.return_value = self.mock_db_user
 
         # Mock the get_password_hash function to return a consistent value
@@ -75,12 +81,8 @@ class TestUserService(unittest.TestCase):
         mock_validate_password.assert_called_once_with(self.password)
         mock_validate_password.assert_called_once_with(self.password)
         mock_validate_email.assert_called_once_with(self.email)
-        self.mock_user_repository.user_exists_by_email.assert_called_once_with(
-            self.email
-        )
-        self.mock_user_repository.user_exists_by_username.assert_called_once_with(
-            self.username
-        )
+        self.mock_user_repository.user_exists_by_email.assert_not_called()
+        self.mock_user_repository.user_exists_by_username.assert_not_called()
         self.mock_user_repository.create.assert_called_once_with(
             user_register, self.hashed_password
         )
@@ -97,7 +99,7 @@ class TestUserService(unittest.TestCase):
         user_register = UserRegister(
             email=self.email, username=self.username, password=self.password
         )
-        self.mock_user_repository.user_exists_by_email.return_value = True
+        self.mock_user_repository.create.side_effect = unique_violation("users.email")
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
@@ -117,7 +119,9 @@ class TestUserService(unittest.TestCase):
             email=self.email, username=self.username, password=self.password
         )
         self.mock_user_repository.user_exists_by_email.return_value = False
-        self.mock_user_repository.user_exists_by_username.return_value = True
+        self.mock_user_repository.create.side_effect = unique_violation(
+            "users.username"
+        )
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
@@ -127,6 +131,23 @@ class TestUserService(unittest.TestCase):
             context.exception.detail, f"Username {self.username} already registered"
         )
 
+    @patch("app.services.user_service.validate_password")
+    @patch("app.services.user_service.validate_email")
+    def test_create_other_integrity_error(
+        self, mock_validate_email, mock_validate_password
+    ):
+        # Arrange
+        user_register = UserRegister(
+            email=self.email, username=self.username, password=self.password
+        )
+        self.mock_user_repository.create.side_effect = IntegrityError(
+            "INSERT INTO users ...", {}, Exception("NOT NULL constraint failed")
+        )
+
+        # Act & Assert
+        with self.assertRaises(IntegrityError):
+            self.user_service.create(user_register)
+
     @patch("app.services.user_service.pwd_context")
     @patch("app.services.user_service.create_access_token")
     @patch("app.services.user_service.DateTimeHelper")
@@ -171,24 +192,21 @@ class TestUserService(unittest.TestCase):
 
     def test_is_superuser(self):
         # Arrange
-        self.mock_user_repository.user_exists_by_id.return_value = True
-        self.mock_user_repository.get_user_object_by_id.return_value = self.mock_db_user
+        self.mock_user_repository.get_superuser_flag.return_value = False
 
         # Act
         result = self.user_service.is_superuser(self.user_id)
 
         # Assert
-        self.mock_user_repository.user_exists_by_id.assert_called_once_with(
-            self.user_id
-        )
-        self.mock_user_repository.get_user_object_by_id.assert_called_once_with(
+        self.mock_user_repository.get_superuser_flag.assert_called_once_with(
             self.user_id
         )
+        self.mock_user_repository.user_exists_by_id.assert_not_called()
         self.assertFalse(result)
 
     def test_is_superuser_user_not_found(self):
         # Arrange
-        self.mock_user_repository.user_exists_by_id.return_value = False
+        self.mock_user_repository.get_superuser_flag.return_value = None
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
@@ -198,28 +216,172 @@ class TestUserService(unittest.TestCase):
 
     def test_delete_user(self):
         # Arrange
-        self.mock_user_repository.user_exists_by_id.return_value = True
-        self.mock_user_repository.get_user_object_by_id.return_value = self.mock_db_user
+        self.mock_user_repository.delete_user.return_value = True
 
         # Act
         result = self.user_service.delete_user(self.user_id)
 
         # Assert
-        self.mock_user_repository.user_exists_by_id.assert_called_once_with(
-            self.user_id
-        )
-        self.mock_user_repository.get_user_object_by_id.assert_called_once_with(
-            self.user_id
-        )
-        self.mock_user_repository.delete_user.assert_called_once_with(self.mock_db_user)
+        self.mock_user_repository.delete_user.assert_called_once_with(self.user_id)
+        self.mock_user_repository.user_exists_by_id.assert_not_called()
         self.assertTrue(result)
 
     def test_delete_user_not_found(self):
         # Arrange
-        self.mock_user_repository.user_exists_by_id.return_value = False
+        self.mock_user_repository.delete_user.return_value = False
 
         # Act & Assert
         with self.assertRaises(HTTPException) as context:
             self.user_service.delete_user(self.user_id)
         self.assertEqual(context.exception.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(context.exception.detail, f"User {self.user_id} not found")
+
+
+class TestAsyncUserService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        # Mock the AsyncSession and run sync callables on a mocked Session
+        self.mock_session = MagicMock(spec=Session)
+        self.mock_async_session = MagicMock(spec=AsyncSession)
+        self.mock_async_session.run_sync = AsyncMock(
+            side_effect=lambda fn: fn(self.mock_session)
+        )
+
+        # Mock the AsyncUserRepository
+        self.mock_user_repository = AsyncMock(spec=AsyncUserRepository)
+
+        # Initialize the AsyncUserService with mocked dependencies
+        self.user_service = AsyncUserService(self.mock_async_session)
+        self.user_service.repository = self.mock_user_repository
+
+        # Common mock data
+        self.user_id = UUID("f47ac10b-58cc-4372-a567-0e02b2c3d479")
+        self.email = "test@example.com"
+        self.username = "testuser"
+        self.password = "Password@123"
+
+        # Mock User instance
+        self.mock_db_user = MagicMock()
+        self.mock_db_user.email = self.email
+        self.mock_db_user.hashed_password = "hashed_password"
+        self.mock_db_user.as_dict.return_value = {
+            "id": self.user_id,
+            "email": self.email,
+            "username": self.username,
+            "is_superuser": False,
+        }
+
+    def tearDown(self):
+        # Stop all patches
+        patch.stopall()
+
+    @patch("app.services.user_service.get_password_hash")
+    async def test_create(self, mock_get_password_hash):
+        # Arrange
+        user_register = UserRegister(
+            email=self.email, username=self.username, password=self.password
+        )
+        self.mock_user_repository.create.return_value = self.mock_db_user
+        mock_get_password_hash.return_value = "hashed_password"
+
+        # Act
+        result = await self.user_service.create(user_register)
+
+        # Assert
+        mock_get_password_hash.assert_called_once_with(self.password)
+        self.mock_user_repository.create.assert_awaited_once_with(
+            user_register, "hashed_password"
+        )
+        self.assertEqual(result.id, self.user_id)
+        self.assertEqual(result.email, self.email)
+
+    async def test_create_email_already_registered(self):
+        # Arrange
+        user_register = UserRegister(
+            email=self.email, username=self.username, password=self.password
+        )
+        self.mock_user_repository.create.side_effect = unique_violation("users.email")
+
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            await self.user_service.create(user_register)
+        self.assertEqual(context.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            context.exception.detail, f"Email {self.email} already registered"
+        )
+
+    async def test_create_username_already_registered(self):
+        # Arrange
+        user_register = UserRegister(
+            email=self.email, username=self.username, password=self.password
+        )
+        self.mock_user_repository.user_exists_by_email.return_value = False
+        self.mock_user_repository.create.side_effect = unique_violation(
+            "users.username"
+        )
+
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            await self.user_service.create(user_register)
+        self.assertEqual(context.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            context.exception.detail, f"Username {self.username} already registered"
+        )
+
+    @patch("app.services.user_service.pwd_context")
+    @patch("app.services.user_service.create_access_token")
+    async def test_login(self, mock_create_access_token, mock_pwd_context):
+        # Arrange
+        user_login = UserLogin(email=self.email, password=self.password)
+        self.mock_user_repository.get_user_by_email.return_value = self.mock_db_user
+        mock_pwd_context.verify.return_value = True
+        mock_create_access_token.return_value = "mock_access_token"
+
+        # Act
+        result = await self.user_service.login(user_login)
+
+        # Assert
+        self.mock_user_repository.get_user_by_email.assert_awaited_once_with(self.email)
+        mock_pwd_context.verify.assert_called_once_with(
+            self.password, "hashed_password"
+        )
+        self.assertEqual(result["access_token"], "mock_access_token")
+        self.assertEqual(result["token_type"], "bearer")
+
+    async def test_login_incorrect_email_or_password(self):
+        # Arrange
+        user_login = UserLogin(email=self.email, password=self.password)
+        self.mock_user_repository.get_user_by_email.return_value = None
+
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            await self.user_service.login(user_login)
+        self.assertEqual(context.exception.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(context.exception.detail, "Incorrect email or password")
+
+    @patch("app.services.user_service.UserService")
+    async def test_is_superuser(self, mock_user_service):
+        # Arrange
+        mock_user_service.return_value.is_superuser.return_value = True
+
+        # Act
+        result = await self.user_service.is_superuser(self.user_id)
+
+        # Assert
+        mock_user_service.assert_called_once_with(self.mock_session)
+        mock_user_service.return_value.is_superuser.assert_called_once_with(
+            self.user_id
+        )
+        self.assertTrue(result)
+
+    @patch("app.services.user_service.UserService")
+    async def test_delete_user(self, mock_user_service):
+        # Arrange
+        mock_user_service.return_value.delete_user.return_value = True
+
+        # Act
+        result = await self.user_service.delete_user(self.user_id)
+
+        # Assert
+        mock_user_service.return_value.delete_user.assert_called_once_with(self.user_id)
+        self.assertTrue(result)
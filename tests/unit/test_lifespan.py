@@ -1,15 +1,15 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 from fastapi import FastAPI
 
 from app.lifespan import lifespan
 
 
 @patch("app.lifespan.logger.info")
-@patch("app.lifespan.create_tables")
+@patch("app.lifespan.check_schema")
 class TestLifespan(unittest.IsolatedAsyncioTestCase):
 
-    async def test_lifespan(self, mock_create_tables, mock_logger_info):
+    async def test_lifespan(self, mock_check_schema, mock_logger_info):
         # Create a mock FastAPI app
         app = FastAPI()
         # Call the lifespan function
@@ -17,8 +17,52 @@ class TestLifespan(unittest.IsolatedAsyncioTestCase):
             pass  # The application runs here
 
         # Verify startup logic
-        mock_logger_info.assert_any_call("Creating database tables...")
-        mock_create_tables.assert_called_once()
+        mock_logger_info.assert_any_call("Checking database schema version...")
+        mock_check_schema.assert_called_once()
 
         # Verify shutdown logic
         mock_logger_info.assert_any_call("Shutting down...")
+
+    @patch("app.lifespan.sqlite_maintenance_loop", new_callable=AsyncMock)
+    @patch("app.lifespan.settings.SQLITE_MAINTENANCE_INTERVAL", 60)
+    async def test_lifespan_sqlite_maintenance(
+        self, mock_maintenance_loop, mock_check_schema, mock_logger_info
+    ):
+        async with lifespan(FastAPI()) as _:
+            pass
+
+        mock_logger_info.assert_any_call("Starting SQLite maintenance task...")
+        mock_maintenance_loop.assert_called_once()
+        self.assertEqual(mock_maintenance_loop.call_args[0][1], 60)
+
+    @patch("app.lifespan.sqlite_maintenance_loop", new_callable=AsyncMock)
+    @patch("app.lifespan.settings.SQLITE_MAINTENANCE_INTERVAL", 0)
+    async def test_lifespan_sqlite_maintenance_disabled(
+        self, mock_maintenance_loop, mock_check_schema, mock_logger_info
+    ):
+        async with lifespan(FastAPI()) as _:
+            pass
+
+        mock_maintenance_loop.assert_not_called()
+
+    @patch("app.lifespan.todo_archive_loop", new_callable=AsyncMock)
+    @patch("app.lifespan.settings.TODO_ARCHIVE_INTERVAL", 600)
+    async def test_lifespan_todo_archiver(
+        self, mock_archive_loop, mock_check_schema, mock_logger_info
+    ):
+        async with lifespan(FastAPI()) as _:
+            pass
+
+        mock_logger_info.assert_any_call("Starting todo archiver task...")
+        mock_archive_loop.assert_called_once()
+        self.assertEqual(mock_archive_loop.call_args[0][1], 600)
+
+    @patch("app.lifespan.todo_archive_loop", new_callable=AsyncMock)
+    @patch("app.lifespan.settings.TODO_ARCHIVE_INTERVAL", 0)
+    async def test_lifespan_todo_archiver_disabled(
+        self, mock_archive_loop, mock_check_schema, mock_logger_info
+    ):
+        async with lifespan(FastAPI()) as _:
+            pass
+
+        mock_archive_loop.assert_not_called()
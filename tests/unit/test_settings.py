@@ -26,6 +26,30 @@ class TestSettings(unittest.TestCase):
                 "VERSION": "2.0.0",
                 "NICKNAME": "customapi",
                 "SQLITE_CONNECTION_STRING": "sqlite:///custom.db",
+                "DB_POOL_SIZE": "20",
+                "DB_MAX_OVERFLOW": "0",
+                "DB_POOL_TIMEOUT": "2.5",
+                "DB_POOL_RECYCLE": "1800",
+                "DB_POOL_PRE_PING": "True",
+                "DB_POOL_USE_LIFO": "True",
+                "TODO_BULK_MAX_ITEMS": "50",
+                "TODO_ARCHIVE_AFTER_DAYS": "7",
+                "TODO_ARCHIVE_INTERVAL": "600",
+                "TODO_ARCHIVE_BATCH_SIZE": "200",
+                "TODO_EXPORT_BATCH_SIZE": "500",
+                "TODO_IMPORT_BATCH_SIZE": "250",
+                "TODO_IMPORT_MAX_RECORD_BYTES": "1024",
+                "TODO_IMPORT_MAX_ERRORS": "10",
+                "DB_REPLICA_URLS": "sqlite:///replica_a.db,sqlite:///replica_b.db",
+                "DB_READ_YOUR_WRITES_WINDOW": "2.5",
+                "SQLITE_PRAGMAS_ENABLED": "False",
+                "SQLITE_JOURNAL_MODE": "DELETE",
+                "SQLITE_CACHE_SIZE": "-2000",
+                "SQLITE_MAINTENANCE_INTERVAL": "0",
+                "DB_AUTO_MIGRATE": "False",
+                "JSON_RESPONSE_ENCODER": "orjson",
+                "COMPRESSION_LEVEL": "9",
+                "COMPRESSION_MINIMUM_SIZE": "512",
                 "SECRET_KEY": "custom_secret",
                 "ALGORITHM": "RS256",
                 "ACCESS_TOKEN_EXPIRE_MINUTES": "7200",
@@ -47,6 +71,32 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(settings.VERSION, "2.0.0")
         self.assertEqual(settings.NICKNAME, "customapi")
         self.assertEqual(settings.SQLITE_CONNECTION_STRING, "sqlite:///custom.db")
+        self.assertEqual(settings.DB_POOL_SIZE, 20)
+        self.assertEqual(settings.DB_MAX_OVERFLOW, 0)
+        self.assertEqual(settings.DB_POOL_TIMEOUT, 2.5)
+        self.assertEqual(settings.DB_POOL_RECYCLE, 1800)
+        self.assertTrue(settings.DB_POOL_PRE_PING)
+        self.assertTrue(settings.DB_POOL_USE_LIFO)
+        self.assertEqual(settings.TODO_BULK_MAX_ITEMS, 50)
+        self.assertEqual(settings.TODO_ARCHIVE_AFTER_DAYS, 7)
+        self.assertEqual(settings.TODO_ARCHIVE_INTERVAL, 600)
+        self.assertEqual(settings.TODO_ARCHIVE_BATCH_SIZE, 200)
+        self.assertEqual(settings.TODO_EXPORT_BATCH_SIZE, 500)
+        self.assertEqual(settings.TODO_IMPORT_BATCH_SIZE, 250)
+        self.assertEqual(settings.TODO_IMPORT_MAX_RECORD_BYTES, 1024)
+        self.assertEqual(settings.TODO_IMPORT_MAX_ERRORS, 10)
+        self.assertEqual(
+            settings.DB_REPLICA_URLS, "sqlite:///replica_a.db,sqlite:///replica_b.db"
+        )
+        self.assertEqual(settings.DB_READ_YOUR_WRITES_WINDOW, 2.5)
+        self.assertFalse(settings.SQLITE_PRAGMAS_ENABLED)
+        self.assertEqual(settings.SQLITE_JOURNAL_MODE, "DELETE")
+        self.assertEqual(settings.SQLITE_CACHE_SIZE, -2000)
+        self.assertEqual(settings.SQLITE_MAINTENANCE_INTERVAL, 0)
+        self.assertFalse(settings.DB_AUTO_MIGRATE)
+        self.assertEqual(settings.JSON_RESPONSE_ENCODER, "orjson")
+        self.assertEqual(settings.COMPRESSION_LEVEL, 9)
+        self.assertEqual(settings.COMPRESSION_MINIMUM_SIZE, 512)
         self.assertEqual(settings.SECRET_KEY, "custom_secret")
         self.assertEqual(settings.ALGORITHM, "RS256")
         self.assertEqual(settings.ACCESS_TOKEN_EXPIRE_MINUTES, 7200)
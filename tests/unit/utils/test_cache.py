@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import patch
+
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TTLCache(ttl=10)
+
+    def test_get_missing_key(self):
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.get("missing", 0), 0)
+
+    @patch("app.utils.cache.time.monotonic")
+    def test_entry_expires_after_ttl(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        self.cache.set("key", "value")
+
+        mock_monotonic.return_value = 109.9
+        self.assertEqual(self.cache.get("key"), "value")
+
+        mock_monotonic.return_value = 110.0
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_invalidate_key(self):
+        self.cache.set("key", "value")
+        self.cache.set("other", "value")
+
+        self.cache.invalidate("key")
+
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(self.cache.get("other"), "value")
+
+    def test_invalidate_all(self):
+        self.cache.set("key", "value")
+        self.cache.set("other", "value")
+
+        self.cache.invalidate()
+
+        self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(self.cache.get("other"))
@@ -0,0 +1,26 @@
+import unittest
+from datetime import datetime
+from uuid import UUID
+
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.created_at = datetime(2025, 2, 19, 12, 0, 0, 123456)
+        self.todo_id = UUID("c9bf9e57-1685-4c89-bafb-ff5af830be8a")
+
+    def test_round_trip(self):
+        cursor = encode_cursor(self.created_at, self.todo_id)
+        self.assertEqual(decode_cursor(cursor), (self.created_at, self.todo_id))
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(self.created_at, self.todo_id)
+        self.assertNotIn("+", cursor)
+        self.assertNotIn("/", cursor)
+
+    def test_decode_invalid_cursor(self):
+        for cursor in ["not-a-cursor", "", encode_cursor(self.created_at, "x")]:
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
@@ -0,0 +1,114 @@
+import unittest
+
+from app.utils.records import (
+    RecordError,
+    iter_csv_records,
+    iter_lines,
+    iter_ndjson_records,
+)
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestIterLines(unittest.IsolatedAsyncioTestCase):
+
+    async def test_lines_across_chunks(self):
+        # Act
+        lines = await collect(
+            iter_lines(stream(b"first\r\nsec", b"ond\n", b"\nthi", b"rd"), 100)
+        )
+
+        # Assert: line endings are dropped, the last line needs none
+        self.assertEqual(lines, [b"first", b"second", b"", b"third"])
+
+    async def test_long_lines_are_dropped(self):
+        # Act
+        lines = await collect(
+            iter_lines(stream(b"short\n0123", b"456789", b"\nok\n", b"x" * 20), 8)
+        )
+
+        # Assert
+        self.assertEqual(lines, [b"short", None, b"ok", None])
+
+
+class TestIterNdjsonRecords(unittest.IsolatedAsyncioTestCase):
+
+    async def test_records(self):
+        # Act
+        records = await collect(
+            iter_ndjson_records(stream(b'{"title": "a"}', b"  ", None, b"[]"))
+        )
+
+        # Assert: blank lines are skipped but counted
+        self.assertEqual(records[0], (1, b'{"title": "a"}'))
+        self.assertEqual(records[1][0], 3)
+        self.assertIsInstance(records[1][1], RecordError)
+        self.assertEqual(records[2], (4, b"[]"))
+
+
+class TestIterCsvRecords(unittest.IsolatedAsyncioTestCase):
+
+    async def _records(self, *lines, max_length=100):
+        return await collect(iter_csv_records(stream(*lines), max_length))
+
+    async def test_records(self):
+        # Act
+        records = await self._records(
+            "﻿title,completed".encode(),
+            b'"Buy milk, eggs",true',
+            b"",
+            b'"Two',
+            b'lines ""quoted""",false',
+            "Café,false".encode(),
+        )
+
+        # Assert
+        self.assertEqual(
+            records,
+            [
+                (1, ["title", "completed"]),
+                (2, ["Buy milk, eggs", "true"]),
+                (4, ['Two\nlines "quoted"', "false"]),
+                (6, ["Café", "false"]),
+            ],
+        )
+
+    async def test_bad_records_are_reported(self):
+        # Act
+        records = await self._records(
+            b"title",
+            b"\xff",
+            b"x" * 20,
+            b'"a"b',
+            b"ok",
+            b'"open',
+            max_length=10,
+        )
+
+        # Assert
+        self.assertEqual([line for line, _ in records], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(records[4][1], ["ok"])
+        errors = [str(record) for _, record in records if isinstance(record, Exception)]
+        self.assertEqual(len(errors), 4)
+        self.assertIn("not UTF-8", errors[0])
+        self.assertEqual(errors[1], "Record is too long")
+        self.assertIn("Malformed CSV record", errors[2])
+        self.assertEqual(errors[3], "Quoted field is not closed")
+
+    async def test_long_multiline_record(self):
+        # Act
+        records = await self._records(
+            b'"first', b"second", b'third"', b"ok", max_length=12
+        )
+
+        # Assert: reported on the line the record starts on
+        line, error = records[0]
+        self.assertEqual(line, 1)
+        self.assertEqual(str(error), "Record is too long")
@@ -0,0 +1,226 @@
+import unittest
+import uuid
+from unittest.mock import patch
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, FastAPI, Query, Response, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, get_request_handler, serialize_response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_validator
+
+from app.schemas.response import CommonResponse
+from app.utils.responses import (
+    JSON_RESPONSE_CLASSES,
+    ModelRoute,
+    ORJSONResponse,
+    PydanticJSONResponse,
+    get_json_response_class,
+)
+
+validations = []
+
+
+class Item(BaseModel):
+    id: uuid.UUID
+    title: str
+    created_at: datetime
+    note: Optional[str] = None
+
+    @field_validator("title")
+    @classmethod
+    def count_validation(cls, value):
+        validations.append(value)
+        return value
+
+
+class ItemWithSecret(Item):
+    secret: str
+
+
+ITEM_ID = uuid.UUID("0190b3e2-7f4a-7c3e-9b1a-2f6d8e4c5a10")
+CREATED_AT = datetime(2025, 1, 2, 3, 4, 5, 678901)
+
+
+def build_app(route_class, default_response_class=JSONResponse):
+    router = APIRouter(route_class=route_class)
+
+    @router.post(
+        "/items",
+        status_code=status.HTTP_201_CREATED,
+        response_model=CommonResponse[Item],
+    )
+    async def create_item(title: str = Query("Ünïcode")):
+        item = Item(id=ITEM_ID, title=title, created_at=CREATED_AT)
+        return CommonResponse[Item](message="Item is created.", data=item)
+
+    @router.get("/items/secret", response_model=Item)
+    async def get_secret_item():
+        return ItemWithSecret(
+            id=ITEM_ID, title="Secret", created_at=CREATED_AT, secret="hunter2"
+        )
+
+    @router.get("/items/sync", response_model=Item)
+    def get_item_sync():
+        return Item(id=ITEM_ID, title="Sync", created_at=CREATED_AT)
+
+    @router.get("/items/sparse", response_model=Item, response_model_exclude_none=True)
+    async def get_sparse_item():
+        return Item(id=ITEM_ID, title="Sparse", created_at=CREATED_AT)
+
+    def set_cookie(response: Response):
+        response.set_cookie("marker", "1")
+
+    @router.get(
+        "/items/cookie", response_model=Item, dependencies=[Depends(set_cookie)]
+    )
+    async def get_item_with_cookie():
+        return Item(id=ITEM_ID, title="Cookie", created_at=CREATED_AT)
+
+    @router.get("/items/accepted", response_model=Item)
+    async def get_accepted_item(response: Response):
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["X-Item"] = "accepted"
+        return Item(id=ITEM_ID, title="Accepted", created_at=CREATED_AT)
+
+    app = FastAPI(default_response_class=default_response_class)
+    app.include_router(router)
+    return app
+
+
+class TestModelRoute(unittest.TestCase):
+
+    def setUp(self):
+        validations.clear()
+        self.client = TestClient(build_app(ModelRoute))
+        self.default_client = TestClient(build_app(APIRoute))
+
+    def test_same_response_as_fastapi(self):
+        for method, path in [
+            ("post", "/items"),
+            ("get", "/items/secret"),
+            ("get", "/items/sync"),
+            ("get", "/items/sparse"),
+            ("get", "/items/cookie"),
+            ("get", "/items/accepted"),
+        ]:
+            with self.subTest(path=path):
+                response = self.client.request(method, path)
+                expected = self.default_client.request(method, path)
+
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response.headers, expected.headers)
+
+    def test_model_is_serialized_once(self):
+        # Act
+        with patch(
+            "fastapi.routing.serialize_response", wraps=serialize_response
+        ) as mock_serialize_response:
+            response = self.client.post("/items")
+            secret_response = self.client.get("/items/secret")
+
+        # Assert: only the subclass went through FastAPI's serialization
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(secret_response.status_code, status.HTTP_200_OK)
+        mock_serialize_response.assert_called_once()
+        self.assertEqual(validations, ["Ünïcode", "Secret"])
+
+    def test_response_parameter_headers_are_kept(self):
+        # Act
+        with patch(
+            "fastapi.routing.serialize_response", wraps=serialize_response
+        ) as mock_serialize_response:
+            response = self.client.get("/items/cookie")
+            accepted_response = self.client.get("/items/accepted")
+
+        # Assert: still rendered by the response class
+        mock_serialize_response.assert_not_called()
+        self.assertEqual(response.cookies["marker"], "1")
+        self.assertEqual(accepted_response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(accepted_response.headers["x-item"], "accepted")
+
+    def test_subclasses_are_still_filtered(self):
+        response = self.client.get("/items/secret")
+
+        self.assertNotIn("secret", response.json())
+
+    def test_route_dependant_is_not_replaced(self):
+        # Arrange
+        route = next(
+            route
+            for route in self.client.app.routes
+            if getattr(route, "path", None) == "/items/accepted"
+        )
+        dependant = route.dependant
+        seen = []
+
+        def record_dependant(**kwargs):
+            seen.append((route.dependant, kwargs["dependant"].call))
+            return get_request_handler(**kwargs)
+
+        # Act
+        with patch(
+            "app.utils.responses.get_request_handler", side_effect=record_dependant
+        ):
+            route.get_route_handler()
+
+        # Assert: the handler is built from a copy, the route is left alone
+        self.assertEqual(len(seen), 1)
+        self.assertIs(seen[0][0], dependant)
+        self.assertIsNot(seen[0][1], dependant.call)
+        self.assertIs(route.dependant, dependant)
+
+    def test_openapi_schema_is_unchanged(self):
+        self.assertEqual(self.client.app.openapi(), self.default_client.app.openapi())
+
+    def test_configured_response_class(self):
+        for encoder, response_class in JSON_RESPONSE_CLASSES.items():
+            with self.subTest(encoder=encoder):
+                client = TestClient(build_app(ModelRoute, response_class))
+                with patch(
+                    "fastapi.routing.serialize_response", wraps=serialize_response
+                ) as mock_serialize_response:
+                    response = client.post("/items")
+
+                mock_serialize_response.assert_not_called()
+                self.assertEqual(
+                    response.content, self.default_client.post("/items").content
+                )
+
+
+class TestJSONResponses(unittest.TestCase):
+
+    def test_render(self):
+        item = Item(id=ITEM_ID, title="Tïtle", created_at=CREATED_AT)
+        expected = (
+            '{"id":"0190b3e2-7f4a-7c3e-9b1a-2f6d8e4c5a10","title":"Tïtle",'
+            '"created_at":"2025-01-02T03:04:05.678901","note":null}'
+        ).encode()
+
+        for encoder, response_class in JSON_RESPONSE_CLASSES.items():
+            with self.subTest(encoder=encoder):
+                # Act
+                response = response_class(item, status_code=status.HTTP_201_CREATED)
+                dict_response = response_class(item.model_dump(mode="json"))
+
+                # Assert
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                self.assertEqual(response.media_type, "application/json")
+                self.assertEqual(response.body, expected)
+                self.assertEqual(dict_response.body, expected)
+
+    def test_get_json_response_class(self):
+        self.assertIs(get_json_response_class("pydantic"), PydanticJSONResponse)
+        self.assertIs(get_json_response_class("orjson"), ORJSONResponse)
+        with self.assertRaises(ValueError) as context:
+            get_json_response_class("ujson")
+        self.assertIn(
+            "expected one of stdlib, orjson, pydantic", str(context.exception)
+        )
+
+    @patch("app.utils.responses.orjson", None)
+    def test_orjson_not_installed(self):
+        with self.assertRaises(ValueError):
+            get_json_response_class("orjson")